@@ -0,0 +1,92 @@
+"""Per-call overhead of the client, without any network.
+
+Mounts an adapter on the transport's session that answers every request
+with a canned response, so the timings only cover building, preparing and
+dispatching the request. "session.request" is the transport as it was
+before requests were prepared directly, "prepared" is the current one.
+
+    python benchmarks/client_overhead.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import requests
+from requests.adapters import BaseAdapter
+
+from taas_api import Client, PlaceOrderRequest
+from taas_api.transport import RequestsTransport, TransportResponse
+
+URL = "https://taas.example.com"
+
+
+class StubAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"id": "abc"}'
+        response.headers["Content-Type"] = "application/json"
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class SessionRequestTransport(RequestsTransport):
+    def request(self, method, url, headers, params=None, json=None, timeout=None):
+        response = self.session.request(
+            method, url, headers=headers, params=params, json=json, timeout=timeout
+        )
+        return TransportResponse(
+            response.status_code, response.headers, response.content
+        )
+
+
+def _client(transport: RequestsTransport) -> Client:
+    transport.session.mount(URL, StubAdapter())
+    return Client(URL, auth_token="bench", transport=transport)
+
+
+def _time(call, calls: int) -> float:
+    call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    order = PlaceOrderRequest(
+        accounts=["bench"],
+        pair="BTC-USDT",
+        side="buy",
+        strategy="TWAP",
+        duration=300,
+        base_asset_qty=1.0,
+    )
+    transports = {
+        "session.request": SessionRequestTransport,
+        "prepared": RequestsTransport,
+    }
+
+    print(f"{'transport':<18}{'get_order us':>14}{'place_order us':>16}")
+    for name, build in transports.items():
+        client = _client(build())
+        get_us = _time(lambda: client.get_order("abc"), args.calls)
+        place_us = _time(lambda: client.place_order(order), args.calls)
+        client.close()
+        print(f"{name:<18}{get_us:>14.1f}{place_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
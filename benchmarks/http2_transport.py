@@ -0,0 +1,126 @@
+"""Throughput and latency of the HTTP/1.1 and HTTP/2 transports.
+
+Starts a local hypercorn server that answers /api/order/<id> after a short
+delay, then polls it with get_order from a growing number of threads through
+each transport. The HTTP/2 transport talks h2c with prior knowledge, since
+the local server has no TLS certificate for ALPN.
+
+    pip install httpx[http2] hypercorn
+    python benchmarks/http2_transport.py --requests 2000 --delay-ms 5
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from taas_api import Client
+from taas_api.transport import HTTP2Transport, RequestsTransport
+
+
+def _app(delay: float):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(delay)
+        body = json.dumps({"id": scope["path"].rsplit("/", 1)[-1]}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def _start_server(delay: float) -> str:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.accesslog = None
+    config.errorlog = None
+
+    async def run_forever():
+        # A shutdown trigger stops hypercorn installing signal handlers,
+        # which only work on the main thread.
+        await serve(_app(delay), config, shutdown_trigger=asyncio.Event().wait)
+
+    thread = threading.Thread(target=lambda: asyncio.run(run_forever()), daemon=True)
+    thread.start()
+
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+def _run(client: Client, concurrency: int, requests: int):
+    latencies = []
+
+    def poll(i):
+        start = time.perf_counter()
+        client.get_order(str(i))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(poll, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--connections", type=int, default=2)
+    args = parser.parse_args()
+
+    url = _start_server(args.delay_ms / 1000)
+    transports = {
+        "http1": lambda: RequestsTransport(),
+        "http2": lambda: HTTP2Transport(connections=args.connections, http1=False),
+    }
+
+    print(f"{'transport':<10}{'threads':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for concurrency in args.concurrency:
+        for name, build in transports.items():
+            client = Client(url, auth_token="bench", transport=build())
+            client.get_order("warmup")
+            result = _run(client, concurrency, args.requests)
+            client.close()
+            print(
+                f"{name:<10}{concurrency:>8}{result['rps']:>10.0f}"
+                f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-order cost of building, validating and serializing a place order request.
+
+"plain" builds a PlaceOrderRequest per order, "template" stamps orders out
+of an OrderTemplate holding the shared fields.
+
+    python benchmarks/order_template.py --orders 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from taas_api import OrderTemplate, PlaceOrderRequest
+
+SHARED = dict(
+    accounts=["bench_a", "bench_b"],
+    strategy="TWAP",
+    duration=300,
+    engine_passiveness=0.2,
+    schedule_discretion=0.1,
+    alpha_tilt=0.1,
+    strategy_params={"reduce_only": False},
+    notes="rebalance",
+)
+
+
+def _time(build, orders: int) -> float:
+    start = time.perf_counter()
+    for i in range(orders):
+        request = build(base_asset_qty=1.0 + i)
+        request.validate()
+        request.to_post_body()
+    return (time.perf_counter() - start) / orders * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=20000)
+    args = parser.parse_args()
+
+    template = OrderTemplate(**SHARED)
+    builders = {
+        "plain": lambda **kw: PlaceOrderRequest(
+            pair="BTC-USDT", side="buy", **SHARED, **kw
+        ),
+        "template": lambda **kw: template.order(pair="BTC-USDT", side="buy", **kw),
+    }
+
+    print(f"{'builder':<12}{'us/order':>10}")
+    for name, build in builders.items():
+        print(f"{name:<12}{_time(build, args.orders):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Replays a trace written by TrafficRecorder and reports latencies.
+
+Calls are re-issued at their recorded times, divided by --speed, with as
+many in flight at once as the trace had. Without --url the trace is replayed
+against an in-memory stand-in that answers after the recorded latencies.
+
+    python benchmarks/replay_trace.py trace.jsonl.gz --url https://... --token ...
+    python benchmarks/replay_trace.py trace.jsonl.gz --speed 4
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from taas_api import Client
+from taas_api.traffic import StandIn, read_trace, replay
+from taas_api.transport import InMemoryTransport
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace")
+    parser.add_argument("--url", help="TaaS URL, the local stand-in if not given")
+    parser.add_argument("--token")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int)
+    args = parser.parse_args()
+
+    entries = list(read_trace(args.trace))
+    if args.url:
+        client = Client(args.url, auth_token=args.token)
+    else:
+        client = Client(
+            "http://stand-in",
+            auth_token=args.token,
+            transport=InMemoryTransport(StandIn(entries, args.speed)),
+        )
+
+    report = replay(entries, client, speed=args.speed, concurrency=args.concurrency)
+    client.close()
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
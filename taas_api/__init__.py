@@ -1,5 +1,12 @@
+from taas_api.amend_queue import AmendQueue
 from taas_api.client import Client
+from taas_api.factory import ClientFactory
 from taas_api.enums import Strategy, PosSide, OrderStatus, MultiOrderStatus
+from taas_api.deadline import Deadline, DeadlineExceeded
+from taas_api.hedging import HedgePolicy
+from taas_api.journal import OrderJournal
+from taas_api.order_store import OrderStore
+from taas_api.order_template import OrderTemplate
 from taas_api.data import (
     PlaceOrderRequest,
     PlaceMultiOrderRequest,
@@ -0,0 +1,139 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Set
+import heapq
+import logging
+import threading
+import time
+
+from taas_api import data
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingAmend:
+    def __init__(self, order_id: str, due: float):
+        self.order_id = order_id
+        self.due = due
+        self.changes: dict = {}
+        self.futures: List[Future] = []
+
+
+class AmendQueue:
+    """Coalesces amend_order calls aimed at the same order.
+
+    Changes submitted for an order within `window` seconds of the first one
+    are merged, last writer wins per key, and sent as a single amend. Every
+    caller's future resolves with the combined response. Amends to one order
+    are never in flight concurrently, so they reach TaaS in submission order.
+    """
+
+    def __init__(self, client, window: float = 0.005, max_workers: int = 4):
+        self.client = client
+        self.window = window
+
+        self._pending: Dict[str, _PendingAmend] = {}
+        self._in_flight: Set[str] = set()
+        self._due: List = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="taas-amend"
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="taas-amend-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, request: data.AmendOrderRequest) -> Future:
+        if not isinstance(request, data.AmendOrderRequest):
+            raise ValueError(
+                f"Expecting request to be of type {data.AmendOrderRequest}"
+            )
+
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AmendQueue is closed")
+
+            pending = self._pending.get(request.order_id)
+            if pending is None:
+                pending = _PendingAmend(
+                    request.order_id, time.monotonic() + self.window
+                )
+                self._pending[request.order_id] = pending
+                heapq.heappush(self._due, (pending.due, request.order_id))
+                self._cond.notify()
+
+            pending.changes.update(request.changes)
+            pending.futures.append(future)
+        return future
+
+    def amend_order(self, request: data.AmendOrderRequest, timeout: float = None):
+        """Blocking counterpart of submit()."""
+        return self.submit(request).result(timeout)
+
+    def flush(self):
+        """Sends every pending amend now instead of waiting for its window."""
+        with self._cond:
+            self._due = [(0, order_id) for _, order_id in self._due]
+            heapq.heapify(self._due)
+            self._cond.notify()
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _dispatch_loop(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._due and self._due[0][0] <= now:
+                    _, order_id = heapq.heappop(self._due)
+                    if order_id in self._in_flight:
+                        # Rescheduled once the in-flight amend completes.
+                        continue
+                    if order_id not in self._pending:
+                        # Stale entry for a batch that was already sent.
+                        continue
+                    self._start(order_id)
+
+                if self._closed and not self._due and not self._pending:
+                    return
+
+                timeout = self._due[0][0] - now if self._due else None
+                self._cond.wait(timeout)
+
+    def _start(self, order_id: str):
+        pending = self._pending.pop(order_id)
+        self._in_flight.add(order_id)
+        self._executor.submit(self._send, pending)
+
+    def _send(self, pending: _PendingAmend):
+        try:
+            response = self.client.amend_order(
+                data.AmendOrderRequest(pending.order_id, pending.changes)
+            )
+        except Exception as e:
+            logger.warning(f"amend of order {pending.order_id} failed: {e}")
+            for future in pending.futures:
+                future.set_exception(e)
+        else:
+            for future in pending.futures:
+                future.set_result(response)
+        finally:
+            with self._cond:
+                self._in_flight.discard(pending.order_id)
+                queued = self._pending.get(pending.order_id)
+                if queued is not None:
+                    heapq.heappush(self._due, (queued.due, pending.order_id))
+                self._cond.notify()
@@ -0,0 +1,301 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from taas_api.timestamps import parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only needed for this module
+    np = None
+
+GroupBy = Union[str, Sequence[str]]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "numpy is required for taas_api.analytics, install it with "
+            "`pip install taas-api-client[analytics]`"
+        )
+
+
+def _categorize(values: List[str]):
+    # Returns (sorted unique labels, int code of every value into labels).
+    labels, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return labels, codes.astype(np.int64)
+
+
+def _to_float(values: List) -> "np.ndarray":
+    # Also parses the decimal strings TaaS uses for amounts and prices.
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _to_epoch(values: List) -> "np.ndarray":
+    return np.array(
+        [parse_timestamp(v).timestamp() if v else np.nan for v in values],
+        dtype=np.float64,
+    )
+
+
+class _ColumnFrame:
+    """Columns of equal length: categorical keys stored as integer codes into
+    their sorted labels, and float value columns."""
+
+    def __init__(self, labels: Dict, codes: Dict, columns: Dict):
+        self.labels = labels
+        self.codes = codes
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def mask(self, key: str, label) -> "np.ndarray":
+        """Boolean mask of the rows whose key has the given label."""
+        matches = np.flatnonzero(self.labels[key] == label)
+        if not len(matches):
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[key] == matches[0]
+
+    def group_totals(
+        self, by: GroupBy, column: str, absolute: bool = False
+    ) -> Tuple[List, "np.ndarray"]:
+        """Sums a column per group. Returns the group keys, labels for a single
+        key or tuples of labels for several, and the totals in the same order.
+        NaN values count as zero."""
+        keys, inverse, group_count = self._groups(by)
+        values = self.columns[column]
+        if absolute:
+            values = np.abs(values)
+        totals = np.bincount(
+            inverse, weights=np.nan_to_num(values), minlength=group_count
+        )
+        return keys, totals
+
+    def totals(self, by: GroupBy, column: str, absolute: bool = False) -> Dict:
+        keys, totals = self.group_totals(by, column, absolute=absolute)
+        return dict(zip(keys, totals.tolist()))
+
+    def _groups(self, by: GroupBy):
+        by = (by,) if isinstance(by, str) else tuple(by)
+
+        # Fold the codes of several keys into a single mixed-radix code.
+        combined = np.zeros(len(self), dtype=np.int64)
+        for key in by:
+            combined = combined * len(self.labels[key]) + self.codes[key]
+        unique, inverse = np.unique(combined, return_inverse=True)
+
+        parts = []
+        remainder = unique
+        for key in reversed(by):
+            remainder, code = np.divmod(remainder, len(self.labels[key]))
+            parts.append(self.labels[key][code])
+        parts.reverse()
+
+        if len(by) == 1:
+            keys = parts[0].tolist()
+        else:
+            keys = list(zip(*(part.tolist() for part in parts)))
+        return keys, inverse, len(unique)
+
+
+@dataclass
+class Exposure:
+    keys: List
+    exposure: "np.ndarray"
+    limit: "np.ndarray"
+    utilization: "np.ndarray"
+    breached: "np.ndarray"
+
+    def breaches(self) -> Dict:
+        return {
+            key: value
+            for key, value, breached in zip(
+                self.keys, self.exposure.tolist(), self.breached.tolist()
+            )
+            if breached
+        }
+
+
+class BalanceFrame(_ColumnFrame):
+    """Columnar view of a get_balances response, one row per asset held.
+
+    Keys are "account", "exchange", "symbol", "market_type" and "asset_type";
+    value columns are the numeric asset fields, e.g. "size" and "notional".
+    """
+
+    KEYS = ("account", "exchange", "symbol", "market_type", "asset_type")
+    COLUMNS = (
+        "size",
+        "notional",
+        "unrealized_profit",
+        "initial_margin",
+        "maint_margin",
+        "margin_balance",
+        "leverage",
+    )
+
+    @classmethod
+    def from_response(cls, balances: dict) -> "BalanceFrame":
+        _require_numpy()
+
+        keys = {key: [] for key in cls.KEYS}
+        columns = {column: [] for column in cls.COLUMNS}
+        for account, account_balances in balances.items():
+            exchange = account_balances.get("exchange")
+            for asset in account_balances.get("assets", ()):
+                keys["account"].append(account)
+                keys["exchange"].append(exchange)
+                keys["symbol"].append(asset.get("symbol"))
+                keys["market_type"].append(asset.get("market_type"))
+                keys["asset_type"].append(asset.get("asset_type"))
+                for column in cls.COLUMNS:
+                    columns[column].append(asset.get(column))
+
+        labels = {}
+        codes = {}
+        for key, values in keys.items():
+            labels[key], codes[key] = _categorize(
+                ["" if v is None else v for v in values]
+            )
+        return cls(
+            labels, codes, {column: _to_float(v) for column, v in columns.items()}
+        )
+
+    def exposure(
+        self,
+        limits: Dict,
+        by: GroupBy = "symbol",
+        column: str = "notional",
+        absolute: bool = True,
+    ) -> Exposure:
+        """Compares per-group totals with limits keyed like the group keys.
+        Groups without a limit are never breached."""
+        keys, totals = self.group_totals(by, column, absolute=absolute)
+        limit = np.array([limits.get(key, np.inf) for key in keys], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            utilization = np.where(limit > 0, np.abs(totals) / limit, np.inf)
+        return Exposure(
+            keys=keys,
+            exposure=totals,
+            limit=limit,
+            utilization=utilization,
+            breached=np.abs(totals) > limit,
+        )
+
+
+class OrderFrame(_ColumnFrame):
+    """Columnar view of orders from get_all_orders or get_order responses,
+    one row per order.
+
+    Keys are "pair", "account" (the order's account names joined with
+    commas), "strategy", "side" and "status". Value columns are the numeric
+    order fields, decimal strings included, and the timestamps as epoch
+    seconds. Derived columns:
+
+    - executed_sell_amount: what was executed, in the sell token
+    - fill_ratio: executed_sell_amount over sell_token_amount
+    - limit_improvement: how much better than its limit price the order
+      executed, as a fraction of the limit, NaN without a limit
+    - duration_usage: time from start to the last update over the duration
+    """
+
+    KEYS = ("pair", "account", "strategy", "side", "status")
+    COLUMNS = (
+        "executed_qty",
+        "executed_price",
+        "executed_notional",
+        "sell_token_amount",
+        "limit_price",
+        "duration",
+    )
+    TIMESTAMPS = ("created_at", "updated_at", "time_start", "time_end")
+
+    def __init__(self, labels: Dict, codes: Dict, columns: Dict, ids: List[str]):
+        super().__init__(labels, codes, columns)
+        self.ids = ids
+
+    @classmethod
+    def from_response(cls, orders: Union[dict, Iterable[dict]]) -> "OrderFrame":
+        """Accepts a list of orders, a paginated get_all_orders response or
+        a single order."""
+        _require_numpy()
+        if isinstance(orders, dict):
+            orders = orders["results"] if "results" in orders else [orders]
+
+        ids = []
+        keys = {key: [] for key in cls.KEYS}
+        columns = {column: [] for column in cls.COLUMNS + cls.TIMESTAMPS}
+        for order in orders:
+            ids.append(order.get("id"))
+            keys["pair"].append(order.get("pair"))
+            keys["account"].append(",".join(order.get("account_names") or ()))
+            keys["strategy"].append(order.get("strategy"))
+            keys["side"].append(order.get("side"))
+            keys["status"].append(order.get("status"))
+            for column in columns:
+                columns[column].append(order.get(column))
+
+        labels = {}
+        codes = {}
+        for key, values in keys.items():
+            labels[key], codes[key] = _categorize(
+                ["" if v is None else v for v in values]
+            )
+        values = {column: _to_float(columns[column]) for column in cls.COLUMNS}
+        values.update({column: _to_epoch(columns[column]) for column in cls.TIMESTAMPS})
+
+        frame = cls(labels, codes, values, ids)
+        frame._derive()
+        return frame
+
+    def _derive(self):
+        columns = self.columns
+        buy = self.mask("side", "buy")
+        sell_sign = np.where(buy, 1.0, -1.0)
+
+        # Buys sell the quote token, sells the base token.
+        executed = np.where(buy, columns["executed_notional"], columns["executed_qty"])
+        columns["executed_sell_amount"] = executed
+
+        # Limit prices of -1 mean the order has none.
+        limit = np.where(columns["limit_price"] > 0, columns["limit_price"], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns["fill_ratio"] = executed / columns["sell_token_amount"]
+            columns["limit_improvement"] = (
+                sell_sign * (limit - columns["executed_price"]) / limit
+            )
+            columns["duration_usage"] = (
+                columns["updated_at"] - columns["time_start"]
+            ) / columns["duration"]
+
+    def execution_summary(self, by: GroupBy = "pair") -> Dict:
+        """Per group: order count, executed quantity, notional and sell
+        amount, volume weighted executed price and overall fill ratio."""
+        keys, inverse, group_count = self._groups(by)
+
+        def total(column):
+            return np.bincount(
+                inverse,
+                weights=np.nan_to_num(self.columns[column]),
+                minlength=group_count,
+            )
+
+        count = np.bincount(inverse, minlength=group_count)
+        qty = total("executed_qty")
+        notional = total("executed_notional")
+        executed = total("executed_sell_amount")
+        target = total("sell_token_amount")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(qty > 0, notional / qty, np.nan)
+            fill_ratio = np.where(target > 0, executed / target, np.nan)
+
+        return {
+            key: {
+                "orders": int(count[i]),
+                "executed_qty": float(qty[i]),
+                "executed_notional": float(notional[i]),
+                "executed_price": float(vwap[i]),
+                "fill_ratio": float(fill_ratio[i]),
+            }
+            for i, key in enumerate(keys)
+        }
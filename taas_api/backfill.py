@@ -0,0 +1,257 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Sequence, Union
+import bisect
+import gzip
+import json
+import logging
+
+from taas_api import data
+from taas_api.deadline import Deadline
+from taas_api.timestamps import format_timestamp, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_WORKERS = 8
+
+
+class _Window:
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+        # Set once the window is done.
+        self.orders: Optional[List[dict]] = None
+        # Orders of the first page of a parent window that was split.
+        self.prefetched: List[dict] = []
+
+    def __lt__(self, other):
+        return self.start < other.start
+
+    @property
+    def span(self) -> timedelta:
+        return self.end - self.start
+
+
+def _created_at(order: dict) -> datetime:
+    created_at = order.get("created_at")
+    return parse_timestamp(created_at) if created_at else _EPOCH
+
+
+_EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive datetimes are UTC, as in format_timestamp.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class _Backfill:
+    def __init__(
+        self,
+        client,
+        start: datetime,
+        end: datetime,
+        statuses,
+        account_names,
+        window: timedelta,
+        min_window: timedelta,
+        max_window: timedelta,
+        orders_per_window: int,
+        page_size: int,
+        deadline: Optional[Deadline],
+    ):
+        self.client = client
+        self.end = end
+        self.statuses = ",".join(statuses) if statuses else None
+        self.account_names = account_names
+        self.window = window
+        self.min_window = min_window
+        self.max_window = max_window
+        self.orders_per_window = orders_per_window
+        self.page_size = page_size
+        self.deadline = deadline
+
+        # Start of the part of the range no window covers yet.
+        self.cursor = start
+        # Orders seen and time covered by finished windows, for the density.
+        self.seen_orders = 0
+        self.seen_span = timedelta(0)
+
+    def next_window(self) -> Optional[_Window]:
+        if self.cursor >= self.end:
+            return None
+        if self.seen_orders:
+            # Size windows for about orders_per_window orders each.
+            seconds = (
+                self.seen_span.total_seconds()
+                * self.orders_per_window
+                / self.seen_orders
+            )
+            self.window = min(
+                self.max_window, max(self.min_window, timedelta(seconds=seconds))
+            )
+        elif self.seen_span:
+            # Nothing found so far, widen the search.
+            self.window = min(self.max_window, self.window * 2)
+
+        window = _Window(self.cursor, min(self.end, self.cursor + self.window))
+        self.cursor = window.end
+        return window
+
+    def fetch(self, window: _Window):
+        """Returns the orders of the window, or (first page, halves) when the
+        window spans several pages and can still be split."""
+        request = data.GetOrderRequest(
+            statuses=self.statuses,
+            account_names=self.account_names,
+            after=format_timestamp(window.start),
+            before=format_timestamp(window.end),
+            page_size=self.page_size,
+        )
+        splittable = window.span >= 2 * self.min_window
+
+        orders = []
+        for order in self.client.iter_all_orders(request, deadline=self.deadline):
+            orders.append(order)
+            # A full first page: split rather than page through the window.
+            # Stopping here, before the iterator asks for page two, costs a
+            # repeated page when the window held exactly one page.
+            if splittable and len(orders) == self.page_size:
+                middle = window.start + window.span / 2
+                return orders, [
+                    _Window(window.start, middle),
+                    _Window(middle, window.end),
+                ]
+        return orders, None
+
+    def finished(self, window: _Window, orders: List[dict]):
+        self.seen_orders += len(orders)
+        self.seen_span += window.span
+
+
+def backfill_orders(
+    client,
+    start: Union[datetime, str],
+    end: Union[datetime, str],
+    statuses: Optional[Sequence[str]] = None,
+    account_names: Optional[List[str]] = None,
+    window: timedelta = timedelta(hours=6),
+    min_window: timedelta = timedelta(seconds=1),
+    max_window: timedelta = timedelta(days=7),
+    orders_per_window: Optional[int] = None,
+    page_size: int = 100,
+    max_workers: int = DEFAULT_BACKFILL_WORKERS,
+    ordered: bool = True,
+    deadline: Union[Deadline, float, None] = None,
+) -> Iterator[dict]:
+    """Yields every order created between `start` and `end`, each once.
+
+    The range is cut into windows of created time, filtered with the `after`
+    and `before` fields of GetOrderRequest, and up to `max_workers` windows
+    are paged concurrently. Windows are sized from the order density seen so
+    far to hold about `orders_per_window` orders, two pages by default, and
+    a window found to hold more than a page is split in half.
+
+    With `ordered`, orders are yielded by created time, each window as soon
+    as every earlier one is done. Otherwise they are yielded as windows
+    finish, which holds fewer of them in memory.
+    """
+    start = parse_timestamp(start) if isinstance(start, str) else _utc(start)
+    end = parse_timestamp(end) if isinstance(end, str) else _utc(end)
+    if start >= end:
+        raise ValueError("start must be before end")
+    if max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+
+    backfill = _Backfill(
+        client,
+        start,
+        end,
+        statuses,
+        account_names,
+        window,
+        min_window,
+        max_window,
+        orders_per_window or 2 * page_size,
+        page_size,
+        Deadline.coerce(deadline),
+    )
+    # Windows not yielded yet, by start time.
+    windows: List[_Window] = []
+    seen = set()
+
+    def unseen(orders):
+        # Windows share their bounds and split windows repeat a page.
+        fresh = []
+        for order in orders:
+            if order["id"] not in seen:
+                seen.add(order["id"])
+                fresh.append(order)
+        return fresh
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="taas-backfill"
+    ) as executor:
+        in_flight = {}
+
+        def submit(window: _Window):
+            if ordered:
+                bisect.insort(windows, window)
+            in_flight[executor.submit(backfill.fetch, window)] = window
+
+        try:
+            while True:
+                while len(in_flight) < max_workers:
+                    window = backfill.next_window()
+                    if window is None:
+                        break
+                    submit(window)
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window = in_flight.pop(future)
+                    orders, halves = future.result()
+
+                    if halves is None:
+                        backfill.finished(window, orders)
+                        if ordered:
+                            window.orders = window.prefetched + orders
+                        else:
+                            yield from unseen(orders)
+                        continue
+
+                    logger.debug(
+                        f"splitting backfill window {window.start} - {window.end}"
+                    )
+                    if ordered:
+                        windows.remove(window)
+                        # Hand the page already fetched to the half it falls in.
+                        for order in window.prefetched + orders:
+                            late = _created_at(order) >= halves[1].start
+                            (halves[1] if late else halves[0]).prefetched.append(order)
+                    else:
+                        yield from unseen(orders)
+                    for half in halves:
+                        submit(half)
+
+                while windows and windows[0].orders is not None:
+                    window = windows.pop(0)
+                    yield from unseen(sorted(window.orders, key=_created_at))
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def backfill_to_file(client, path: str, start, end, **kwargs) -> int:
+    """Writes the orders of backfill_orders() to a JSON lines file, gzipped
+    if `path` ends in .gz, as windows finish. Returns the number of orders."""
+    kwargs.setdefault("ordered", False)
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    with opener(path, "wt", encoding="utf-8") as f:
+        for order in backfill_orders(client, start, end, **kwargs):
+            f.write(json.dumps(order, separators=(",", ":")) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,165 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Iterable, List, Optional, Tuple, Union
+import multiprocessing
+import time
+
+import requests
+
+from taas_api import data
+from taas_api.deadline import Deadline, DeadlineExceeded
+
+DEFAULT_CHUNK_SIZE = 250
+
+_ORDER_FIELDS = tuple(field.name for field in fields(data.PlaceOrderRequest))
+
+# Set in each worker process by _init_worker, never shared with the parent.
+_worker_client = None
+
+
+@dataclass
+class BulkOrderResult:
+    success: bool
+    response: Optional[dict] = None
+    error: Optional[str] = None
+
+
+def encode_order(order: Union[data.PlaceOrderRequest, dict]) -> tuple:
+    """Packs an order into a positional tuple in PlaceOrderRequest field order,
+    with trailing unset fields dropped, so batches pickle without field names.
+    """
+    if isinstance(order, data.PlaceOrderRequest):
+        values = [getattr(order, name) for name in _ORDER_FIELDS]
+    elif isinstance(order, dict):
+        unknown = set(order) - set(_ORDER_FIELDS)
+        if unknown:
+            raise ValueError(f"unexpected order fields {sorted(unknown)}")
+        values = [order.get(name) for name in _ORDER_FIELDS]
+    else:
+        raise ValueError(
+            f"Expecting order to be of type {data.PlaceOrderRequest} or dict"
+        )
+
+    while values and values[-1] is None:
+        values.pop()
+    return tuple(values)
+
+
+def decode_order(values: tuple) -> data.PlaceOrderRequest:
+    return data.PlaceOrderRequest(*values)
+
+
+def place_orders_in_processes(
+    client,
+    orders: Iterable[Union[data.PlaceOrderRequest, dict]],
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    deadline: Union[Deadline, float, None] = None,
+    mp_context=None,
+) -> List[BulkOrderResult]:
+    """Validates and places orders across a pool of worker processes.
+
+    Every worker builds its own client, and so its own connection pool, from
+    the settings of the given client. Results are returned in input order;
+    an order that fails validation or placement, including one answered with
+    an HTTP error status, gets a failed result instead of aborting the batch.
+    A failed result keeps the error response, if there was one.
+
+    The client's journal and leverage cache stay in this process. Every order
+    is journaled before the batch is dispatched, and its result once the
+    batch is done. Cached leverage of the pairs whose orders set
+    updated_leverage is dropped up front.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    deadline = Deadline.coerce(deadline)
+    # Deadlines are monotonic per process, so hand workers a wall clock expiry.
+    expires_at = time.time() + deadline.remaining() if deadline else None
+
+    encoded = [encode_order(order) for order in orders]
+    chunks = [
+        encoded[start : start + chunk_size]
+        for start in range(0, len(encoded), chunk_size)
+    ]
+    if not chunks:
+        return []
+
+    cache = client.leverage_cache
+    if cache is not None:
+        for values in encoded:
+            order = _fields(values)
+            if order.get("updated_leverage") is not None:
+                cache.invalidate(pair=order.get("pair"))
+
+    journal = client.journal
+    journal_seqs = None
+    if journal is not None and "place_order" in client.journaled_endpoints:
+        journal_seqs = [
+            journal.record_request("place_order", "/api/orders/", _fields(values))
+            for values in encoded
+        ]
+
+    settings = (type(client), client._process_settings())
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=mp_context or multiprocessing.get_context(),
+        initializer=_init_worker,
+        initargs=(settings,),
+    ) as executor:
+        for chunk_results in executor.map(
+            _place_chunk, chunks, [expires_at] * len(chunks)
+        ):
+            results.extend(
+                BulkOrderResult(success, response, error)
+                for success, response, error in chunk_results
+            )
+
+    if journal_seqs is not None:
+        for seq, result in zip(journal_seqs, results):
+            if result.success:
+                journal.record_response(seq, result.response)
+            else:
+                journal.record_error(seq, result.error)
+    return results
+
+
+def _fields(values: tuple) -> dict:
+    # The post body of an encoded order.
+    return {k: v for k, v in zip(_ORDER_FIELDS, values) if v is not None}
+
+
+def _init_worker(settings):
+    global _worker_client
+    client_class, kwargs = settings
+    _worker_client = client_class(**kwargs)
+
+
+def _place_chunk(
+    chunk: List[tuple], expires_at: Optional[float]
+) -> List[Tuple[bool, Optional[dict], Optional[str]]]:
+    deadline = (
+        Deadline(max(0.0, expires_at - time.time())) if expires_at is not None else None
+    )
+
+    results = []
+    for values in chunk:
+        try:
+            status, response = _worker_client.place_order(
+                decode_order(values), deadline, return_status=True
+            )
+        except (
+            ValueError,
+            TypeError,
+            DeadlineExceeded,
+            requests.exceptions.RequestException,
+        ) as e:
+            results.append((False, None, f"{type(e).__name__}: {e}"))
+            continue
+
+        if status >= 400:
+            results.append((False, response, f"HTTP {status}: {response}"))
+        else:
+            results.append((True, response, None))
+    return results
@@ -1,95 +1,616 @@
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import datetime
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 import requests
 import logging
 from urllib.parse import urljoin
+import threading
 import time
 
 from taas_api import data
+from taas_api.backfill import DEFAULT_BACKFILL_WORKERS, backfill_orders
+from taas_api.bulk import DEFAULT_CHUNK_SIZE, BulkOrderResult, place_orders_in_processes
+from taas_api.deadline import Deadline, DeadlineExceeded, TimeoutValue
+from taas_api.enums import OrderStatus
+from taas_api.failover import (
+    IDEMPOTENT_METHODS,
+    Endpoint,
+    EndpointPool,
+    FailoverPolicy,
+    request_not_sent,
+)
+from taas_api.hedging import HedgeBudget, HedgePolicy, LatencyTracker
+from taas_api.journal import OrderJournal
+from taas_api.leverage_cache import LeverageCache
+from taas_api.limiter import AdaptiveLimiter
+from taas_api.mass_cancel import (
+    DEFAULT_CANCEL_ATTEMPTS,
+    DEFAULT_CANCEL_WORKERS,
+    CancelAllResult,
+    cancel_all,
+)
+from taas_api.metrics import MetricsRegistry
+from taas_api.request_log import ENDPOINT_ATTR, STATUS_ATTR
+from taas_api.scheduler import RequestScheduler
+from taas_api.slow_calls import PHASES, SlowCall, SlowCallLog
+from taas_api.traffic import TrafficRecorder
+from taas_api.transport import Transport, build_transport
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts in seconds applied to every request by default.
+DEFAULT_TIMEOUT = (3.05, 30.0)
+
+DeadlineArg = Union[Deadline, float, None]
+
+# Seconds between keep-alive pings of warmed-up connections.
+DEFAULT_KEEPALIVE_INTERVAL = 30.0
+
+DEFAULT_PAGE_SIZE = 100
+
 
 class BaseClient:
+    # Endpoints whose requests and responses are written to the journal.
+    journaled_endpoints = frozenset()
+
     def __init__(
         self,
-        url: str,
+        url: Union[str, Sequence[str]],
         auth_token: str = None,
         extra_headers: Optional[Dict[str, str]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeout: Optional[TimeoutValue] = DEFAULT_TIMEOUT,
+        endpoint_timeouts: Optional[Dict[str, TimeoutValue]] = None,
+        journal: Optional[OrderJournal] = None,
+        transport: Union[Transport, str, None] = None,
+        warm_connections: int = 0,
+        recorder: Optional[TrafficRecorder] = None,
+        slow_calls: Optional[SlowCallLog] = None,
+        leverage_cache: Optional[LeverageCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        failover_policy: Optional[FailoverPolicy] = None,
+        endpoints: Optional[EndpointPool] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        metrics_labels: Optional[Dict[str, str]] = None,
     ):
-        # TAAS URL is used for development, TAAS_IP is used for real in pipeline
-        self.taas_url = url
+        # TAAS URL is used for development, TAAS_IP is used for real in pipeline.
+        # Given several, e.g. both, requests fail over between them.
+        self.urls = [url] if isinstance(url, str) else list(url)
+        self.taas_url = self.urls[0]
+        # A pool passed in is shared, e.g. by a ClientFactory, and its owner
+        # closes it.
+        self._owns_endpoints = endpoints is None
+        if endpoints is None and len(self.urls) > 1:
+            endpoints = EndpointPool(
+                self.urls, failover_policy, probe=self._probe_endpoint
+            )
+        self.endpoints = endpoints
         self.auth_token = auth_token
         self._extra_headers = dict(extra_headers) if extra_headers else {}
+        self.timeout = timeout
+        self.endpoint_timeouts = dict(endpoint_timeouts) if endpoint_timeouts else {}
+        self.journal = journal
+        self.recorder = recorder
+        self.slow_calls = slow_calls
+        self.leverage_cache = leverage_cache
+        self.scheduler = scheduler
+        self.limiter = limiter
+        self.metrics = metrics
+        # Added to every metric of this client, e.g. to tell sub-accounts apart.
+        self.metrics_labels = dict(metrics_labels) if metrics_labels else {}
+        if limiter is not None and metrics is not None:
+            metrics.add_collector(limiter.collect)
+
+        if hedge_policy is not None:
+            validate_success, error = hedge_policy.validate()
+            if not validate_success:
+                raise ValueError(error)
+
+        self.hedge_policy = hedge_policy
+        self.latencies = LatencyTracker()
+        self._hedge_budget = (
+            HedgeBudget(hedge_policy.budget_ratio, hedge_policy.max_budget)
+            if hedge_policy
+            else None
+        )
+        self._request_executor = None
+        self._hedge_executor = None
+        self._hedge_executor_lock = threading.Lock()
+        # "http1" (requests, the default), "http2" or a Transport instance.
+        self.transport = build_transport(transport)
+        self._keepalive_stop = None
+
+        if warm_connections:
+            self.warmup(warm_connections)
+
+    def post(
+        self, path: str, data: dict, endpoint: str = None, deadline: DeadlineArg = None
+    ):
+        return self._request(
+            "POST", path, endpoint=endpoint, deadline=deadline, json=data
+        )
+
+    def get(
+        self,
+        path: str,
+        params: dict = {},
+        endpoint: str = None,
+        deadline: DeadlineArg = None,
+    ):
+        return self._request(
+            "GET", path, endpoint=endpoint, deadline=deadline, hedge=True, params=params
+        )
 
-    def post(self, path: str, data: dict):
+    def delete(
+        self,
+        path: str,
+        endpoint: str = None,
+        deadline: DeadlineArg = None,
+        return_status: bool = False,
+    ):
+        return self._request(
+            "DELETE",
+            path,
+            endpoint=endpoint,
+            deadline=deadline,
+            return_status=return_status,
+        )
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str = None,
+        deadline: DeadlineArg = None,
+        hedge=False,
+        return_status=False,
+        **kwargs,
+    ):
+        endpoint = endpoint or path
+        deadline = Deadline.coerce(deadline)
+        url = self._url(path)
         start_time = time.perf_counter()
         response = None
+        journal_seq = None
+        error = None
+        # perf_counter readings at the end of each phase, see slow_calls.PHASES.
+        marks = []
         try:
-            response = requests.post(
-                urljoin(self.taas_url, path), headers=self._common_headers(), json=data
-            )
-            return self._handle_response(response)
+            if deadline is not None:
+                deadline.check(f"{method} {path}")
+
+            if self.journal is not None and endpoint in self.journaled_endpoints:
+                journal_seq = self.journal.record_request(
+                    endpoint, path, kwargs.get("json")
+                )
+
+            marks.append(time.perf_counter())
+            if hedge and self.hedge_policy is not None:
+                response = self._send_hedged(endpoint, method, url, deadline, **kwargs)
+            else:
+                response = self._send(endpoint, method, url, deadline, **kwargs)
+            marks.append(time.perf_counter())
+            result = self._handle_response(response)
+            marks.append(time.perf_counter())
+
+            if journal_seq is not None:
+                self.journal.record_response(journal_seq, result)
+            return (response.status_code, result) if return_status else result
+        except Exception as e:
+            error = e
+            if journal_seq is not None:
+                self.journal.record_error(journal_seq, e)
+            raise
         finally:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
-            status_code = response.status_code if response is not None else "N/A"
-            logger.info(f"POST {path} latency={elapsed_ms:.1f}ms status={status_code}")
+            elapsed = time.perf_counter() - start_time
+            if self.recorder is not None:
+                self.recorder.record(
+                    endpoint,
+                    method,
+                    path,
+                    kwargs.get("params"),
+                    kwargs.get("json"),
+                    start_time,
+                    elapsed,
+                    response.status_code if response is not None else None,
+                    error,
+                )
+            if self.slow_calls is not None and elapsed >= self.slow_calls.threshold(
+                endpoint
+            ):
+                self._capture_slow_call(
+                    endpoint, method, path, kwargs, start_time, marks, response, error
+                )
+            status_code = response.status_code if response is not None else None
+            if self.metrics is not None:
+                self.metrics.inc(
+                    "taas_requests_total",
+                    endpoint=endpoint,
+                    status="error" if status_code is None else status_code,
+                    **self.metrics_labels,
+                )
+                self.metrics.inc(
+                    "taas_request_seconds_total",
+                    elapsed,
+                    endpoint=endpoint,
+                    **self.metrics_labels,
+                )
+            if logger.isEnabledFor(logging.INFO):
+                # Formatted lazily, by a background thread with RequestLogPipeline.
+                logger.info(
+                    "%s %s latency=%.1fms status=%s",
+                    method,
+                    path,
+                    elapsed * 1000.0,
+                    "N/A" if status_code is None else status_code,
+                    extra={ENDPOINT_ATTR: endpoint, STATUS_ATTR: status_code},
+                )
+
+    def _capture_slow_call(
+        self, endpoint, method, path, kwargs, start_time, marks, response, error
+    ):
+        end_time = time.perf_counter()
+        marks = marks + [end_time]
+        phases_ms = {}
+        previous = start_time
+        for phase, mark in zip(PHASES, marks):
+            phases_ms[phase] = (mark - previous) * 1000.0
+            previous = mark
+
+        self.slow_calls.capture(
+            SlowCall(
+                timestamp=time.time(),
+                endpoint=endpoint,
+                method=method,
+                path=path,
+                latency_ms=(end_time - start_time) * 1000.0,
+                phases_ms=phases_ms,
+                status=response.status_code if response is not None else None,
+                request=kwargs.get("json", kwargs.get("params")),
+                response_headers=dict(response.headers) if response is not None else {},
+                response_size=len(response.content) if response is not None else None,
+                error=f"{type(error).__name__}: {error}" if error is not None else None,
+            )
+        )
 
-    def get(self, path: str, params: dict = {}):
-        start_time = time.perf_counter()
-        response = None
+    def _send(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        **kwargs,
+    ):
+        scheduler = self.scheduler
+        if scheduler is None:
+            return self._send_now(endpoint, method, url, deadline, **kwargs)
+
+        priority = scheduler.classify(endpoint, method)
+        if not scheduler.acquire(priority, deadline.remaining() if deadline else None):
+            raise deadline.exceeded(f"waiting to {method} {url}")
         try:
-            response = requests.get(
-                urljoin(self.taas_url, path),
-                headers=self._common_headers(),
-                params=params,
-            )
-            return self._handle_response(response)
+            return self._send_now(endpoint, method, url, deadline, **kwargs)
         finally:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
-            status_code = response.status_code if response is not None else "N/A"
-            logger.info(f"GET {path} latency={elapsed_ms:.1f}ms status={status_code}")
+            scheduler.release(priority)
+
+    def _send_now(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        **kwargs,
+    ):
+        limiter = self.limiter
+        if limiter is not None:
+            if not limiter.acquire(
+                endpoint, deadline.remaining() if deadline else None
+            ):
+                raise deadline.exceeded(f"waiting to {method} {url}")
 
-    def delete(self, path: str):
         start_time = time.perf_counter()
-        response = None
+        failed = True
         try:
-            response = requests.delete(
-                urljoin(self.taas_url, path), headers=self._common_headers()
-            )
-            return self._handle_response(response)
+            if self.endpoints is not None and url.startswith(self._url_prefix):
+                response = self._send_failover(
+                    endpoint, method, url, deadline, **kwargs
+                )
+            else:
+                response = self._send_to(endpoint, method, url, deadline, **kwargs)
+            failed = response.status_code == 429 or response.status_code >= 500
         finally:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
-            status_code = response.status_code if response is not None else "N/A"
-            logger.info(
-                f"DELETE {path} latency={elapsed_ms:.1f}ms status={status_code}"
+            elapsed = time.perf_counter() - start_time
+            if limiter is not None:
+                limiter.release(endpoint, elapsed, failed)
+        self.latencies.record(endpoint, elapsed)
+        return response
+
+    def _send_to(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        **kwargs,
+    ):
+        timeout = self.endpoint_timeouts.get(endpoint, self.timeout)
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
+            # Used up while waiting, e.g. for a limiter or scheduler slot.
+            if min(timeout if isinstance(timeout, tuple) else (timeout,)) <= 0:
+                raise deadline.exceeded(f"{method} {url}")
+
+        try:
+            return self.transport.request(
+                method, url, headers=self._common_headers(), timeout=timeout, **kwargs
             )
+        except requests.exceptions.Timeout as e:
+            if deadline is not None and deadline.expired:
+                raise deadline.exceeded(f"{method} {url}") from e
+            raise
 
-    def _handle_response(self, response):
+    def _send_failover(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        **kwargs,
+    ):
+        path = url[len(self._url_prefix) :]
+        error = None
+        for target in self.endpoints.ranked():
+            if error is not None and deadline is not None:
+                deadline.check(f"{method} {url}")
+
+            start_time = time.perf_counter()
+            try:
+                response = self._send_to(
+                    endpoint, method, target.prefix + path, deadline, **kwargs
+                )
+            except requests.exceptions.ConnectionError as e:
+                self.endpoints.record_failure(target)
+                if method not in IDEMPOTENT_METHODS and not request_not_sent(e):
+                    raise
+                logger.warning(f"{method} {target.prefix + path} failed over: {e}")
+                error = error or e
+                continue
+            except requests.exceptions.Timeout:
+                # Slow rather than down, the wait still counts against it.
+                self.endpoints.record_latency(target, time.perf_counter() - start_time)
+                raise
+            self.endpoints.record_latency(target, time.perf_counter() - start_time)
+            return response
+        raise error
+
+    def _probe_endpoint(self, target: Endpoint):
+        policy = self.endpoints.policy
+        self.transport.request(
+            "HEAD",
+            target.prefix + policy.probe_path,
+            headers=self._common_headers(),
+            timeout=policy.probe_timeout,
+        )
+
+    def _send_hedged(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        deadline: Optional[Deadline],
+        **kwargs,
+    ):
+        request_executor, hedge_executor = self._get_hedge_executors()
+        self._hedge_budget.deposit()
+
+        send_args = (endpoint, method, url, deadline)
+        # First attempts have a pool of their own, so a slow burst of reads
+        # never waits behind, or starves, the hedge workers.
+        attempts = [request_executor.submit(self._send, *send_args, **kwargs)]
+
+        hedge_delay = self._hedge_delay(endpoint)
+        if deadline is not None:
+            hedge_delay = min(hedge_delay, deadline.remaining())
+        done, _ = wait(attempts, timeout=hedge_delay)
+
+        # Checked before spending, a hedge that cannot be sent costs nothing.
+        if (
+            not done
+            and (deadline is None or not deadline.expired)
+            and self._hedge_budget.try_spend()
+        ):
+            logger.debug(f"{method} {url} hedging after slow first attempt")
+            attempts.append(hedge_executor.submit(self._send, *send_args, **kwargs))
+
+        # First successful attempt wins, the slower one is left to finish
+        # in the background and its response is discarded.
+        error = None
         try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
+            for attempt in as_completed(
+                attempts, timeout=deadline.remaining() if deadline else None
+            ):
+                try:
+                    return attempt.result()
+                except requests.exceptions.RequestException as e:
+                    error = error or e
+                except DeadlineExceeded as e:
+                    error = error or e
+        except FutureTimeoutError:
+            raise deadline.exceeded(f"{method} {url}")
+        raise error
+
+    def _process_settings(self) -> dict:
+        # Constructor arguments needed to rebuild this client in a worker process.
+        return {
+            "url": self.urls if self.endpoints is not None else self.taas_url,
+            "auth_token": self.auth_token,
+            "extra_headers": self._extra_headers,
+            "timeout": self.timeout,
+            "endpoint_timeouts": self.endpoint_timeouts,
+            "transport": self.transport,
+        }
+
+    def _hedge_delay(self, endpoint: str) -> float:
+        policy = self.hedge_policy
+        if policy.delay is not None:
+            return policy.delay
+
+        if self.latencies.count(endpoint) < policy.min_samples:
+            return policy.default_delay
+
+        return self.latencies.percentile(endpoint, policy.percentile)
+
+    def _get_hedge_executors(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._request_executor = ThreadPoolExecutor(
+                    max_workers=self.hedge_policy.max_request_workers,
+                    thread_name_prefix="taas-request",
+                )
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.hedge_policy.max_workers,
+                    thread_name_prefix="taas-hedge",
+                )
+            return self._request_executor, self._hedge_executor
+
+    def warmup(
+        self,
+        connections: int = 4,
+        keepalive_interval: Optional[float] = DEFAULT_KEEPALIVE_INTERVAL,
+    ) -> int:
+        """Resolves the TaaS host and opens pooled connections to it, so the
+        first calls skip DNS, TCP connect and TLS handshake. Unless
+        keepalive_interval is None, idle connections are then pinged in the
+        background to keep them open. Returns the number of connections."""
+        opened = 0
+        for url in self.urls:
+            count = self.transport.warmup(url, connections)
+            logger.info(f"warmed up {count} connections to {url}")
+            opened += count
+
+        if keepalive_interval and self._keepalive_stop is None:
+            self._keepalive_stop = threading.Event()
+            threading.Thread(
+                target=self._keepalive_loop,
+                args=(self._keepalive_stop, keepalive_interval),
+                name="taas-keepalive",
+                daemon=True,
+            ).start()
+        return opened
+
+    def _keepalive_loop(self, stop: threading.Event, interval: float):
+        while not stop.wait(interval):
+            for url in self.urls:
+                self.transport.keepalive(url)
+
+    def close(self):
+        if self._keepalive_stop is not None:
+            self._keepalive_stop.set()
+            self._keepalive_stop = None
+        with self._hedge_executor_lock:
+            for executor in (self._request_executor, self._hedge_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            self._request_executor = self._hedge_executor = None
+        if self.endpoints is not None and self._owns_endpoints:
+            self.endpoints.close()
+        if self.limiter is not None and self.metrics is not None:
+            self.metrics.remove_collector(self.limiter.collect)
+            self.limiter.remove_gauges(self.metrics)
+        self.transport.close()
+
+    def _handle_response(self, response):
+        if response.status_code >= 400:
             logger.warning(response.content)
 
         return response.json()
 
+    @property
+    def taas_url(self) -> str:
+        return self._taas_url
+
+    @taas_url.setter
+    def taas_url(self, url: str):
+        self._taas_url = url
+        # API paths are absolute, so joining them keeps only the origin.
+        self._url_prefix = urljoin(url, "/").rstrip("/")
+
+    @property
+    def auth_token(self) -> str:
+        return self._auth_token
+
+    @auth_token.setter
+    def auth_token(self, auth_token: str):
+        self._auth_token = auth_token
+        self._headers = None
+
+    def _url(self, path: str) -> str:
+        if path.startswith("/") and not path.startswith("//"):
+            return self._url_prefix + path
+        return urljoin(self.taas_url, path)
+
     def _common_headers(self):
-        headers = {
-            "Authorization": f"Token {self.auth_token}",
-        }
-        if self._extra_headers:
-            headers.update(self._extra_headers)
-        return headers
+        # Built once and shared by every request, transports must not modify it.
+        if self._headers is None:
+            headers = {
+                "Authorization": f"Token {self.auth_token}",
+            }
+            if self._extra_headers:
+                headers.update(self._extra_headers)
+            self._headers = headers
+        return self._headers
+
+
+def _page_results(response, page_size: int):
+    # /api/orders/ is either paginated ({"results": [...], "next": ...}) or a
+    # bare list, in which case a short page means there is nothing left.
+    if isinstance(response, dict):
+        return response.get("results", []), bool(response.get("next"))
+    return response, len(response) >= page_size
 
 
 class Client(BaseClient):
-    def get_order(self, order_id: str):
-        return self.get(path=f"/api/order/{order_id}")
+    journaled_endpoints = frozenset(
+        {
+            "place_order",
+            "place_multi_order",
+            "place_chained_order",
+            "cancel_order",
+            "cancel_multi_order",
+            "amend_order",
+        }
+    )
+
+    def get_order(self, order_id: str, deadline: DeadlineArg = None):
+        return self.get(
+            path=f"/api/order/{order_id}", endpoint="get_order", deadline=deadline
+        )
 
-    def get_order_summary(self, order_id: str):
-        return self.get(path=f"/api/order_summary/{order_id}")
+    def get_order_summary(self, order_id: str, deadline: DeadlineArg = None):
+        return self.get(
+            path=f"/api/order_summary/{order_id}",
+            endpoint="get_order_summary",
+            deadline=deadline,
+        )
 
     def get_balances(
-        self, exchange_names: List[str] = None, account_names: List[str] = None
+        self,
+        exchange_names: List[str] = None,
+        account_names: List[str] = None,
+        deadline: DeadlineArg = None,
     ):
         params = {}
         if exchange_names:
@@ -97,15 +618,78 @@ class Client(BaseClient):
         if account_names:
             params["account_names"] = ",".join(account_names)
 
-        return self.get(path=f"/api/balances/", params=params)
+        return self.get(
+            path=f"/api/balances/",
+            params=params,
+            endpoint="get_balances",
+            deadline=deadline,
+        )
 
-    def get_all_orders(self, request: data.GetOrderRequest):
+    def get_all_orders(
+        self, request: data.GetOrderRequest, deadline: DeadlineArg = None
+    ):
         if not isinstance(request, data.GetOrderRequest):
             raise ValueError(f"Expecting request to be of type {data.GetOrderRequest}")
 
-        return self.get(path="/api/orders/", params=request.to_post_body())
+        return self.get(
+            path="/api/orders/",
+            params=request.to_post_body(),
+            endpoint="get_all_orders",
+            deadline=deadline,
+        )
+
+    def iter_all_orders(
+        self, request: data.GetOrderRequest, deadline: DeadlineArg = None
+    ) -> Iterator[dict]:
+        """Yields orders across every page matching the request, starting at
+        request.page. The deadline covers the whole scan, not each page."""
+        if not isinstance(request, data.GetOrderRequest):
+            raise ValueError(f"Expecting request to be of type {data.GetOrderRequest}")
 
-    def place_multi_order(self, request: data.PlaceMultiOrderRequest):
+        deadline = Deadline.coerce(deadline)
+        page_request = replace(
+            request,
+            page=request.page or 1,
+            page_size=request.page_size or DEFAULT_PAGE_SIZE,
+        )
+        while True:
+            response = self.get_all_orders(page_request, deadline=deadline)
+            orders, has_more = _page_results(response, page_request.page_size)
+            yield from orders
+
+            if not has_more:
+                return
+            page_request = replace(page_request, page=page_request.page + 1)
+
+    def backfill_orders(
+        self,
+        start: Union[datetime, str],
+        end: Union[datetime, str],
+        statuses: Sequence[str] = None,
+        account_names: List[str] = None,
+        max_workers: int = DEFAULT_BACKFILL_WORKERS,
+        ordered: bool = True,
+        deadline: DeadlineArg = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """Yields every order created between start and end, paging windows
+        of the range concurrently. See taas_api.backfill.backfill_orders for
+        the window sizing options."""
+        return backfill_orders(
+            self,
+            start,
+            end,
+            statuses=statuses,
+            account_names=account_names,
+            max_workers=max_workers,
+            ordered=ordered,
+            deadline=deadline,
+            **kwargs,
+        )
+
+    def place_multi_order(
+        self, request: data.PlaceMultiOrderRequest, deadline: DeadlineArg = None
+    ):
         if not isinstance(request, data.PlaceMultiOrderRequest):
             raise ValueError(
                 f"Expecting request to be of type {data.PlaceMultiOrderRequest}"
@@ -115,12 +699,29 @@ class Client(BaseClient):
 
         if not validate_success:
             raise ValueError(str(errors))
-        return self.post(path="/api/multi_orders/", data=request.to_post_body())
-
-    def cancel_multi_order(self, order_id: str):
-        return self.delete(path=f"/api/multi_order/{order_id}")
-
-    def place_order(self, request: data.PlaceOrderRequest):
+        return self.post(
+            path="/api/multi_orders/",
+            data=request.to_post_body(),
+            endpoint="place_multi_order",
+            deadline=deadline,
+        )
+
+    def cancel_multi_order(
+        self, order_id: str, deadline: DeadlineArg = None, return_status: bool = False
+    ):
+        return self.delete(
+            path=f"/api/multi_order/{order_id}",
+            endpoint="cancel_multi_order",
+            deadline=deadline,
+            return_status=return_status,
+        )
+
+    def place_order(
+        self,
+        request: data.PlaceOrderRequest,
+        deadline: DeadlineArg = None,
+        return_status: bool = False,
+    ):
         if not isinstance(request, data.PlaceOrderRequest):
             raise ValueError(
                 f"Expecting request to be of type {data.PlaceOrderRequest}"
@@ -131,16 +732,88 @@ class Client(BaseClient):
         if not validate_success:
             raise ValueError(error)
 
-        return self.post(path="/api/orders/", data=request.to_post_body())
+        cache = self.leverage_cache
+        if cache is None or request.updated_leverage is None:
+            return self._request(
+                "POST",
+                "/api/orders/",
+                endpoint="place_order",
+                deadline=deadline,
+                return_status=return_status,
+                json=request.to_post_body(),
+            )
 
-    def cancel_order(self, order_id: str):
-        return self.delete(path=f"/api/order/{order_id}")
+        body = request.to_post_body()
+        if not cache.missing(request.accounts, request.pair, request.updated_leverage):
+            del body["updated_leverage"]
+        else:
+            # Entries keyed by account ID for the pair go stale too.
+            cache.invalidate(pair=request.pair)
+        status, result = self._request(
+            "POST",
+            "/api/orders/",
+            endpoint="place_order",
+            deadline=deadline,
+            return_status=True,
+            json=body,
+        )
+        if status < 400 and "updated_leverage" in body:
+            cache.confirm(request.accounts, request.pair, request.updated_leverage)
+        return (status, result) if return_status else result
+
+    def place_orders_bulk(
+        self,
+        orders: Iterable[Union[data.PlaceOrderRequest, dict]],
+        processes: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        deadline: DeadlineArg = None,
+    ) -> List[BulkOrderResult]:
+        """Places a large batch of orders from a pool of worker processes.
+        Orders are PlaceOrderRequests or dicts of their fields; results come
+        back in input order."""
+        return place_orders_in_processes(
+            self, orders, processes=processes, chunk_size=chunk_size, deadline=deadline
+        )
+
+    def cancel_order(
+        self, order_id: str, deadline: DeadlineArg = None, return_status: bool = False
+    ):
+        return self.delete(
+            path=f"/api/order/{order_id}",
+            endpoint="cancel_order",
+            deadline=deadline,
+            return_status=return_status,
+        )
+
+    def cancel_all(
+        self,
+        statuses: Sequence[str] = (OrderStatus.ACTIVE.value,),
+        account_names: List[str] = None,
+        pairs: Sequence[str] = None,
+        max_workers: int = DEFAULT_CANCEL_WORKERS,
+        progress: Optional[Callable[[CancelAllResult], None]] = None,
+        deadline: DeadlineArg = None,
+        max_attempts: int = DEFAULT_CANCEL_ATTEMPTS,
+    ) -> CancelAllResult:
+        """Cancels every order and multi order matching the filters, fanning
+        the cancels out concurrently while pages are still being fetched."""
+        return cancel_all(
+            self,
+            statuses=statuses,
+            account_names=account_names,
+            pairs=pairs,
+            max_workers=max_workers,
+            progress=progress,
+            deadline=deadline,
+            max_attempts=max_attempts,
+        )
 
     def close_balances(
         self,
         max_notional: float,
         account_names: List[str] = None,
         preferred_strategy: str = None,
+        deadline: DeadlineArg = None,
     ):
         data = {
             "max_notional": max_notional,
@@ -152,25 +825,46 @@ class Client(BaseClient):
         if preferred_strategy:
             data["preferred_strategy"] = preferred_strategy
 
-        return self.post(path="/api/close_balances/", data=data)
+        return self.post(
+            path="/api/close_balances/",
+            data=data,
+            endpoint="close_balances",
+            deadline=deadline,
+        )
 
-    def get_order_messages(self, request: data.GetOrderMessagesRequest):
+    def get_order_messages(
+        self, request: data.GetOrderMessagesRequest, deadline: DeadlineArg = None
+    ):
         if not isinstance(request, data.GetOrderMessagesRequest):
             raise ValueError(
                 f"Expecting request to be of type {data.GetOrderMessagesRequest}"
             )
 
-        return self.post(path="/api/order_messages/", data=request.to_post_body())
+        return self.post(
+            path="/api/order_messages/",
+            data=request.to_post_body(),
+            endpoint="get_order_messages",
+            deadline=deadline,
+        )
 
-    def amend_order(self, request: data.AmendOrderRequest):
+    def amend_order(
+        self, request: data.AmendOrderRequest, deadline: DeadlineArg = None
+    ):
         if not isinstance(request, data.AmendOrderRequest):
             raise ValueError(
                 f"Expecting request to be of type {data.AmendOrderRequest}"
             )
 
-        return self.post(path="/api/amend_order/", data=request.to_post_body())
+        return self.post(
+            path="/api/amend_order/",
+            data=request.to_post_body(),
+            endpoint="amend_order",
+            deadline=deadline,
+        )
 
-    def place_chained_order(self, request: data.PlaceChainedOrderRequest):
+    def place_chained_order(
+        self, request: data.PlaceChainedOrderRequest, deadline: DeadlineArg = None
+    ):
         if not isinstance(request, data.PlaceChainedOrderRequest):
             raise ValueError(
                 f"Expecting request to be of type {data.PlaceChainedOrderRequest}"
@@ -180,9 +874,21 @@ class Client(BaseClient):
 
         if not validate_success:
             raise ValueError(str(errors))
-        return self.post(path="/api/chained_orders/", data=request.to_post_body())
-
-    def set_leverage(self, request: data.SetLeverageRequest):
+        return self.post(
+            path="/api/chained_orders/",
+            data=request.to_post_body(),
+            endpoint="place_chained_order",
+            deadline=deadline,
+        )
+
+    def set_leverage(
+        self, request: data.SetLeverageRequest, deadline: DeadlineArg = None
+    ):
+        """Sets the leverage of the accounts on the pair. With a leverage
+        cache, only accounts whose leverage may differ are sent, and the
+        response covers those accounts only. When none do, nothing is sent
+        and the result is not a TaaS response but the request body with
+        `"cached": True` added."""
         if not isinstance(request, data.SetLeverageRequest):
             raise ValueError(
                 f"Expecting request to be of type {data.SetLeverageRequest}"
@@ -191,4 +897,35 @@ class Client(BaseClient):
         validate_success, errors = request.validate()
         if not validate_success:
             raise ValueError(str(errors))
-        return self.post(path="/api/set_leverage/", data=request.to_post_body())
+
+        cache = self.leverage_cache
+        if cache is None:
+            return self.post(
+                path="/api/set_leverage/",
+                data=request.to_post_body(),
+                endpoint="set_leverage",
+                deadline=deadline,
+            )
+
+        # Only accounts whose leverage may differ are sent, if none, the
+        # call is answered locally.
+        missing = cache.missing(request.account_ids, request.pair, request.leverage)
+        if not missing:
+            logger.debug(f"leverage of {request.pair} already {request.leverage}")
+            return {**request.to_post_body(), "cached": True}
+
+        request = replace(request, account_ids=missing)
+        # Entries keyed by account name for the pair go stale too, and none
+        # may survive a failed or unanswered change.
+        cache.invalidate(pair=request.pair)
+        status, result = self._request(
+            "POST",
+            "/api/set_leverage/",
+            endpoint="set_leverage",
+            deadline=deadline,
+            return_status=True,
+            json=request.to_post_body(),
+        )
+        if status < 400:
+            cache.confirm(missing, request.pair, request.leverage)
+        return result
@@ -6,6 +6,85 @@ import re
 INTERNAL_PAIR_RE_PATTERN = r"([a-zA-Z0-9]+)(:\w+)?-([a-zA-Z0-9]+)"
 
 
+QTY_FIELDS = ["sell_token_amount", "base_asset_qty", "quote_asset_qty"]
+
+
+def _check_side(order):
+    try:
+        Side(order.side)
+    except ValueError:
+        return "side must be 'buy' or 'sell'"
+
+
+def _check_strategy(order):
+    try:
+        Strategy(order.strategy)
+    except ValueError:
+        return f"unexpected strategy {order.strategy}"
+
+
+def _check_pair(order):
+    if re.search(INTERNAL_PAIR_RE_PATTERN, order.pair) is None:
+        return "pair must correct syntax: {BASE}-{QUOTE} or {BASE}:{VARIANT}-{QUOTE} ex. ETH-USDT or ETH:PERP-USDT"
+
+
+def _check_qty(order):
+    if all([getattr(order, field) is None for field in QTY_FIELDS]):
+        return f"need one of {QTY_FIELDS}"
+
+
+def _check_optional(field, is_valid, error):
+    def check(order):
+        value = getattr(order, field)
+        if value is not None and not is_valid(value):
+            return error
+
+    return (field,), check
+
+
+def _check_duration(order):
+    if order.duration is None and order.pov_target is None:
+        return "duration or pov_target must be provided"
+
+
+# (fields read, check) in the order PlaceOrderRequest.validate runs them.
+# A check returns an error message, or None when the order passes.
+PLACE_ORDER_CHECKS = (
+    (("side",), _check_side),
+    (("strategy",), _check_strategy),
+    (("pair",), _check_pair),
+    (tuple(QTY_FIELDS), _check_qty),
+    _check_optional(
+        "engine_passiveness",
+        lambda v: 0 <= v <= 1,
+        "engine_passiveness out of range, must be [0,1]",
+    ),
+    _check_optional(
+        "schedule_discretion",
+        lambda v: 0.02 <= v <= 1,
+        "schedule_discretion out of range, must be [0.02,1]",
+    ),
+    _check_optional(
+        "alpha_tilt", lambda v: -1 <= v <= 1, "alpha_tilt out of range, must be [-1,1]"
+    ),
+    _check_optional(
+        "pov_limit", lambda v: 0 < v <= 1, "pov_limit is a ratio within (0,1]"
+    ),
+    _check_optional(
+        "pov_target", lambda v: 0 < v <= 1, "pov_target is a ratio within (0,1]"
+    ),
+    _check_optional(
+        "max_otc", lambda v: not v <= 0, "max_otc must be a positive value"
+    ),
+    _check_optional(
+        "strategy_params",
+        lambda v: isinstance(v, dict),
+        "strategy_params must be a dict",
+    ),
+    (("duration", "pov_target"), _check_duration),
+)
+
+
 @dataclass
 class PlaceOrderRequest:
     accounts: List[str]
@@ -32,58 +111,10 @@ class PlaceOrderRequest:
     pos_side: Optional[str] = None
 
     def validate(self):
-        try:
-            Side(self.side)
-        except ValueError:
-            return False, "side must be 'buy' or 'sell'"
-
-        try:
-            Strategy(self.strategy)
-        except ValueError:
-            return False, f"unexpected strategy {self.strategy}"
-
-        result = re.search(INTERNAL_PAIR_RE_PATTERN, self.pair)
-
-        if result is None:
-            return (
-                False,
-                "pair must correct syntax: {BASE}-{QUOTE} or {BASE}:{VARIANT}-{QUOTE} ex. ETH-USDT or ETH:PERP-USDT",
-            )
-
-        qty_fields = ["sell_token_amount", "base_asset_qty", "quote_asset_qty"]
-        if all([getattr(self, field) is None for field in qty_fields]):
-            return False, f"need one of {qty_fields}"
-
-        if self.engine_passiveness is not None:
-            if not (0 <= self.engine_passiveness <= 1):
-                return False, "engine_passiveness out of range, must be [0,1]"
-
-        if self.schedule_discretion is not None:
-            if not (0.02 <= self.schedule_discretion <= 1):
-                return False, "schedule_discretion out of range, must be [0.02,1]"
-
-        if self.alpha_tilt is not None:
-            if not (-1 <= self.alpha_tilt <= 1):
-                return False, "alpha_tilt out of range, must be [-1,1]"
-
-        if self.pov_limit is not None:
-            if not (0 < self.pov_limit <= 1):
-                return False, "pov_limit is a ratio within (0,1]"
-
-        if self.pov_target is not None:
-            if not (0 < self.pov_target <= 1):
-                return False, "pov_target is a ratio within (0,1]"
-
-        if self.max_otc is not None:
-            if self.max_otc <= 0:
-                return False, "max_otc must be a positive value"
-
-        if self.strategy_params is not None:
-            if not isinstance(self.strategy_params, dict):
-                return False, "strategy_params must be a dict"
-
-        if self.duration is None and self.pov_target is None:
-            return False, "duration or pov_target must be provided"
+        for _, check in PLACE_ORDER_CHECKS:
+            error = check(self)
+            if error is not None:
+                return False, error
 
         return True, None
 
@@ -0,0 +1,49 @@
+from typing import Optional, Tuple, Union
+import time
+
+# (connect, read) in seconds, or a single value used for both.
+TimeoutValue = Union[float, Tuple[float, float]]
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call runs out of the time budget given by its deadline."""
+
+
+class Deadline:
+    """Time budget shared by every request made on behalf of one call."""
+
+    def __init__(self, timeout: float):
+        if timeout < 0:
+            raise ValueError("deadline timeout must be a non-negative number")
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    @classmethod
+    def coerce(cls, deadline: Union["Deadline", float, None]) -> Optional["Deadline"]:
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, operation: str):
+        if self.expired:
+            raise self.exceeded(operation)
+
+    def exceeded(self, operation: str) -> DeadlineExceeded:
+        return DeadlineExceeded(
+            f"{operation} exceeded its deadline of {self.timeout:.3f}s"
+        )
+
+    def clamp(self, timeout: Optional[TimeoutValue]) -> TimeoutValue:
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
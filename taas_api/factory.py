@@ -0,0 +1,122 @@
+from typing import Callable, Dict, Optional, Sequence, Union
+
+from taas_api.client import Client
+from taas_api.failover import EndpointPool, FailoverPolicy
+from taas_api.limiter import AdaptiveLimiter
+from taas_api.metrics import MetricsRegistry
+from taas_api.scheduler import RequestScheduler
+from taas_api.transport import Transport, build_transport
+
+
+class _SharedTransport(Transport):
+    # Hands a factory's transport to its clients, closing a client leaves the
+    # connections to the factory.
+    def __init__(self, transport: Transport):
+        self.transport = transport
+
+    def request(self, method, url, headers, params=None, json=None, timeout=None):
+        return self.transport.request(
+            method, url, headers, params=params, json=json, timeout=timeout
+        )
+
+    def warmup(self, url: str, connections: int) -> int:
+        return self.transport.warmup(url, connections)
+
+    def keepalive(self, url: str):
+        self.transport.keepalive(url)
+
+
+class ClientFactory:
+    """Builds Clients for many auth tokens against one TaaS deployment.
+
+    Every client shares the factory's transport, i.e. one connection pool,
+    its metrics registry and, given several base URLs, the health and
+    latency of each endpoint. Per-token state is built fresh for every
+    client: its headers, hedge budget, leverage cache and the limiter and
+    scheduler returned by the `limiter` and `scheduler` callables. A new
+    client therefore opens no connections of its own.
+
+        factory = ClientFactory(url, limiter=AdaptiveLimiter, metrics=MetricsRegistry())
+        clients = {name: factory.client(token, name=name) for name, token in tokens.items()}
+
+    Other arguments are passed to every client. Closing a client leaves the
+    shared transport open, close the factory once its clients are done.
+    """
+
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: Union[Transport, str, None] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        limiter: Optional[Callable[[], AdaptiveLimiter]] = None,
+        scheduler: Optional[Callable[[], RequestScheduler]] = None,
+        failover_policy: Optional[FailoverPolicy] = None,
+        client_class=Client,
+        **client_kwargs,
+    ):
+        self.urls = [url] if isinstance(url, str) else list(url)
+        self.transport = build_transport(transport)
+        self.metrics = metrics
+        self.limiter = limiter
+        self.scheduler = scheduler
+        self.client_class = client_class
+        self.client_kwargs = client_kwargs
+
+        self._shared_transport = _SharedTransport(self.transport)
+        self.endpoints = (
+            EndpointPool(self.urls, failover_policy, probe=self._probe_endpoint)
+            if len(self.urls) > 1
+            else None
+        )
+
+    def client(
+        self,
+        auth_token: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+        **kwargs,
+    ) -> Client:
+        """Builds a client for the token. `name`, e.g. the sub-account, is
+        added as a "client" label to its metrics."""
+        labels = {"client": name} if name is not None else None
+        limiter = self.limiter() if self.limiter is not None else None
+        if limiter is not None and labels:
+            limiter.labels.update(labels)
+
+        client = self.client_class(
+            self.urls if self.endpoints is not None else self.urls[0],
+            auth_token=auth_token,
+            extra_headers=extra_headers,
+            transport=self._shared_transport,
+            endpoints=self.endpoints,
+            metrics=self.metrics,
+            metrics_labels=labels,
+            limiter=limiter,
+            scheduler=self.scheduler() if self.scheduler is not None else None,
+            **{**self.client_kwargs, **kwargs},
+        )
+        return client
+
+    def warmup(self, connections: int = 4) -> int:
+        """Opens pooled connections to every base URL for all clients."""
+        return sum(self.transport.warmup(url, connections) for url in self.urls)
+
+    def close(self):
+        if self.endpoints is not None:
+            self.endpoints.close()
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _probe_endpoint(self, target):
+        policy = self.endpoints.policy
+        self.transport.request(
+            "HEAD",
+            target.prefix + policy.probe_path,
+            headers={},
+            timeout=policy.probe_timeout,
+        )
@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+from urllib.parse import urljoin
+import logging
+import sys
+import threading
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Methods sent again to another endpoint after any connection error. Other
+# requests only fail over when they cannot have reached the server.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class FailoverPolicy:
+    # Weight of the newest latency in each endpoint's moving average.
+    alpha: float = 0.2
+    # Seconds between probes of the endpoints marked down.
+    probe_interval: float = 5.0
+    # Requested with HEAD, any response counts as the endpoint being back.
+    probe_path: str = "/"
+    probe_timeout: float = 2.0
+
+    def validate(self):
+        if not (0 < self.alpha <= 1):
+            return False, "alpha out of range, must be (0,1]"
+
+        if self.probe_interval <= 0:
+            return False, "probe_interval must be a positive number of seconds"
+
+        if self.probe_timeout <= 0:
+            return False, "probe_timeout must be a positive number of seconds"
+
+        return True, None
+
+
+def request_not_sent(error: BaseException) -> bool:
+    """Whether a transport error means the connection was never established,
+    so even a placement can safely be sent to another endpoint."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    # Only checked when the HTTP/2 transport already imported it.
+    httpx = sys.modules.get("httpx")
+    pending = [error]
+    while pending:
+        cause = pending.pop()
+        if isinstance(cause, NewConnectionError):
+            return True
+        if httpx is not None and isinstance(cause, httpx.ConnectError):
+            return True
+        # requests wraps urllib3's MaxRetryError, which holds the reason.
+        pending.extend(
+            c
+            for c in (
+                *cause.args[:1],
+                getattr(cause, "reason", None),
+                cause.__cause__,
+            )
+            if isinstance(c, BaseException) and c is not cause
+        )
+    return False
+
+
+class Endpoint:
+    def __init__(self, url: str, index: int):
+        self.url = url
+        self.index = index
+        # API paths are absolute, so joining them keeps only the origin.
+        self.prefix = urljoin(url, "/").rstrip("/")
+        self.healthy = True
+        # Moving average of the round-trip latency in seconds, None until the
+        # first response.
+        self.latency: Optional[float] = None
+        self.down_since: Optional[float] = None
+
+
+class EndpointPool:
+    """Base URLs of one TaaS deployment, ranked by health and latency.
+
+    Requests go to the healthy endpoint with the lowest moving average of
+    latency, endpoints without one yet are tried first. An endpoint that
+    fails to connect is marked down and probed in the background every
+    `probe_interval` until it answers again. When every endpoint is down,
+    requests still go out, to the one down the longest first.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        policy: Optional[FailoverPolicy] = None,
+        probe: Optional[Callable[[Endpoint], None]] = None,
+    ):
+        if not urls:
+            raise ValueError("at least one url is required")
+
+        policy = policy or FailoverPolicy()
+        validate_success, error = policy.validate()
+        if not validate_success:
+            raise ValueError(error)
+
+        self.policy = policy
+        self.endpoints = [Endpoint(url, i) for i, url in enumerate(urls)]
+        # Raises a requests exception when the endpoint does not answer.
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._probe_stop: Optional[threading.Event] = None
+
+    def ranked(self) -> List[Endpoint]:
+        """Endpoints in the order a request should try them."""
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.healthy]
+            down = [e for e in self.endpoints if not e.healthy]
+        healthy.sort(key=lambda e: (e.latency or 0.0, e.index))
+        down.sort(key=lambda e: e.down_since)
+        return healthy + down
+
+    def record_latency(self, endpoint: Endpoint, seconds: float):
+        with self._lock:
+            if not endpoint.healthy:
+                self._mark_up(endpoint)
+            if endpoint.latency is None:
+                endpoint.latency = seconds
+            else:
+                endpoint.latency += self.policy.alpha * (seconds - endpoint.latency)
+
+    def record_failure(self, endpoint: Endpoint):
+        with self._lock:
+            if not endpoint.healthy:
+                return
+            endpoint.healthy = False
+            endpoint.down_since = time.monotonic()
+            stop = None
+            if self._probe is not None and self._probe_stop is None:
+                stop = self._probe_stop = threading.Event()
+        logger.warning(f"endpoint {endpoint.url} is down")
+
+        if stop is not None:
+            threading.Thread(
+                target=self._probe_loop,
+                args=(stop,),
+                name="taas-failover-probe",
+                daemon=True,
+            ).start()
+
+    def probe(self):
+        """Probes every endpoint marked down once."""
+        for endpoint in self.ranked():
+            if endpoint.healthy:
+                continue
+            try:
+                self._probe(endpoint)
+            except requests.exceptions.RequestException:
+                continue
+            with self._lock:
+                if not endpoint.healthy:
+                    self._mark_up(endpoint)
+
+    def close(self):
+        with self._lock:
+            if self._probe_stop is not None:
+                self._probe_stop.set()
+                self._probe_stop = None
+
+    def _mark_up(self, endpoint: Endpoint):
+        endpoint.healthy = True
+        endpoint.down_since = None
+        # Measured again by the next request, the probe is not a fair sample.
+        endpoint.latency = None
+        logger.info(f"endpoint {endpoint.url} is back up")
+
+    def _probe_loop(self, stop: threading.Event):
+        while not stop.wait(self.policy.probe_interval):
+            try:
+                self.probe()
+            except Exception as e:
+                logger.warning(f"probing endpoints failed: {e}")
@@ -0,0 +1,101 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional
+import threading
+
+
+@dataclass
+class HedgePolicy:
+    # Seconds to wait for the first response before sending the hedge. When
+    # None, the observed latency percentile of the endpoint is used instead.
+    delay: Optional[float] = None
+    percentile: float = 0.95
+    # Observed latencies needed before the percentile is trusted.
+    min_samples: int = 20
+    # Delay used while an endpoint has fewer than min_samples observations.
+    default_delay: float = 0.5
+    # Hedges earned per request sent, i.e. 0.1 caps extra load at ~10%.
+    budget_ratio: float = 0.1
+    # Maximum number of hedges that can be spent in a burst.
+    max_budget: float = 5.0
+    # Threads sending hedges.
+    max_workers: int = 16
+    # Threads sending first attempts, so hedged reads are not capped by the
+    # hedge workers.
+    max_request_workers: int = 64
+
+    def validate(self):
+        if self.delay is not None and self.delay < 0:
+            return False, "delay must be a non-negative number of seconds"
+
+        if not (0 < self.percentile < 1):
+            return False, "percentile out of range, must be (0,1)"
+
+        if not (0 <= self.budget_ratio <= 1):
+            return False, "budget_ratio out of range, must be [0,1]"
+
+        if self.max_budget < 1:
+            return False, "max_budget must be at least 1"
+
+        if self.max_workers < 2:
+            return False, "max_workers must be at least 2"
+
+        if self.max_request_workers < 1:
+            return False, "max_request_workers must be at least 1"
+
+        return True, None
+
+
+class LatencyTracker:
+    """Keeps a sliding window of observed latencies per endpoint."""
+
+    def __init__(self, window: int = 256):
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def count(self, endpoint: str) -> int:
+        with self._lock:
+            return len(self._samples.get(endpoint, ()))
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+
+        if not samples:
+            return None
+
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+
+class HedgeBudget:
+    """Token bucket refilled by regular requests and drained by hedges."""
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
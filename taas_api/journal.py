@@ -0,0 +1,178 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Union
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+REQUEST = 1
+RESPONSE = 2
+ERROR = 3
+
+# payload length, payload crc32, sequence, unix timestamp, record kind
+_HEADER = struct.Struct("<IIQdB")
+
+
+@dataclass
+class JournalEntry:
+    seq: int
+    kind: int
+    timestamp: float
+    payload: Dict[str, Any]
+
+    @property
+    def operation(self) -> Optional[str]:
+        return self.payload.get("operation")
+
+
+def read_journal(path: str) -> Iterator[JournalEntry]:
+    """Yields every intact record of a journal file in write order, stopping
+    at the first torn or corrupt record."""
+    for entry, _ in _scan(path):
+        yield entry
+
+
+def _scan(path: str):
+    # Yields (entry, offset just past the entry) over a memory map of the file.
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            offset = 0
+            size = len(buf)
+            while offset + _HEADER.size <= size:
+                length, crc, seq, timestamp, kind = _HEADER.unpack_from(buf, offset)
+                start = offset + _HEADER.size
+                end = start + length
+                if end > size:
+                    return
+
+                payload = buf[start:end]
+                if zlib.crc32(payload) != crc:
+                    logger.warning(f"journal {path} corrupt at offset {offset}")
+                    return
+
+                yield JournalEntry(seq, kind, timestamp, json.loads(payload)), end
+                offset = end
+
+
+class OrderJournal:
+    """Append-only binary log of order requests and their responses.
+
+    Every record is handed to the OS as soon as it is written, so it survives
+    a crash of the process. fsync is batched: it runs once sync_every records
+    are pending, and a background thread syncs leftovers every sync_interval
+    seconds, bounding what an OS crash can lose.
+    """
+
+    def __init__(self, path: str, sync_every: int = 64, sync_interval: float = 1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        last_seq = 0
+        valid_size = 0
+        for entry, end in _scan(path):
+            last_seq = entry.seq
+            valid_size = end
+
+        self._file = open(path, "ab")
+        if self._file.tell() > valid_size:
+            # Drop a torn tail left by a crash so new records stay readable.
+            self._file.truncate(valid_size)
+
+        self._seq = last_seq
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(
+            target=self._sync_loop, name="taas-journal-sync", daemon=True
+        )
+        self._syncer.start()
+
+    def record_request(self, operation: str, path: str, body: Any = None) -> int:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._append(
+                REQUEST, seq, {"operation": operation, "path": path, "body": body}
+            )
+        return seq
+
+    def record_response(self, seq: int, response: Any):
+        with self._lock:
+            self._append(RESPONSE, seq, {"response": response})
+
+    def record_error(self, seq: int, error: Union[BaseException, str]):
+        if isinstance(error, BaseException):
+            error = f"{type(error).__name__}: {error}"
+        with self._lock:
+            self._append(ERROR, seq, {"error": error})
+
+    def entries(self) -> Iterator[JournalEntry]:
+        self.flush()
+        return read_journal(self.path)
+
+    def pending(self) -> List[JournalEntry]:
+        """Requests without a recorded response or error, i.e. calls that were
+        in flight when the process stopped and need checking against TaaS."""
+        in_flight = {}
+        for entry in self.entries():
+            if entry.kind == REQUEST:
+                in_flight[entry.seq] = entry
+            else:
+                in_flight.pop(entry.seq, None)
+        return list(in_flight.values())
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._syncer.join()
+        with self._lock:
+            self._sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _append(self, kind: int, seq: int, payload: dict):
+        encoded = json.dumps(payload, separators=(",", ":")).encode()
+        self._file.write(
+            _HEADER.pack(len(encoded), zlib.crc32(encoded), seq, time.time(), kind)
+        )
+        self._file.write(encoded)
+        self._file.flush()
+
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self._sync()
+
+    def _sync(self):
+        if self._unsynced and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _sync_loop(self):
+        while not self._closed.wait(self.sync_interval):
+            with self._lock:
+                self._sync()
@@ -0,0 +1,64 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+
+def _normalize(leverage) -> str:
+    # "10", 10 and "10.0" all set the same leverage.
+    try:
+        return repr(float(leverage))
+    except (TypeError, ValueError):
+        return str(leverage)
+
+
+class LeverageCache:
+    """Last leverage TaaS confirmed per (account, pair).
+
+    Accounts are keyed as given, account IDs for set_leverage and account
+    names for place_order. The two cannot be matched, so the client drops
+    every entry of a pair before sending a leverage change for it. Entries
+    expire after `ttl` seconds, so leverage changed outside this client is
+    picked up again; call invalidate() to drop them sooner.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account: str, pair: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((account, pair))
+            if entry is None:
+                return None
+            leverage, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[(account, pair)]
+                return None
+            return leverage
+
+    def missing(self, accounts: Iterable[str], pair: str, leverage) -> List[str]:
+        """The accounts whose leverage on the pair is not known to be
+        `leverage`."""
+        leverage = _normalize(leverage)
+        return [account for account in accounts if self.get(account, pair) != leverage]
+
+    def confirm(self, accounts: Iterable[str], pair: str, leverage):
+        expires_at = time.monotonic() + self.ttl
+        leverage = _normalize(leverage)
+        with self._lock:
+            for account in accounts:
+                self._entries[(account, pair)] = (leverage, expires_at)
+
+    def invalidate(self, account: Optional[str] = None, pair: Optional[str] = None):
+        """Drops the entries matching the account and pair, every entry if
+        neither is given."""
+        with self._lock:
+            for key in list(self._entries):
+                if (account is None or key[0] == account) and (
+                    pair is None or key[1] == pair
+                ):
+                    del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,148 @@
+from typing import Dict, Optional
+import threading
+import time
+
+from taas_api.metrics import MetricsRegistry
+
+# Set by AdaptiveLimiter.collect for every endpoint.
+GAUGES = (
+    "taas_concurrency_limit",
+    "taas_in_flight",
+    "taas_error_rate",
+    "taas_baseline_latency_seconds",
+)
+
+
+class _EndpointLimit:
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        # Latency without queueing, the lowest seen, drifting up slowly so a
+        # lasting change of the baseline is picked up.
+        self.baseline: Optional[float] = None
+        # Moving average of the share of failed requests.
+        self.error_rate = 0.0
+        self.last_decrease = 0.0
+
+
+class AdaptiveLimiter:
+    """Caps the requests in flight per endpoint, adapting the cap with AIMD.
+
+    Every request that completes within `tolerance` times the endpoint's
+    baseline latency while at least half the cap is in use raises the cap by
+    1 / cap, i.e. by about one per round of requests. A failed request, or
+    one slower than that, multiplies it by `backoff`, at most once per
+    round trip so one burst of failures only counts once. Failures are
+    transport errors and 429 or 5xx responses. The cap stays within
+    [min_limit, max_limit].
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        baseline_drift: float = 0.01,
+        error_alpha: float = 0.05,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        if not (1 <= min_limit <= initial_limit <= max_limit):
+            raise ValueError(
+                "limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            )
+        if tolerance <= 1:
+            raise ValueError("tolerance must be larger than 1")
+        if not (0 < backoff < 1):
+            raise ValueError("backoff out of range, must be (0,1)")
+
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline_drift = baseline_drift
+        self.error_alpha = error_alpha
+        # Added to the labels of every gauge, see collect().
+        self.labels = dict(labels) if labels else {}
+
+        self._cond = threading.Condition()
+        self._limits: Dict[str, _EndpointLimit] = {}
+
+    def acquire(self, endpoint: str, timeout: Optional[float] = None) -> bool:
+        """Waits until the endpoint is below its cap. Returns False on
+        timeout."""
+        end_time = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            state = self._state(endpoint)
+            while state.in_flight >= int(state.limit):
+                remaining = None
+                if end_time is not None:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                self._cond.wait(remaining)
+            state.in_flight += 1
+            return True
+
+    def release(self, endpoint: str, latency: float, failed: bool = False):
+        now = time.monotonic()
+        with self._cond:
+            state = self._limits[endpoint]
+            in_use = state.in_flight
+            state.in_flight -= 1
+            state.error_rate += self.error_alpha * (failed - state.error_rate)
+
+            if not failed:
+                if state.baseline is None or latency < state.baseline:
+                    state.baseline = latency
+                else:
+                    state.baseline += self.baseline_drift * (latency - state.baseline)
+
+            if failed or latency > self.tolerance * state.baseline:
+                if now - state.last_decrease >= latency:
+                    state.limit = max(self.min_limit, state.limit * self.backoff)
+                    state.last_decrease = now
+            elif in_use * 2 >= state.limit:
+                state.limit = min(self.max_limit, state.limit + 1 / state.limit)
+            self._cond.notify_all()
+
+    def limit(self, endpoint: str) -> int:
+        with self._cond:
+            return int(self._state(endpoint).limit)
+
+    def in_flight(self, endpoint: str) -> int:
+        with self._cond:
+            return self._state(endpoint).in_flight
+
+    def limits(self) -> Dict[str, int]:
+        with self._cond:
+            return {endpoint: int(s.limit) for endpoint, s in self._limits.items()}
+
+    def collect(self, registry: MetricsRegistry):
+        """Sets the limiter's gauges, see MetricsRegistry.add_collector."""
+        with self._cond:
+            for endpoint, state in self._limits.items():
+                labels = {**self.labels, "endpoint": endpoint}
+                registry.set("taas_concurrency_limit", int(state.limit), **labels)
+                registry.set("taas_in_flight", state.in_flight, **labels)
+                registry.set("taas_error_rate", state.error_rate, **labels)
+                if state.baseline is not None:
+                    registry.set(
+                        "taas_baseline_latency_seconds", state.baseline, **labels
+                    )
+
+    def remove_gauges(self, registry: MetricsRegistry):
+        """Removes the gauges collect() set, e.g. once the client is closed."""
+        with self._cond:
+            endpoints = list(self._limits)
+        for endpoint in endpoints:
+            for name in GAUGES:
+                registry.remove(name, **self.labels, endpoint=endpoint)
+
+    def _state(self, endpoint: str) -> _EndpointLimit:
+        state = self._limits.get(endpoint)
+        if state is None:
+            state = self._limits[endpoint] = _EndpointLimit(self.initial_limit)
+        return state
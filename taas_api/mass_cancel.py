@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Union
+import logging
+import threading
+
+from taas_api import data
+from taas_api.deadline import Deadline
+from taas_api.enums import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CANCEL_WORKERS = 32
+DEFAULT_CANCEL_ATTEMPTS = 3
+
+
+@dataclass
+class CancelAllResult:
+    canceled_orders: List[str] = field(default_factory=list)
+    canceled_multi_orders: List[str] = field(default_factory=list)
+    # order id -> error message of its last attempt
+    failures: Dict[str, str] = field(default_factory=dict)
+    submitted: int = 0
+
+    @property
+    def done(self) -> int:
+        return (
+            len(self.canceled_orders)
+            + len(self.canceled_multi_orders)
+            + len(self.failures)
+        )
+
+
+def cancel_all(
+    client,
+    statuses: Sequence[str] = (OrderStatus.ACTIVE.value,),
+    account_names: Optional[List[str]] = None,
+    pairs: Optional[Sequence[str]] = None,
+    max_workers: int = DEFAULT_CANCEL_WORKERS,
+    progress: Optional[Callable[[CancelAllResult], None]] = None,
+    deadline: Union[Deadline, float, None] = None,
+    max_attempts: int = DEFAULT_CANCEL_ATTEMPTS,
+) -> CancelAllResult:
+    """Cancels every order matching the filters.
+
+    Matching IDs are handed to a pool of cancel workers as soon as their page
+    arrives, so cancels overlap with pagination and with each other. Every
+    cancel shrinks the filtered set and shifts later orders onto pages that
+    were already read, so the scan is repeated, once the cancels of the
+    previous pass have landed, until a pass finds no order it has not seen.
+    A cancel that raises or is answered with an HTTP error is recorded in
+    `failures` and, if the order still matches, tried again by the next
+    pass, up to `max_attempts` times.
+
+    Child orders of a multi order are canceled through their parent, once.
+    With `pairs`, a child on one of the pairs cancels the whole multi order,
+    including its legs on other pairs. `progress` is called from the worker
+    threads after every cancel.
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
+
+    deadline = Deadline.coerce(deadline)
+    pairs = set(pairs) if pairs else None
+    request = data.GetOrderRequest(
+        statuses=",".join(statuses) if statuses else None,
+        account_names=account_names,
+    )
+
+    result = CancelAllResult()
+    lock = threading.Lock()
+    seen = set()
+    attempts: Dict[str, int] = {}
+
+    def cancel(order_id: str, multi: bool):
+        error = None
+        try:
+            send = client.cancel_multi_order if multi else client.cancel_order
+            status, response = send(order_id, deadline=deadline, return_status=True)
+            if status >= 400:
+                error = f"HTTP {status}: {response}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is not None:
+            logger.warning(f"failed to cancel order {order_id}: {error}")
+        with lock:
+            if error is not None:
+                result.failures[order_id] = error
+                # Seen again by the next pass if the order is still live.
+                if attempts[order_id] < max_attempts:
+                    seen.discard(order_id)
+            else:
+                result.failures.pop(order_id, None)
+                if multi:
+                    result.canceled_multi_orders.append(order_id)
+                else:
+                    result.canceled_orders.append(order_id)
+
+        if progress is not None:
+            progress(result)
+
+    # Leaving the executor waits for every submitted cancel, even when
+    # pagination fails part way through.
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="taas-cancel"
+    ) as executor:
+        while True:
+            pending = []
+            for order in client.iter_all_orders(request, deadline=deadline):
+                if pairs is not None and order.get("pair") not in pairs:
+                    continue
+
+                parent = order.get("parent_order")
+                order_id, multi = (parent, True) if parent else (order["id"], False)
+                with lock:
+                    if order_id in seen:
+                        continue
+                    seen.add(order_id)
+                    attempts[order_id] = attempts.get(order_id, 0) + 1
+                    if attempts[order_id] == 1:
+                        result.submitted += 1
+                pending.append(executor.submit(cancel, order_id, multi))
+
+            if not pending:
+                break
+            # The next pass must page a set no cancel is changing anymore.
+            wait(pending)
+
+    return result
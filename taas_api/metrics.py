@@ -0,0 +1,80 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Counters and gauges keyed by name and labels.
+
+    Values that are cheaper to read than to keep up to date, such as the
+    current concurrency limits, come from collectors, which are called on
+    every snapshot() and set their gauges then. render() formats a snapshot
+    in the Prometheus text format, e.g. for a scrape handler.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._values.setdefault(name, {})[key] = float(value)
+
+    def remove(self, name: str, **labels):
+        with self._lock:
+            series = self._values.get(name)
+            if series is not None:
+                series.pop(_labels(labels), None)
+                if not series:
+                    del self._values[name]
+
+    def get(self, name: str, **labels) -> Optional[float]:
+        """The current value, without running the collectors."""
+        with self._lock:
+            return self._values.get(name, {}).get(_labels(labels))
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def snapshot(self) -> Dict[str, Dict[Labels, float]]:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector(self)
+
+        with self._lock:
+            return {name: dict(series) for name, series in self._values.items()}
+
+    def render(self) -> str:
+        lines = []
+        for name, series in sorted(self.snapshot().items()):
+            for labels, value in sorted(series.items()):
+                if labels:
+                    label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                    lines.append(f"{name}{{{label_text}}} {value:g}")
+                else:
+                    lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
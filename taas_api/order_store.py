@@ -0,0 +1,263 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+import threading
+
+from taas_api import data
+from taas_api.deadline import Deadline
+from taas_api.enums import OrderStatus
+from taas_api.timestamps import format_timestamp, parse_timestamp
+
+# Statuses an order can still leave, i.e. the ones that need refreshing.
+OPEN_STATUSES = (
+    OrderStatus.SCHEDULED.value,
+    OrderStatus.ACTIVE.value,
+    OrderStatus.FINISHER.value,
+    OrderStatus.PAUSED.value,
+)
+FINAL_STATUSES = tuple(
+    status.value for status in OrderStatus if status.value not in OPEN_STATUSES
+)
+
+INDEXED_FIELDS = ("status", "account_name", "pair", "custom_order_id")
+
+
+class OrderStore:
+    """Local copy of the orders visible to a client, indexed for lookups.
+
+    backfill() loads history once, then sync() pulls only orders created after
+    the newest one seen (with a small overlap for clock skew) and refreshes the
+    orders that are still open. Queries never touch the network.
+
+    Orders that left the open statuses since the last sync are looked up one
+    by one when there are at most `max_lookups` of them. More are paged in
+    from the final statuses, created since the oldest of them, for no more
+    pages than there are such orders; any still missing are looked up.
+    """
+
+    def __init__(
+        self,
+        client,
+        account_names: Optional[List[str]] = None,
+        page_size: int = 100,
+        overlap: timedelta = timedelta(seconds=5),
+        max_lookups: int = 5,
+    ):
+        self.client = client
+        self.account_names = account_names
+        self.page_size = page_size
+        self.overlap = overlap
+        self.max_lookups = max_lookups
+
+        self._orders: Dict[str, dict] = {}
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id: str):
+        return order_id in self._orders
+
+    def ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._orders)
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Creation time of the newest order seen, where sync() resumes."""
+        watermark = self._watermark
+        return format_timestamp(watermark) if watermark else None
+
+    def resume(self, watermark: str):
+        """Makes sync() resume from `watermark`, e.g. one taken over from
+        another process, unless a newer order was already seen."""
+        watermark = parse_timestamp(watermark)
+        with self._lock:
+            if self._watermark is None or watermark > self._watermark:
+                self._watermark = watermark
+
+    def backfill(self, after: Optional[str] = None, deadline=None) -> int:
+        """Loads every order created after `after` (or all of them)."""
+        return self._load(after, deadline=Deadline.coerce(deadline))
+
+    def sync(self, refresh_open: bool = True, deadline=None) -> int:
+        """Pulls new orders since the last sync and, optionally, the current
+        state of orders still open locally. Returns the number of upserts."""
+        deadline = Deadline.coerce(deadline)
+        with self._lock:
+            watermark = self._watermark
+
+        after = format_timestamp(watermark - self.overlap) if watermark else None
+        count = self._load(after, deadline=deadline)
+
+        if refresh_open:
+            count += self._refresh_open(deadline)
+        return count
+
+    def upsert(self, order: dict):
+        """Adds or replaces an order, e.g. from a place_order or get_order
+        response, keeping every index in step."""
+        order_id = order["id"]
+        with self._lock:
+            previous = self._orders.get(order_id)
+            if previous is not None:
+                self._unindex(order_id, previous)
+
+            self._orders[order_id] = order
+            self._index(order_id, order)
+
+            created_at = order.get("created_at")
+            if created_at:
+                created_at = parse_timestamp(created_at)
+                if self._watermark is None or created_at > self._watermark:
+                    self._watermark = created_at
+
+    def get(self, order_id: str) -> Optional[dict]:
+        return self._orders.get(order_id)
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        account_name: Optional[str] = None,
+        pair: Optional[str] = None,
+        custom_order_id: Optional[str] = None,
+    ) -> List[dict]:
+        filters = {
+            "status": status,
+            "account_name": account_name,
+            "pair": pair,
+            "custom_order_id": custom_order_id,
+        }
+        with self._lock:
+            matches = [
+                self._indexes[field].get(value, set())
+                for field, value in filters.items()
+                if value is not None
+            ]
+            if not matches:
+                return list(self._orders.values())
+
+            # Walk the smallest index and probe the others, so the cost is
+            # bounded by the narrowest filter rather than the store size.
+            matches.sort(key=len)
+            smallest, others = matches[0], matches[1:]
+            return [
+                self._orders[order_id]
+                for order_id in smallest
+                if all(order_id in other for other in others)
+            ]
+
+    def _load(self, after: Optional[str], deadline: Optional[Deadline]) -> int:
+        request = data.GetOrderRequest(
+            account_names=self.account_names,
+            after=after,
+            page_size=self.page_size,
+        )
+        return self._upsert_all(self.client.iter_all_orders(request, deadline=deadline))
+
+    def _refresh_open(self, deadline: Optional[Deadline]) -> int:
+        with self._lock:
+            open_orders = {
+                order_id
+                for status in OPEN_STATUSES
+                for order_id in self._indexes["status"].get(status, ())
+            }
+            if not open_orders:
+                return 0
+            created = [
+                parse_timestamp(self._orders[order_id]["created_at"])
+                for order_id in open_orders
+                if self._orders[order_id].get("created_at")
+            ]
+            oldest = min(created) if created else None
+
+        after = format_timestamp(oldest - self.overlap) if oldest else None
+        seen = set()
+        count = 0
+        for order in self._iter_statuses(OPEN_STATUSES, after, deadline):
+            self.upsert(order)
+            seen.add(order["id"])
+            count += 1
+
+        closed = open_orders - seen
+        if len(closed) > self.max_lookups:
+            count += self._page_closed(closed, deadline)
+
+        for order_id in closed:
+            summary = self.client.get_order_summary(order_id, deadline=deadline)
+            self.upsert({**self._orders[order_id], **summary, "id": order_id})
+            count += 1
+        return count
+
+    def _page_closed(self, closed: Set[str], deadline: Optional[Deadline]) -> int:
+        # Pages the final statuses for orders that left the open ones,
+        # removing those found from `closed`. Bounded by the oldest of them,
+        # not of the orders still open, so a long running order does not
+        # drag every sync back to its creation.
+        with self._lock:
+            created = [
+                parse_timestamp(self._orders[order_id]["created_at"])
+                for order_id in closed
+                if self._orders[order_id].get("created_at")
+            ]
+        if not created:
+            return 0
+
+        after = format_timestamp(min(created) - self.overlap)
+        # Never more pages than looking each order up would cost requests.
+        budget = len(closed) * self.page_size
+        count = 0
+        for scanned, order in enumerate(
+            self._iter_statuses(FINAL_STATUSES, after, deadline), 1
+        ):
+            if order["id"] in closed:
+                self.upsert(order)
+                closed.discard(order["id"])
+                count += 1
+            if not closed or scanned >= budget:
+                break
+        return count
+
+    def _iter_statuses(
+        self, statuses, after: Optional[str], deadline: Optional[Deadline]
+    ) -> Iterable[dict]:
+        request = data.GetOrderRequest(
+            statuses=",".join(statuses),
+            account_names=self.account_names,
+            after=after,
+            page_size=self.page_size,
+        )
+        return self.client.iter_all_orders(request, deadline=deadline)
+
+    def _upsert_all(self, orders: Iterable[dict]) -> int:
+        count = 0
+        for order in orders:
+            self.upsert(order)
+            count += 1
+        return count
+
+    def _index(self, order_id: str, order: dict):
+        for field, value in _index_values(order):
+            self._indexes[field].setdefault(value, set()).add(order_id)
+
+    def _unindex(self, order_id: str, order: dict):
+        for field, value in _index_values(order):
+            ids = self._indexes[field].get(value)
+            if ids is not None:
+                ids.discard(order_id)
+                if not ids:
+                    del self._indexes[field][value]
+
+
+def _index_values(order: dict):
+    if order.get("status"):
+        yield "status", order["status"]
+    for account_name in order.get("account_names") or ():
+        yield "account_name", account_name
+    if order.get("pair"):
+        yield "pair", order["pair"]
+    if order.get("custom_order_id"):
+        yield "custom_order_id", order["custom_order_id"]
@@ -0,0 +1,104 @@
+from dataclasses import MISSING, fields
+from typing import Dict, Optional, Tuple
+
+from taas_api.data import PLACE_ORDER_CHECKS, PlaceOrderRequest
+
+_FIELD_NAMES = frozenset(f.name for f in fields(PlaceOrderRequest))
+
+
+class TemplatedOrder(PlaceOrderRequest):
+    """A PlaceOrderRequest stamped out of an OrderTemplate.
+
+    The order starts as a shallow copy of the template's values and tracks
+    which fields were overridden since. Assigning a field overrides it on
+    this order alone. validate() re-runs only the checks that read an
+    overridden field and to_post_body() copies the template's serialized
+    body before applying the overrides, so both return what a plain
+    PlaceOrderRequest with the same fields would.
+    """
+
+    def __init__(self, template: "OrderTemplate", overrides: Dict[str, object]):
+        self.__dict__.update(template.values)
+        object.__setattr__(self, "_template", template)
+        object.__setattr__(self, "_overrides", {})
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, name, value):
+        if name not in _FIELD_NAMES:
+            raise AttributeError(f"unexpected field {name}")
+        self._overrides[name] = value
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return TemplatedOrder, (self._template, self._overrides)
+
+    def validate(self):
+        overridden = self._overrides.keys()
+        for (reads, check), error in zip(PLACE_ORDER_CHECKS, self._template.errors):
+            if not overridden.isdisjoint(reads):
+                error = check(self)
+            if error is not None:
+                return False, error
+
+        return True, None
+
+    def to_post_body(self):
+        body = dict(self._template.body)
+        for name, value in self._overrides.items():
+            if value is None:
+                body.pop(name, None)
+            else:
+                body[name] = value
+        return body
+
+
+class OrderTemplate:
+    """Shared fields of many PlaceOrderRequests, validated and serialized once.
+
+        template = OrderTemplate(accounts=["acc"], strategy="TWAP", duration=300)
+        for pair, qty in targets.items():
+            client.place_order(template.order(pair=pair, side="buy", base_asset_qty=qty))
+
+    Fields left out default as in PlaceOrderRequest. A template may leave
+    out required fields such as pair, order() then raises TypeError unless
+    they are given. Orders share the template's values, lists and dicts such
+    as accounts must not be mutated through an order.
+    """
+
+    def __init__(self, **values):
+        unknown = set(values) - set(_FIELD_NAMES)
+        if unknown:
+            raise TypeError(f"unexpected fields {sorted(unknown)}")
+
+        # Required fields missing here must be set by every order.
+        self.required = {
+            f.name
+            for f in fields(PlaceOrderRequest)
+            if f.default is MISSING and f.name not in values
+        }
+        defaults = {
+            f.name: None if f.default is MISSING else f.default
+            for f in fields(PlaceOrderRequest)
+        }
+        self.values = {**defaults, **values}
+        self.body = {k: v for k, v in self.values.items() if v is not None}
+
+        # The outcome of every check against the template's own values,
+        # checks that read a required field are re-run by every order.
+        shared = _Values(self.values)
+        self.errors: Tuple[Optional[str], ...] = tuple(
+            None if self.required.intersection(reads) else check(shared)
+            for reads, check in PLACE_ORDER_CHECKS
+        )
+
+    def order(self, **overrides) -> TemplatedOrder:
+        if self.required and not self.required <= overrides.keys():
+            missing = sorted(self.required - overrides.keys())
+            raise TypeError(f"missing required fields {missing}")
+        return TemplatedOrder(self, overrides)
+
+
+class _Values:
+    def __init__(self, values: Dict[str, object]):
+        self.__dict__.update(values)
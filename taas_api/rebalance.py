@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from taas_api import data
+from taas_api.analytics import BalanceFrame, _require_numpy, np
+
+QUANTITY = "quantity"
+WEIGHT = "weight"
+
+
+def _pair(symbol: str, quote: str) -> str:
+    # Derivatives are held under their pair, e.g. "ETH:PERP-USDT".
+    return symbol if "-" in symbol else f"{symbol}-{quote}"
+
+
+@dataclass
+class RebalancePlan:
+    account: str
+    # One entry per symbol considered, in the same order in every array.
+    symbols: List[str]
+    current: "np.ndarray"
+    target: "np.ndarray"
+    price: "np.ndarray"
+    # target - current, rounded towards zero to the lot size.
+    delta: "np.ndarray"
+    child_orders: List[data.ChildOrder] = field(default_factory=list)
+    # symbol -> why no order was emitted for a non-zero delta.
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+    def multi_orders(
+        self, duration: int, strategy: str, max_child_orders: int = 20, **kwargs
+    ) -> List[data.PlaceMultiOrderRequest]:
+        """Splits the child orders into validated multi orders of at most
+        `max_child_orders` each. Extra arguments, e.g. engine_passiveness, are
+        passed to every PlaceMultiOrderRequest."""
+        if max_child_orders < 1:
+            raise ValueError("max_child_orders must be a positive integer")
+
+        requests = []
+        for i in range(0, len(self.child_orders), max_child_orders):
+            request = data.PlaceMultiOrderRequest(
+                duration=duration,
+                strategy=strategy,
+                child_orders=self.child_orders[i : i + max_child_orders],
+                **kwargs,
+            )
+            validate_success, errors = request.validate()
+            if not validate_success:
+                raise ValueError(str(errors))
+            requests.append(request)
+        return requests
+
+
+def plan_rebalance(
+    balances: dict,
+    account: str,
+    targets: Dict[str, float],
+    mode: str = QUANTITY,
+    prices: Optional[Dict[str, float]] = None,
+    capital: Optional[float] = None,
+    min_notional: float = 10.0,
+    lot_sizes: Optional[Dict[str, float]] = None,
+    quote: str = "USDT",
+    close_unlisted: bool = False,
+) -> RebalancePlan:
+    """Diffs an account of a get_balances response against targets per
+    symbol and returns the child orders that close the gap.
+
+    Targets are base quantities, or with mode="weight" fractions of
+    `capital`, which defaults to the account's net notional. Prices default
+    to notional / size of the holdings and must be given for symbols not
+    held. Deltas are rounded towards zero to `lot_sizes` and dropped below
+    `min_notional`. Symbols held but not targeted are left alone unless
+    `close_unlisted` is set. Spot symbols trade against `quote`.
+
+    Child orders alternate between buys and sells, largest first, so every
+    multi order cut from them stays roughly balanced.
+    """
+    _require_numpy()
+    if mode not in (QUANTITY, WEIGHT):
+        raise ValueError(f"unexpected mode {mode}, expecting 'quantity' or 'weight'")
+    if account not in balances:
+        raise ValueError(f"account {account} not found in balances")
+
+    frame = BalanceFrame.from_response({account: balances[account]})
+    held = frame.totals("symbol", "size")
+    held_notional = frame.totals("symbol", "notional")
+    held.pop(quote, None)
+
+    symbols = list(targets)
+    if close_unlisted:
+        symbols += sorted(set(held) - set(targets))
+
+    current = np.array([held.get(s, 0.0) for s in symbols], dtype=np.float64)
+    notional = np.array([held_notional.get(s, 0.0) for s in symbols], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price = np.where(current != 0, notional / current, np.nan)
+    if prices:
+        given = np.array([prices.get(s, np.nan) for s in symbols], dtype=np.float64)
+        price = np.where(np.isnan(given), price, given)
+
+    target = np.array([targets.get(s, 0.0) for s in symbols], dtype=np.float64)
+    if mode == WEIGHT:
+        if capital is None:
+            capital = float(np.nansum(frame.columns["notional"]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            target = target * capital / price
+
+    lot = np.array([(lot_sizes or {}).get(s, 0.0) for s in symbols], dtype=np.float64)
+    delta = target - current
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Rounded first so that e.g. 0.3 / 0.1 counts as 3 lots, not 2.
+        delta = np.where(
+            lot > 0, np.round(np.trunc(np.round(delta / lot, 9)) * lot, 12), delta
+        )
+    delta_notional = np.abs(delta) * price
+
+    priced = np.isfinite(delta) & np.isfinite(price)
+    moved = priced & (delta != 0)
+    keep = moved & (delta_notional >= min_notional)
+
+    skipped = {}
+    for reason, mask in (
+        ("no price", ~priced),
+        ("below lot size", priced & (delta == 0) & (target != current)),
+        ("below min notional", moved & ~keep),
+    ):
+        for i in np.flatnonzero(mask):
+            skipped[symbols[i]] = reason
+
+    # Largest first, alternating sides.
+    by_size = np.argsort(-np.where(keep, delta_notional, 0), kind="stable")
+    buys = [i for i in by_size if keep[i] and delta[i] > 0]
+    sells = [i for i in by_size if keep[i] and delta[i] < 0]
+    interleaved = [i for both in zip(buys, sells) for i in both]
+    interleaved += buys[len(sells) :] + sells[len(buys) :]
+
+    child_orders = []
+    for i in interleaved:
+        child = data.ChildOrder(
+            pair=_pair(symbols[i], quote),
+            side="buy" if delta[i] > 0 else "sell",
+            base_asset_qty=float(abs(delta[i])),
+            account=account,
+        )
+        validate_success, error = child.validate()
+        if not validate_success:
+            raise ValueError(f"{symbols[i]}: {error}")
+        child_orders.append(child)
+
+    return RebalancePlan(
+        account=account,
+        symbols=symbols,
+        current=current,
+        target=target,
+        price=price,
+        delta=delta,
+        child_orders=child_orders,
+        skipped=skipped,
+    )
@@ -0,0 +1,129 @@
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Sequence, Tuple, Union
+import logging
+import queue
+import random
+import threading
+
+# Attributes BaseClient sets on its per-request log records.
+ENDPOINT_ATTR = "taas_endpoint"
+STATUS_ATTR = "taas_status"
+
+RateKey = Union[str, int, Tuple[str, int]]
+
+
+class RequestSampler(logging.Filter):
+    """Lets through a fraction of the per-request log records.
+
+    `rates` maps an (endpoint, status) pair, an endpoint name or a status code
+    to the fraction of those records to keep, looked up in that order.
+    Records without a status, calls that raised, are keyed by status None.
+    Other records, e.g. warnings, always pass.
+
+        # Every error, 1% of successful get_order calls, 10% of other 200s.
+        RequestSampler({("get_order", 200): 0.01, 200: 0.1})
+    """
+
+    def __init__(self, rates: Optional[Dict[RateKey, float]] = None, default_rate=1.0):
+        super().__init__()
+        self.rates = dict(rates) if rates else {}
+        self.default_rate = default_rate
+
+    def rate(self, endpoint: str, status: Optional[int]) -> float:
+        rates = self.rates
+        for key in ((endpoint, status), endpoint, status):
+            if key in rates:
+                return rates[key]
+        return self.default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, ENDPOINT_ATTR):
+            return True
+        rate = self.rate(getattr(record, ENDPOINT_ATTR), getattr(record, STATUS_ATTR))
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to a bounded queue without formatting them and drops
+    them when the queue is full, so logging never blocks the caller.
+
+    The message is formatted by the listener thread. Records must therefore
+    only carry arguments that are not modified after the call, which holds
+    for the client's own records.
+    """
+
+    def __init__(self, queue_: queue.Queue):
+        super().__init__(queue_)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Waits for room rather than failing when the queue is full at stop().
+        self.queue.put(self._sentinel)
+
+
+class RequestLogPipeline:
+    """Moves the client's logging onto a background thread.
+
+    Records of the `taas_api.client` logger, sampled by `sampler`, go through
+    a queue of `queue_size` records to `handlers`, which run on a listener
+    thread. Records are no longer propagated to parent loggers while the
+    pipeline runs, since their handlers would run on the calling thread.
+
+        pipeline = RequestLogPipeline(
+            [logging.FileHandler("taas.log")], RequestSampler({200: 0.01})
+        )
+        pipeline.start()
+    """
+
+    def __init__(
+        self,
+        handlers: Sequence[logging.Handler],
+        sampler: Optional[RequestSampler] = None,
+        queue_size: int = 10000,
+        logger_name: str = "taas_api.client",
+    ):
+        self.logger = logging.getLogger(logger_name)
+        self.handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+        if sampler is not None:
+            self.handler.addFilter(sampler)
+        self.listener = _Listener(
+            self.handler.queue, *handlers, respect_handler_level=True
+        )
+        self._propagate = None
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full."""
+        return self.handler.dropped
+
+    def start(self):
+        self._propagate = self.logger.propagate
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.listener.start()
+
+    def stop(self):
+        """Detaches from the logger and writes out the records still queued."""
+        self.logger.removeHandler(self.handler)
+        self.logger.propagate = self._propagate
+        self.listener.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,146 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+import threading
+import time
+
+CANCEL = "cancel"
+AMEND = "amend"
+PLACE = "place"
+READ = "read"
+
+# Highest priority first.
+PRIORITIES = (CANCEL, AMEND, PLACE, READ)
+
+# Classes that may not take the slots reserved for cancels and amends.
+UNRESERVED = (PLACE, READ)
+
+ENDPOINT_CLASSES = {
+    "cancel_order": CANCEL,
+    "cancel_multi_order": CANCEL,
+    "close_balances": CANCEL,
+    "amend_order": AMEND,
+    "place_order": PLACE,
+    "place_multi_order": PLACE,
+    "place_chained_order": PLACE,
+    "set_leverage": PLACE,
+}
+
+
+class RequestScheduler:
+    """Hands out `max_concurrency` request slots by priority class.
+
+    A freed slot goes to the oldest waiter of the highest priority class,
+    cancel > amend > place > read, so risk-reducing calls never queue behind
+    a placement batch. `shares` caps the fraction of the slots each class may
+    hold at once. On top of that, placements and reads together never hold
+    more than `max_concurrency - reserve` slots, so `reserve` slots, a
+    quarter by default, are always left for cancels and amends even while a
+    large batch keeps the rest busy.
+
+    Endpoints map to classes through ENDPOINT_CLASSES, other GETs are reads
+    and other calls placements.
+    """
+
+    DEFAULT_SHARES = {CANCEL: 1.0, AMEND: 1.0, PLACE: 0.75, READ: 0.5}
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        shares: Optional[Dict[str, float]] = None,
+        reserve: Optional[int] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+        if reserve is None:
+            reserve = max_concurrency // 4 if max_concurrency > 1 else 0
+        if not (0 <= reserve < max_concurrency):
+            raise ValueError("reserve must be in [0, max_concurrency)")
+        shares = {**self.DEFAULT_SHARES, **(shares or {})}
+        unknown = set(shares) - set(PRIORITIES)
+        if unknown:
+            raise ValueError(f"unexpected classes {sorted(unknown)}")
+        if any(not (0 < share <= 1) for share in shares.values()):
+            raise ValueError("shares must be in (0, 1]")
+
+        self.max_concurrency = max_concurrency
+        self.reserve = reserve
+        # Every class may hold at least one slot.
+        self.limits = {
+            cls: max(1, int(share * max_concurrency)) for cls, share in shares.items()
+        }
+
+        self._cond = threading.Condition()
+        self._waiting = {cls: deque() for cls in PRIORITIES}
+        self._in_flight = {cls: 0 for cls in PRIORITIES}
+        self._total = 0
+
+    @staticmethod
+    def classify(endpoint: str, method: str = "GET") -> str:
+        cls = ENDPOINT_CLASSES.get(endpoint)
+        if cls is None:
+            cls = READ if method == "GET" else PLACE
+        return cls
+
+    def acquire(self, cls: str, timeout: Optional[float] = None) -> bool:
+        """Waits for a slot for the class. Returns False on timeout."""
+        ticket = object()
+        end_time = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            queue = self._waiting[cls]
+            queue.append(ticket)
+            try:
+                while not (queue[0] is ticket and self._next_class() == cls):
+                    remaining = None
+                    if end_time is not None:
+                        remaining = end_time - time.monotonic()
+                        if remaining <= 0:
+                            queue.remove(ticket)
+                            self._cond.notify_all()
+                            return False
+                    self._cond.wait(remaining)
+            except BaseException:
+                queue.remove(ticket)
+                self._cond.notify_all()
+                raise
+
+            queue.popleft()
+            self._in_flight[cls] += 1
+            self._total += 1
+            # The next waiter may be granted a slot too.
+            self._cond.notify_all()
+            return True
+
+    def release(self, cls: str):
+        with self._cond:
+            self._in_flight[cls] -= 1
+            self._total -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, cls: str):
+        self.acquire(cls)
+        try:
+            yield
+        finally:
+            self.release(cls)
+
+    def in_flight(self, cls: str) -> int:
+        return self._in_flight[cls]
+
+    def waiting(self, cls: str) -> int:
+        return len(self._waiting[cls])
+
+    def _next_class(self) -> Optional[str]:
+        # The class the next free slot goes to, None if no slot is free.
+        if self._total >= self.max_concurrency:
+            return None
+
+        unreserved = sum(self._in_flight[cls] for cls in UNRESERVED)
+        for cls in PRIORITIES:
+            if not self._waiting[cls] or self._in_flight[cls] >= self.limits[cls]:
+                continue
+            if cls in UNRESERVED and unreserved >= self.max_concurrency - self.reserve:
+                continue
+            return cls
+        return None
@@ -0,0 +1,323 @@
+from typing import Dict, List, Optional, Set
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from taas_api.order_store import (
+    OPEN_STATUSES,
+    INDEXED_FIELDS,
+    OrderStore,
+    _index_values,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TAASOC02"
+DEFAULT_CAPACITY = 64 * 1024 * 1024
+DEFAULT_CLOSED_TTL = 300.0
+
+# magic, sequence, payload length, published at (unix time), then the payload,
+# {"watermark": ..., "orders": [...]} as JSON.
+_HEADER = struct.Struct("<8sQQd")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+
+
+def _require_fcntl():
+    if fcntl is None:
+        raise ImportError(
+            "fcntl is required for taas_api.shared_cache, it is only available "
+            "on POSIX systems"
+        )
+
+
+class SharedOrderCache:
+    """Order states shared by the processes on a host through an mmap'd file.
+
+    Every process opens the same `path`, ideally on a tmpfs such as
+    /dev/shm. The processes given a client compete for an exclusive flock on
+    the file; the one holding it is the poller and keeps the orders in step
+    with an OrderStore, publishing them after every refresh. The lock is
+    released when the poller stops or dies, and another process takes over
+    at its next election attempt, so the API sees one poller however many
+    workers run.
+
+    Only open orders are published, and orders that closed within the last
+    `closed_ttl` seconds, so the snapshot stays the size of the working set
+    rather than of the order history. The poller's store keeps the rest.
+
+    Publishing is guarded by a seqlock: the sequence number is odd while the
+    poller writes, and readers retry until they copy a snapshot with the
+    same even number before and after. Readers never take a lock and only
+    decode the snapshot, and index it for query(), when the sequence number
+    moved.
+
+    The first process to create the file decides its capacity, publishing
+    more orders than fit raises ValueError.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client=None,
+        account_names: Optional[List[str]] = None,
+        after: Optional[str] = None,
+        refresh_interval: float = 1.0,
+        capacity: int = DEFAULT_CAPACITY,
+        read_timeout: float = 1.0,
+        closed_ttl: float = DEFAULT_CLOSED_TTL,
+    ):
+        _require_fcntl()
+        if capacity <= _HEADER.size:
+            raise ValueError(f"capacity must be larger than {_HEADER.size} bytes")
+
+        self.path = path
+        self.client = client
+        self.account_names = account_names
+        self.after = after
+        self.refresh_interval = refresh_interval
+        self.read_timeout = read_timeout
+        self.closed_ttl = closed_ttl
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < _HEADER.size:
+            os.ftruncate(self._fd, capacity)
+        self._mm = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+
+        self._leader = False
+        self._store: Optional[OrderStore] = None
+        # Poller only: ids of the orders accounted for, the open ones at the
+        # last publish, and when each recently closed order was seen closing.
+        self._known = set()
+        self._open = set()
+        self._closed_at: Dict[str, float] = {}
+        # The last snapshot read, see _read.
+        self._snapshot = _Snapshot(0, {}, None, None)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader
+
+    def start(self):
+        """Refreshes in the background, every `refresh_interval` seconds,
+        whenever this process wins the election."""
+        if self.client is None:
+            raise ValueError("a client is required to poll for the cache")
+        self._thread = threading.Thread(
+            target=self._run, name="taas-order-cache", daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._leader:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._leader = False
+        self._mm.close()
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def elect(self) -> bool:
+        """Becomes the poller unless another process already is."""
+        if self._leader or self.client is None:
+            return self._leader
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        # Pick up where the previous poller left off.
+        self._store = OrderStore(self.client, account_names=self.account_names)
+        snapshot = self._read()
+        for order in snapshot.orders.values():
+            self._store.upsert(order)
+        if snapshot.watermark:
+            self._store.resume(snapshot.watermark)
+        self._known = self._store.ids()
+        self._open = set()
+        # Closed orders in the snapshot closed recently, keep them published.
+        now = time.monotonic()
+        self._closed_at = {
+            order_id: now
+            for order_id, order in snapshot.orders.items()
+            if order.get("status") not in OPEN_STATUSES
+        }
+        self._leader = True
+        logger.info(f"pid {os.getpid()} is polling orders for {self.path}")
+        return True
+
+    def refresh(self, deadline=None) -> int:
+        """Syncs and publishes the orders if this process is the poller.
+        Returns the number of upserts."""
+        if not self.elect():
+            return 0
+
+        if self._store.watermark is None:
+            count = self._store.backfill(self.after, deadline=deadline)
+            # History loaded up front is not news, only what changes later.
+            self._known = self._store.ids()
+        else:
+            count = self._store.sync(deadline=deadline)
+        self._publish(self._store.watermark, self._working_set())
+        return count
+
+    def get(self, order_id: str) -> Optional[dict]:
+        return self._read().orders.get(order_id)
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        account_name: Optional[str] = None,
+        pair: Optional[str] = None,
+        custom_order_id: Optional[str] = None,
+    ) -> List[dict]:
+        filters = {
+            "status": status,
+            "account_name": account_name,
+            "pair": pair,
+            "custom_order_id": custom_order_id,
+        }
+        snapshot = self._read()
+        matches = [
+            snapshot.indexes[field].get(value, set())
+            for field, value in filters.items()
+            if value is not None
+        ]
+        if not matches:
+            return list(snapshot.orders.values())
+
+        matches.sort(key=len)
+        smallest, others = matches[0], matches[1:]
+        return [
+            snapshot.orders[order_id]
+            for order_id in smallest
+            if all(order_id in other for other in others)
+        ]
+
+    def __len__(self):
+        return len(self._read().orders)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last publish, None if nothing was published."""
+        published_at = self._read().published_at
+        return None if published_at is None else time.time() - published_at
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"refreshing the order cache failed: {e}")
+            if self._stop.wait(self.refresh_interval):
+                break
+
+    def _working_set(self) -> List[dict]:
+        # Open orders, and closed ones for closed_ttl after the poller saw
+        # them close or first saw them already closed.
+        now = time.monotonic()
+        store = self._store
+        orders = [order for status in OPEN_STATUSES for order in store.query(status)]
+        open_ids = {order["id"] for order in orders}
+
+        ids = store.ids()
+        for order_id in (self._open | (ids - self._known)) - open_ids:
+            self._closed_at[order_id] = now
+        self._known = ids
+        self._open = open_ids
+
+        for order_id, closed_at in list(self._closed_at.items()):
+            if order_id in open_ids or now - closed_at > self.closed_ttl:
+                del self._closed_at[order_id]
+            else:
+                orders.append(store.get(order_id))
+        return orders
+
+    def _publish(self, watermark: Optional[str], orders: List[dict]):
+        payload = json.dumps(
+            {"watermark": watermark, "orders": orders}, separators=(",", ":")
+        ).encode()
+        end = _HEADER.size + len(payload)
+        if end > len(self._mm):
+            raise ValueError(
+                f"{len(orders)} orders take {end} bytes, more than the cache "
+                f"capacity of {len(self._mm)}"
+            )
+
+        seq = _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0]
+        # Odd while writing, a previous poller may have died mid-write.
+        seq += 1 - seq % 2
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, seq)
+        self._mm[_HEADER.size : end] = payload
+        _HEADER.pack_into(self._mm, 0, MAGIC, seq, len(payload), time.time())
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, seq + 1)
+
+    def _read(self):
+        end_time = None
+        while True:
+            snapshot = self._snapshot
+            seq = _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0]
+            if seq == snapshot.seq:
+                return snapshot
+
+            if seq % 2 == 0:
+                magic, _, length, published_at = _HEADER.unpack_from(self._mm, 0)
+                payload = self._mm[_HEADER.size : _HEADER.size + length]
+                if _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0] == seq:
+                    if magic == MAGIC:
+                        published = json.loads(payload)
+                        orders = {order["id"]: order for order in published["orders"]}
+                        watermark = published["watermark"]
+                    else:
+                        orders, watermark, published_at = {}, None, None
+                    self._snapshot = _Snapshot(seq, orders, published_at, watermark)
+                    return self._snapshot
+
+            # A write is in progress or landed while copying. Fall back to
+            # the last snapshot if the poller died mid-write.
+            if end_time is None:
+                end_time = time.monotonic() + self.read_timeout
+            elif time.monotonic() > end_time:
+                return snapshot
+            time.sleep(0)
+
+
+class _Snapshot:
+    # One decoded generation of the published orders, indexed once for every
+    # query() until the sequence number moves.
+    def __init__(
+        self,
+        seq: int,
+        orders: Dict[str, dict],
+        published_at: Optional[float],
+        watermark: Optional[str],
+    ):
+        self.seq = seq
+        self.orders = orders
+        self.published_at = published_at
+        self.watermark = watermark
+        self.indexes: Dict[str, Dict[str, Set[str]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+        for order_id, order in orders.items():
+            for field, value in _index_values(order):
+                self.indexes[field].setdefault(value, set()).add(order_id)
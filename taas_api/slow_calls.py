@@ -0,0 +1,96 @@
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Phases of a call, in order, as reported in SlowCall.phases_ms:
+# prepare - deadline check and journal write before sending
+# send - transport round trip, including any hedged attempt
+# decode - status check and JSON decoding of the response
+# journal - journal write of the response
+PHASES = ("prepare", "send", "decode", "journal")
+
+
+@dataclass
+class SlowCall:
+    timestamp: float
+    endpoint: str
+    method: str
+    path: str
+    latency_ms: float
+    phases_ms: Dict[str, float] = field(default_factory=dict)
+    status: Optional[int] = None
+    # Query params of a GET, JSON body otherwise.
+    request: Optional[dict] = None
+    response_headers: Dict[str, str] = field(default_factory=dict)
+    response_size: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SlowCallLog:
+    """Keeps the last `capacity` calls that took at least their endpoint's
+    threshold, in seconds, with their request and what came back.
+
+    Thresholds are looked up by endpoint name, e.g. "place_multi_order",
+    falling back to `default_threshold`. With `dump_dir` set every slow
+    call is also written there as a JSON file.
+    """
+
+    def __init__(
+        self,
+        thresholds: Optional[Dict[str, float]] = None,
+        default_threshold: float = 1.0,
+        capacity: int = 256,
+        dump_dir: Optional[str] = None,
+    ):
+        self.thresholds = dict(thresholds) if thresholds else {}
+        self.default_threshold = default_threshold
+        self.dump_dir = dump_dir
+        self._calls = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+        if dump_dir is not None:
+            os.makedirs(dump_dir, exist_ok=True)
+
+    def threshold(self, endpoint: str) -> float:
+        return self.thresholds.get(endpoint, self.default_threshold)
+
+    def capture(self, call: SlowCall):
+        with self._lock:
+            self._calls.append(call)
+            seq = next(self._seq)
+
+        if self.dump_dir is not None:
+            # Endpoints default to the path when a call does not name one.
+            name = re.sub(r"[^\w.-]", "_", call.endpoint)
+            path = os.path.join(
+                self.dump_dir, f"{int(call.timestamp * 1000)}-{seq}-{name}.json"
+            )
+            try:
+                with open(path, "w") as f:
+                    json.dump(asdict(call), f, default=str)
+            except OSError as e:
+                logger.warning(f"failed to dump slow call to {path}: {e}")
+
+    def calls(self, endpoint: Optional[str] = None) -> List[SlowCall]:
+        """Captured calls, oldest first."""
+        with self._lock:
+            calls = list(self._calls)
+        if endpoint is not None:
+            calls = [call for call in calls if call.endpoint == endpoint]
+        return calls
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+
+    def __len__(self):
+        return len(self._calls)
@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parses the ISO 8601 timestamps used by TaaS, e.g. 2023-08-08T23:54:07Z."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def format_timestamp(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
@@ -0,0 +1,327 @@
+"""Records the calls a client makes and replays them with the same timing.
+
+A trace is a gzipped JSON lines file with one record per call: when it
+started relative to the first call, the endpoint, method, path, query params
+or body, and how long it took and with what status. The endpoint names the
+path template, e.g. "get_order" for /api/order/<id>.
+"""
+
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+import gzip
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Queued by close() to stop the writer thread.
+_STOP = object()
+
+
+@dataclass
+class TraceEntry:
+    # Seconds since the first recorded call.
+    start: float
+    endpoint: str
+    method: str
+    path: str
+    params: Optional[dict] = None
+    body: Optional[dict] = None
+    status: Optional[int] = None
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def end(self) -> float:
+        return self.start + self.latency_ms / 1000.0
+
+
+class TrafficRecorder:
+    """Appends every call of the clients using it to a trace file.
+
+    Pass it as `Client(..., recorder=TrafficRecorder("trace.jsonl.gz"))`.
+    Set `record_bodies=False` to leave out params and bodies, e.g. when they
+    hold data that should not be written to disk.
+
+    Calls only serialize their record and queue it, a writer thread
+    compresses and writes them. When `queue_size` records are waiting, new
+    ones are dropped and counted in `dropped` rather than blocking the call.
+    close() writes out the records still queued.
+    """
+
+    def __init__(self, path: str, record_bodies: bool = True, queue_size: int = 10000):
+        self.path = path
+        self.record_bodies = record_bodies
+        self.dropped = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._queue = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._origin = None
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write_queued, name="taas-traffic-recorder", daemon=True
+        )
+        self._writer.start()
+
+    def record(
+        self,
+        endpoint: str,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        body: Optional[dict],
+        start_time: float,
+        latency: float,
+        status: Optional[int],
+        error: Optional[BaseException] = None,
+    ):
+        """`start_time` is a time.perf_counter() reading, `latency` seconds."""
+        record = {
+            "endpoint": endpoint,
+            "method": method,
+            "path": path,
+            "latency_ms": round(latency * 1000.0, 3),
+        }
+        if self.record_bodies and params:
+            record["params"] = params
+        if self.record_bodies and body is not None:
+            record["body"] = body
+        if status is not None:
+            record["status"] = status
+        if error is not None:
+            record["error"] = type(error).__name__
+
+        with self._lock:
+            if self._closed:
+                return
+            if self._origin is None:
+                self._origin = start_time
+            record["start"] = round(start_time - self._origin, 6)
+
+        # Serialized here, the params and body may change once the call returns.
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        # Waits for room rather than failing when the queue is full.
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_queued(self):
+        while True:
+            line = self._queue.get()
+            if line is _STOP:
+                return
+            try:
+                self._file.write(line)
+            except Exception as e:
+                logger.warning(f"writing to trace {self.path} failed: {e}")
+
+
+def read_trace(path: str) -> Iterator[TraceEntry]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield TraceEntry(**json.loads(line))
+
+
+def max_concurrency(entries: List[TraceEntry]) -> int:
+    """Most calls that were in flight at once in the trace."""
+    events = []
+    for entry in entries:
+        events.append((entry.start, 1))
+        events.append((entry.end, -1))
+    # Ends sort before starts at the same instant.
+    events.sort()
+
+    in_flight = peak = 0
+    for _, change in events:
+        in_flight += change
+        peak = max(peak, in_flight)
+    return peak
+
+
+@dataclass
+class LatencySummary:
+    count: int = 0
+    errors: int = 0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @classmethod
+    def from_latencies(cls, latencies_ms: List[float], errors: int = 0):
+        if not latencies_ms:
+            return cls(errors=errors)
+        ordered = sorted(latencies_ms)
+
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return cls(
+            count=len(ordered),
+            errors=errors,
+            p50_ms=percentile(0.5),
+            p90_ms=percentile(0.9),
+            p99_ms=percentile(0.99),
+            max_ms=ordered[-1],
+        )
+
+
+@dataclass
+class ReplayReport:
+    # Per endpoint, as recorded and as observed during the replay.
+    recorded: Dict[str, LatencySummary] = field(default_factory=dict)
+    replayed: Dict[str, LatencySummary] = field(default_factory=dict)
+    concurrency: int = 0
+    # Mean seconds calls were issued after their scheduled time.
+    mean_lag: float = 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"{'endpoint':<24}{'calls':>7}{'errors':>8}"
+            f"{'p50 ms':>16}{'p90 ms':>16}{'p99 ms':>16}",
+        ]
+        for endpoint in sorted(self.recorded):
+            before = self.recorded[endpoint]
+            after = self.replayed.get(endpoint, LatencySummary())
+            lines.append(
+                f"{endpoint:<24}{after.count:>7}{after.errors:>8}"
+                + "".join(
+                    f"{f'{b:.1f}->{a:.1f}':>16}"
+                    for b, a in (
+                        (before.p50_ms, after.p50_ms),
+                        (before.p90_ms, after.p90_ms),
+                        (before.p99_ms, after.p99_ms),
+                    )
+                )
+            )
+        lines.append(
+            f"concurrency={self.concurrency} mean_lag={self.mean_lag * 1000:.1f}ms"
+        )
+        return "\n".join(lines)
+
+
+def replay(
+    entries: List[TraceEntry],
+    client,
+    speed: float = 1.0,
+    concurrency: Optional[int] = None,
+) -> ReplayReport:
+    """Re-issues the calls of a trace through `client`, each at its recorded
+    start time divided by `speed`.
+
+    Calls run on a pool as large as the most calls the trace had in flight,
+    unless `concurrency` is given, so a replay at 1x reproduces the original
+    overlap between calls. Errors are counted, not raised.
+    """
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    entries = sorted(entries, key=lambda e: e.start)
+    concurrency = concurrency or max(1, max_concurrency(entries))
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lag = [0.0]
+    lock = threading.Lock()
+
+    def call(entry: TraceEntry, scheduled: float):
+        start = time.perf_counter()
+        try:
+            if entry.method == "GET":
+                client.get(
+                    entry.path, params=entry.params or {}, endpoint=entry.endpoint
+                )
+            elif entry.method == "POST":
+                client.post(entry.path, entry.body, endpoint=entry.endpoint)
+            elif entry.method == "DELETE":
+                client.delete(entry.path, endpoint=entry.endpoint)
+            else:
+                raise ValueError(f"unexpected method {entry.method}")
+        except Exception as e:
+            logger.info(f"replayed {entry.method} {entry.path} failed: {e}")
+            with lock:
+                errors[entry.endpoint] += 1
+        else:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            with lock:
+                latencies[entry.endpoint].append(elapsed_ms)
+        with lock:
+            lag[0] += start - scheduled
+
+    origin = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="taas-replay"
+    ) as executor:
+        for entry in entries:
+            scheduled = origin + entry.start / speed
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(call, entry, scheduled)
+
+    recorded = defaultdict(list)
+    recorded_errors = defaultdict(int)
+    for entry in entries:
+        if entry.error is None:
+            recorded[entry.endpoint].append(entry.latency_ms)
+        else:
+            recorded_errors[entry.endpoint] += 1
+
+    endpoints = set(recorded) | set(recorded_errors)
+    return ReplayReport(
+        recorded={
+            e: LatencySummary.from_latencies(recorded[e], recorded_errors[e])
+            for e in endpoints
+        },
+        replayed={
+            e: LatencySummary.from_latencies(latencies[e], errors[e]) for e in endpoints
+        },
+        concurrency=concurrency,
+        mean_lag=lag[0] / len(entries) if entries else 0.0,
+    )
+
+
+class StandIn:
+    """In-memory stand-in for TaaS that answers each call of a trace after
+    its recorded latency, with its recorded status. Use it with
+    InMemoryTransport to check the replay itself, or to see how the client
+    behaves under a recorded latency profile without a server."""
+
+    def __init__(self, entries: List[TraceEntry], speed: float = 1.0):
+        self.speed = speed
+        self._entries = defaultdict(deque)
+        self._lock = threading.Lock()
+        for entry in sorted(entries, key=lambda e: e.start):
+            self._entries[(entry.method, entry.path)].append(entry)
+
+    def __call__(self, request):
+        with self._lock:
+            queue = self._entries.get((request.method, request.path))
+            entry = queue.popleft() if queue else None
+        if entry is None:
+            return 404, {"detail": "not in trace"}
+
+        time.sleep(entry.latency_ms / 1000.0 / self.speed)
+        return entry.status or 200, {}
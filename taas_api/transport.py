@@ -0,0 +1,495 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+import itertools
+import json as jsonlib
+import logging
+import os
+import socket
+import threading
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from requests.hooks import default_hooks
+from requests.models import RequestEncodingMixin
+from requests.structures import CaseInsensitiveDict
+from requests.utils import requote_uri, select_proxy
+from urllib3.util.connection import create_connection, is_connection_dropped
+
+from taas_api.deadline import TimeoutValue
+
+logger = logging.getLogger(__name__)
+
+# Path requested by keep-alive pings, HEAD so no body is sent back.
+KEEPALIVE_PATH = "/"
+# Seconds the HEAD requests of warmup and keep-alive may take.
+PING_TIMEOUT = 5.0
+
+
+class TransportResponse:
+    def __init__(
+        self,
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes,
+        http_version: str = "HTTP/1.1",
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.http_version = http_version
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+
+class Transport:
+    """Sends the requests built by BaseClient.
+
+    BaseClient calls request() with an absolute URL, the shared headers dict,
+    which must not be modified, and either query params or a JSON body. The
+    returned response needs `status_code`, `headers`, `content` and `json()`.
+
+    Implementations raise requests exceptions (Timeout, ConnectionError, ...)
+    for transport failures, whatever library they use underneath, so callers
+    handle a single set of errors.
+    """
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        timeout: Optional[TimeoutValue] = None,
+    ) -> TransportResponse:
+        raise NotImplementedError
+
+    def warmup(self, url: str, connections: int) -> int:
+        """Opens up to `connections` pooled connections to the host of `url`
+        ahead of the first call. Returns how many were opened."""
+        return 0
+
+    def keepalive(self, url: str):
+        """Exercises idle pooled connections so the server keeps them open."""
+
+    def close(self):
+        pass
+
+
+def resolve_host(host: str, port: int) -> str:
+    """Resolves a host once, preferring IPv4, for connections to reuse."""
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    return infos[0][4][0]
+
+
+def _pinned_connection_class(connection_class, address: str):
+    # Connects to a pre-resolved address while keeping the host name for the
+    # Host header, SNI and certificate checks. Falls back to a fresh lookup
+    # if the cached address stops answering.
+    class PinnedConnection(connection_class):
+        def _new_conn(self):
+            try:
+                return create_connection(
+                    (address, self.port),
+                    self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+            except OSError:
+                logger.info(f"cached address {address} of {self.host} failed")
+                return super()._new_conn()
+
+    return PinnedConnection
+
+
+def _take_least_recently_used(queue):
+    # urllib3 pools are LIFO queues of connections and None placeholders for
+    # unopened ones, the bottom non-None entry is the longest idle connection.
+    with queue.mutex:
+        for i, conn in enumerate(queue.queue):
+            if conn is not None:
+                del queue.queue[i]
+                queue.not_full.notify()
+                return conn
+    return None
+
+
+class _PerProcess:
+    """Lazily builds a connection pool per process, so pooled connections are
+    never shared with a forked child. Pickles without the pool."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._pool = self._factory()
+                    self._pid = pid
+        return self._pool
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.close()
+            self._pool = None
+            self._pid = None
+
+    def __getstate__(self):
+        return {"_factory": self._factory}
+
+    def __setstate__(self, state):
+        self.__init__(state["_factory"])
+
+
+class _OriginSettings:
+    """What requests.Session.request works out on every call that only depends
+    on the origin: default headers and the proxy and TLS settings merged from
+    the environment."""
+
+    def __init__(self, session: requests.Session, url: str):
+        self.session = session
+        self.headers = dict(session.headers)
+        self.send_kwargs = session.merge_environment_settings(url, {}, None, None, None)
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 transport over a pooled requests.Session.
+
+    Requests are prepared directly from settings resolved once per origin,
+    skipping the per-call environment, netrc and cookie lookups of
+    Session.request. Sessions configured with cookies, auth, params or hooks
+    go through Session.request so that configuration still applies.
+    """
+
+    def __init__(self):
+        self._session = _PerProcess(requests.Session)
+        self._origins: Dict[str, _OriginSettings] = {}
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session.get()
+
+    def request(self, method, url, headers, params=None, json=None, timeout=None):
+        session = self.session
+        if (
+            session.cookies
+            or session.auth is not None
+            or session.params
+            or any(session.hooks.values())
+        ):
+            response = session.request(
+                method, url, headers=headers, params=params, json=json, timeout=timeout
+            )
+        else:
+            prepared, settings = self._prepare(
+                session, method, url, headers, params, json
+            )
+            response = session.send(prepared, timeout=timeout, **settings.send_kwargs)
+        return TransportResponse(
+            response.status_code, response.headers, response.content
+        )
+
+    def _prepare(self, session, method, url, headers, params, json):
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        settings = self._origins.get(origin)
+        if settings is None or settings.session is not session:
+            settings = self._origins[origin] = _OriginSettings(session, origin)
+
+        if params:
+            query = RequestEncodingMixin._encode_params(params)
+            if query:
+                url = f"{url}{'&' if parts.query else '?'}{query}"
+
+        prepared = requests.PreparedRequest()
+        prepared.method = method
+        prepared.url = requote_uri(url)
+        prepared.headers = CaseInsensitiveDict(settings.headers)
+        prepared.headers.update(headers)
+        if json is not None:
+            prepared.body = jsonlib.dumps(json, allow_nan=False).encode("utf-8")
+            prepared.headers["Content-Type"] = "application/json"
+            prepared.headers["Content-Length"] = str(len(prepared.body))
+        elif method not in ("GET", "HEAD"):
+            prepared.headers["Content-Length"] = "0"
+        prepared.hooks = default_hooks()
+        prepared._cookies = RequestsCookieJar()
+        return prepared, settings
+
+    def warmup(self, url: str, connections: int) -> int:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        session = self.session
+        session.mount(
+            origin,
+            HTTPAdapter(pool_maxsize=max(DEFAULT_POOLSIZE, connections)),
+        )
+        pool = self._pool(url)
+
+        # Through a proxy the connections go to the proxy, which resolves
+        # the host itself, so they are only opened.
+        settings = session.merge_environment_settings(url, {}, None, None, None)
+        if select_proxy(url, settings["proxies"]) is None:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            address = resolve_host(parts.hostname, port)
+            pool.ConnectionCls = _pinned_connection_class(pool.ConnectionCls, address)
+
+        opened = []
+        try:
+            for _ in range(connections):
+                conn = pool._get_conn()
+                opened.append(conn)
+                conn.connect()
+        finally:
+            for conn in opened:
+                pool._put_conn(conn)
+        return len(opened)
+
+    def keepalive(self, url: str):
+        pool = self._pool(url)
+        if pool.pool is None:
+            return
+        # One connection out at a time, so calls made meanwhile still find
+        # warm ones. The least recently used idle connection is pinged and
+        # put back on top, so each pass reaches every idle connection once.
+        with pool.pool.mutex:
+            idle = sum(conn is not None for conn in pool.pool.queue)
+
+        for _ in range(idle):
+            conn = _take_least_recently_used(pool.pool)
+            if conn is None:
+                return
+            try:
+                if is_connection_dropped(conn):
+                    conn.close()
+                    conn.connect()
+                else:
+                    conn.request("HEAD", KEEPALIVE_PATH)
+                    conn.getresponse().read()
+            except Exception as e:
+                logger.info(f"keepalive to {url} failed: {e}")
+                conn.close()
+            finally:
+                pool._put_conn(conn)
+
+    def _pool(self, url: str):
+        # The pool requests will pick for this URL. Pools are keyed by TLS
+        # settings, which may come from the environment, e.g. REQUESTS_CA_BUNDLE.
+        session = self.session
+        adapter = session.get_adapter(url)
+        settings = session.merge_environment_settings(url, {}, None, None, None)
+        if hasattr(adapter, "get_connection_with_tls_context"):
+            request = requests.Request("GET", url).prepare()
+            return adapter.get_connection_with_tls_context(
+                request,
+                settings["verify"],
+                proxies=settings["proxies"],
+                cert=settings["cert"],
+            )
+        return adapter.get_connection(url, settings["proxies"])
+
+    def close(self):
+        self._session.close()
+
+    def __getstate__(self):
+        return {"_session": self._session}
+
+    def __setstate__(self, state):
+        self._session = state["_session"]
+        self._origins = {}
+
+
+class HTTP2Transport(Transport):
+    """Multiplexes every call to a host over `connections` HTTP/2 connections,
+    picked round robin. Needs the optional httpx[http2] dependency.
+
+    HTTP/2 is negotiated through TLS ALPN and the transport falls back to
+    HTTP/1.1 when the server does not offer it. Each client may then open up
+    to `http1_pool_size` HTTP/1.1 connections, an HTTP/2 connection is
+    shared by every concurrent call anyway. Set `http1=False` to speak
+    HTTP/2 with prior knowledge, e.g. to a cleartext h2c server.
+    """
+
+    def __init__(
+        self,
+        connections: int = 2,
+        http1: bool = True,
+        http1_pool_size: int = DEFAULT_POOLSIZE,
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "httpx is required for the HTTP/2 transport, install it with "
+                "`pip install taas-api-client[http2]`"
+            )
+
+        if connections < 1:
+            raise ValueError("connections must be a positive integer")
+        self.connections = connections
+        self.http1 = http1
+        self.http1_pool_size = http1_pool_size
+        self._clients = [_PerProcess(self._build_client) for _ in range(connections)]
+        self._next = itertools.count()
+
+    def _build_client(self):
+        import httpx
+
+        # One multiplexed connection is enough for HTTP/2, but a fallback to
+        # HTTP/1.1 needs a connection per concurrent call.
+        pool_size = self.http1_pool_size if self.http1 else 1
+        return httpx.Client(
+            http1=self.http1,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    def request(self, method, url, headers, params=None, json=None, timeout=None):
+        client = self._clients[next(self._next) % self.connections].get()
+        return self._send(client, method, url, headers, params, json, timeout)
+
+    def _send(self, client, method, url, headers, params, json, timeout):
+        import httpx
+
+        try:
+            response = client.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json,
+                timeout=_httpx_timeout(timeout),
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+        return TransportResponse(
+            response.status_code,
+            response.headers,
+            response.content,
+            response.http_version,
+        )
+
+    def warmup(self, url: str, connections: int) -> int:
+        # One connection per client, which covers the whole transport once
+        # HTTP/2 is negotiated.
+        opened = 0
+        for client in self._clients[:connections]:
+            self._send(client.get(), "HEAD", url, {}, None, None, PING_TIMEOUT)
+            opened += 1
+        return opened
+
+    def keepalive(self, url: str):
+        for client in self._clients:
+            try:
+                self._send(client.get(), "HEAD", url, {}, None, None, PING_TIMEOUT)
+            except Exception as e:
+                logger.info(f"keepalive to {url} failed: {e}")
+
+    def close(self):
+        for client in self._clients:
+            client.close()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_next"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._next = itertools.count()
+
+
+def _httpx_timeout(timeout: Optional[TimeoutValue]):
+    import httpx
+
+    if timeout is None:
+        return httpx.Timeout(None)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        # Waiting for a free pooled connection is bounded like a response.
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=read)
+    return httpx.Timeout(timeout)
+
+
+@dataclass
+class InMemoryRequest:
+    method: str
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    json: Optional[Any] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class _InMemoryResponse(TransportResponse):
+    # Hands the handler's payload back as is, only encoding it if the body is
+    # actually read, e.g. to log an error response.
+    def __init__(self, status_code: int, payload):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json"}
+        self.http_version = "in-memory"
+        self._payload = payload
+
+    @property
+    def content(self) -> bytes:
+        return jsonlib.dumps(self._payload).encode("utf-8")
+
+    def json(self):
+        return self._payload
+
+
+class InMemoryTransport(Transport):
+    """Routes every call to a Python handler instead of the network, e.g. a
+    simulated TaaS for backtests and integration tests.
+
+    `handler(request)` receives an InMemoryRequest and returns the decoded
+    JSON response, a `(status_code, payload)` tuple or a TransportResponse.
+    Payloads are returned to the caller without a copy. To simulate transport
+    failures the handler raises requests exceptions. The handler runs on the
+    calling thread, so it must be thread safe when hedging or bulk helpers
+    are used, and picklable for place_orders_bulk.
+    """
+
+    def __init__(self, handler: Callable[[InMemoryRequest], Any]):
+        self.handler = handler
+
+    def request(self, method, url, headers, params=None, json=None, timeout=None):
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        if params:
+            query.update((k, v) for k, v in params.items() if v is not None)
+
+        result = self.handler(InMemoryRequest(method, parts.path, query, json, headers))
+        if isinstance(result, TransportResponse):
+            return result
+        if isinstance(result, tuple):
+            return _InMemoryResponse(*result)
+        return _InMemoryResponse(200, result)
+
+
+def build_transport(transport) -> Transport:
+    if transport is None or transport == "http1":
+        return RequestsTransport()
+    if transport == "http2":
+        return HTTP2Transport()
+    if isinstance(transport, Transport):
+        return transport
+    raise ValueError(f"unexpected transport {transport}, expecting 'http1', 'http2'")
@@ -0,0 +1,83 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+import json
+import threading
+import time
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def do_DELETE(self):
+        self._respond()
+
+    def do_HEAD(self):
+        with self.server.lock:
+            self.server.methods.append(self.command)
+            self.server.calls.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _respond(self):
+        server = self.server
+        with server.lock:
+            server.calls.append(self.path)
+            server.methods.append(self.command)
+            delay = server.delays.pop(0) if server.delays else 0
+        time.sleep(delay)
+
+        status, payload = 200, {"path": self.path, "delay": delay}
+        if server.responder is not None:
+            payload = server.responder(self.path)
+            # A responder may answer with (status, payload), as handlers of
+            # InMemoryTransport do.
+            if isinstance(payload, tuple):
+                status, payload = payload
+
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    block_on_close = False
+    connections = 0
+
+    def verify_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        return True
+
+
+class ClientTestCase(TestCase):
+    def setUp(self):
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.lock = threading.Lock()
+        self.server.calls = []
+        self.server.methods = []
+        self.server.delays = []
+        self.server.responder = None
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
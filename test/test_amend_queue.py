@@ -0,0 +1,85 @@
+from unittest import TestCase
+import threading
+import time
+
+from taas_api.amend_queue import AmendQueue
+from taas_api.data import AmendOrderRequest
+
+
+class _FakeClient:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def amend_order(self, request):
+        with self.lock:
+            self.calls.append((request.order_id, dict(request.changes)))
+        time.sleep(self.delay)
+        if request.changes.get("fail"):
+            raise ValueError("rejected")
+        return {"order_id": request.order_id, "changes": request.changes}
+
+
+class AmendQueueTest(TestCase):
+    def test_merges_changes_within_window(self):
+        client = _FakeClient()
+        with AmendQueue(client, window=0.05) as queue:
+            first = queue.submit(AmendOrderRequest("a", {"base_asset_qty": 1}))
+            second = queue.submit(AmendOrderRequest("a", {"duration": 60}))
+            third = queue.submit(AmendOrderRequest("a", {"base_asset_qty": 2}))
+            other = queue.submit(AmendOrderRequest("b", {"duration": 30}))
+
+            result = first.result(1)
+
+        self.assertEqual(
+            sorted(client.calls),
+            [("a", {"base_asset_qty": 2, "duration": 60}), ("b", {"duration": 30})],
+        )
+        self.assertEqual(result["changes"], {"base_asset_qty": 2, "duration": 60})
+        self.assertIs(second.result(), result)
+        self.assertIs(third.result(), result)
+        self.assertEqual(other.result()["order_id"], "b")
+
+    def test_failure_reaches_every_caller(self):
+        client = _FakeClient()
+        with AmendQueue(client, window=0.01) as queue:
+            first = queue.submit(AmendOrderRequest("a", {"duration": 60}))
+            second = queue.submit(AmendOrderRequest("a", {"fail": True}))
+
+            with self.assertRaises(ValueError):
+                first.result(1)
+            with self.assertRaises(ValueError):
+                second.result(1)
+
+    def test_one_amend_in_flight_per_order(self):
+        client = _FakeClient(delay=0.1)
+        with AmendQueue(client, window=0.01) as queue:
+            first = queue.submit(AmendOrderRequest("a", {"duration": 60}))
+            time.sleep(0.05)
+            second = queue.submit(AmendOrderRequest("a", {"duration": 90}))
+            third = queue.submit(AmendOrderRequest("a", {"base_asset_qty": 3}))
+
+            first.result(1)
+            self.assertFalse(second.done())
+            second.result(1)
+
+        self.assertEqual(
+            client.calls,
+            [
+                ("a", {"duration": 60}),
+                ("a", {"duration": 90, "base_asset_qty": 3}),
+            ],
+        )
+        self.assertTrue(third.done())
+
+    def test_close_flushes_pending(self):
+        client = _FakeClient()
+        queue = AmendQueue(client, window=10)
+        future = queue.submit(AmendOrderRequest("a", {"duration": 60}))
+
+        queue.close()
+
+        self.assertTrue(future.done())
+        with self.assertRaises(RuntimeError):
+            queue.submit(AmendOrderRequest("a", {"duration": 60}))
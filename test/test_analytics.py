@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+from unittest import TestCase, skipIf
+
+from taas_api.analytics import BalanceFrame, OrderFrame, np
+
+BALANCES = {
+    "okx_main": {
+        "exchange": "OKX",
+        "assets": [
+            {"symbol": "BTC", "size": 3.0, "notional": 90000.0, "leverage": None},
+            {"symbol": "USDT", "size": 8930.5, "notional": 8930.5},
+            {"symbol": "ETH:PERP-USDT", "size": -10.0, "notional": -30000.0},
+        ],
+    },
+    "binance_main": {
+        "exchange": "Binance",
+        "assets": [
+            {"symbol": "BTC", "size": 1.0, "notional": 30000.0},
+            {"symbol": "ETH:PERP-USDT", "size": 5.0, "notional": 15000.0},
+        ],
+    },
+}
+
+
+@skipIf(np is None, "numpy is not installed")
+class BalanceFrameTest(TestCase):
+    def setUp(self):
+        self.frame = BalanceFrame.from_response(BALANCES)
+
+    def test_columns(self):
+        self.assertEqual(len(self.frame), 5)
+        self.assertTrue(np.isnan(self.frame.columns["leverage"]).all())
+
+    def test_totals_by_symbol(self):
+        totals = self.frame.totals("symbol", "notional")
+
+        self.assertEqual(
+            totals, {"BTC": 120000.0, "ETH:PERP-USDT": -15000.0, "USDT": 8930.5}
+        )
+
+    def test_totals_by_several_keys(self):
+        totals = self.frame.totals(("account", "symbol"), "size")
+
+        self.assertEqual(totals[("okx_main", "ETH:PERP-USDT")], -10.0)
+        self.assertEqual(totals[("binance_main", "BTC")], 1.0)
+        self.assertEqual(len(totals), 5)
+
+    def test_gross_totals_by_exchange(self):
+        totals = self.frame.totals("exchange", "notional", absolute=True)
+
+        self.assertEqual(totals, {"Binance": 45000.0, "OKX": 128930.5})
+
+    def test_exposure(self):
+        exposure = self.frame.exposure({"BTC": 100000.0, "ETH:PERP-USDT": 20000.0})
+
+        self.assertEqual(
+            exposure.breaches(), {"BTC": 120000.0, "ETH:PERP-USDT": 45000.0}
+        )
+        self.assertEqual(exposure.utilization.tolist(), [1.2, 2.25, 0.0])
+
+    def test_empty_response(self):
+        frame = BalanceFrame.from_response({})
+
+        self.assertEqual(frame.totals("symbol", "notional"), {})
+
+
+def _order(order_id, pair, side, status, sell_amount, qty, notional, **kwargs):
+    order = {
+        "id": order_id,
+        "pair": pair,
+        "side": side,
+        "status": status,
+        "strategy": "twap",
+        "account_names": ["mock"],
+        "sell_token_amount": sell_amount,
+        "executed_qty": qty,
+        "executed_notional": notional,
+        "executed_price": str(notional / qty) if qty else None,
+        "limit_price": "-1.00000000000000000000",
+        "duration": 300,
+        "created_at": "2023-08-08T23:54:07.659244Z",
+        "time_start": "2023-08-08T23:54:06Z",
+        "updated_at": "2023-08-08T23:56:36Z",
+    }
+    order.update(kwargs)
+    return order
+
+
+ORDERS = {
+    "results": [
+        _order("1", "ETH-USDT", "buy", "COMPLETE", "10000.0", 5, 10000.0),
+        _order(
+            "2",
+            "ETH-USDT",
+            "sell",
+            "ACTIVE",
+            "4.00000000000000000000",
+            1,
+            2100.0,
+            limit_price="2000.00000000000000000000",
+        ),
+        _order("3", "BTC-USDT", "buy", "ACTIVE", "30000.0", 0, 0, updated_at=None),
+    ],
+    "next": None,
+}
+
+
+@skipIf(np is None, "numpy is not installed")
+class OrderFrameTest(TestCase):
+    def setUp(self):
+        self.frame = OrderFrame.from_response(ORDERS)
+
+    def test_columns(self):
+        self.assertEqual(len(self.frame), 3)
+        self.assertEqual(self.frame.ids, ["1", "2", "3"])
+        self.assertEqual(self.frame.columns["sell_token_amount"].tolist()[1], 4.0)
+        self.assertEqual(
+            self.frame.columns["time_start"][0],
+            datetime(2023, 8, 8, 23, 54, 6, tzinfo=timezone.utc).timestamp(),
+        )
+        self.assertTrue(np.isnan(self.frame.columns["executed_price"][2]))
+
+    def test_derived_columns(self):
+        columns = self.frame.columns
+
+        self.assertEqual(columns["fill_ratio"][:2].tolist(), [1.0, 0.25])
+        self.assertTrue(np.isnan(columns["limit_improvement"][0]))
+        # Sold at 2100 against a 2000 limit.
+        self.assertAlmostEqual(columns["limit_improvement"][1], 0.05)
+        self.assertEqual(columns["duration_usage"][0], 0.5)
+        self.assertTrue(np.isnan(columns["duration_usage"][2]))
+
+    def test_single_order(self):
+        frame = OrderFrame.from_response(ORDERS["results"][0])
+
+        self.assertEqual(len(frame), 1)
+
+    def test_execution_summary(self):
+        summary = self.frame.execution_summary("pair")
+
+        self.assertEqual(summary["ETH-USDT"]["orders"], 2)
+        self.assertEqual(summary["ETH-USDT"]["executed_notional"], 12100.0)
+        self.assertAlmostEqual(summary["ETH-USDT"]["executed_price"], 12100.0 / 6)
+        self.assertEqual(summary["BTC-USDT"]["fill_ratio"], 0.0)
+        self.assertTrue(np.isnan(summary["BTC-USDT"]["executed_price"]))
+
+    def test_group_by_several_keys(self):
+        totals = self.frame.totals(("pair", "status"), "executed_qty")
+
+        self.assertEqual(totals[("ETH-USDT", "COMPLETE")], 5.0)
+        self.assertEqual(len(totals), 3)
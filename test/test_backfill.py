@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+import gzip
+import json
+import os
+import tempfile
+import threading
+
+from taas_api.backfill import backfill_orders, backfill_to_file
+from taas_api.timestamps import format_timestamp, parse_timestamp
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FakeClient:
+    """Pages through orders filtered by created time, like /api/orders/."""
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def iter_all_orders(self, request, deadline=None):
+        with self.lock:
+            self.requests.append(request)
+        after = parse_timestamp(request.after)
+        before = parse_timestamp(request.before)
+        # Inclusive on both ends, so orders on a bound show up twice.
+        matches = [
+            order
+            for order in self.orders
+            if after <= parse_timestamp(order["created_at"]) <= before
+        ]
+        matches.sort(key=lambda order: order["id"], reverse=True)
+        return iter(matches)
+
+
+def _orders(times):
+    return [
+        {"id": f"{i:04d}", "created_at": format_timestamp(START + offset)}
+        for i, offset in enumerate(times)
+    ]
+
+
+class BackfillTest(TestCase):
+    def test_yields_each_order_once_in_time_order(self):
+        # Dense burst in the first hour, sparse afterwards, one on a bound.
+        times = [timedelta(seconds=10 * i) for i in range(300)]
+        times += [timedelta(hours=h) for h in range(2, 48, 3)]
+        times.append(timedelta(hours=6))
+        client = _FakeClient(_orders(times))
+
+        orders = list(
+            backfill_orders(
+                client,
+                START,
+                START + timedelta(days=2),
+                window=timedelta(hours=6),
+                page_size=50,
+                max_workers=4,
+            )
+        )
+
+        self.assertEqual(len(orders), len(client.orders))
+        self.assertEqual(len({order["id"] for order in orders}), len(orders))
+        created = [parse_timestamp(order["created_at"]) for order in orders]
+        self.assertEqual(created, sorted(created))
+
+    def test_dense_windows_are_split(self):
+        client = _FakeClient(_orders([timedelta(seconds=i) for i in range(400)]))
+
+        orders = list(
+            backfill_orders(
+                client,
+                START,
+                START + timedelta(hours=1),
+                window=timedelta(hours=1),
+                page_size=100,
+            )
+        )
+
+        self.assertEqual(len(orders), 400)
+        windows = [
+            parse_timestamp(r.before) - parse_timestamp(r.after)
+            for r in client.requests
+        ]
+        self.assertLess(min(windows), timedelta(minutes=10))
+
+    def test_sparse_windows_grow(self):
+        client = _FakeClient(_orders([timedelta(days=d) for d in range(30)]))
+
+        orders = list(
+            backfill_orders(
+                client,
+                START,
+                START + timedelta(days=30),
+                window=timedelta(hours=1),
+                max_workers=1,
+            )
+        )
+
+        self.assertEqual(len(orders), 30)
+        self.assertLess(len(client.requests), 30 * 24 / 4)
+
+    def test_unordered_to_file(self):
+        client = _FakeClient(_orders([timedelta(minutes=i) for i in range(120)]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "orders.jsonl.gz")
+            count = backfill_to_file(
+                client,
+                path,
+                "2024-01-01T00:00:00Z",
+                "2024-01-01T02:00:00Z",
+                window=timedelta(minutes=10),
+            )
+            with gzip.open(path, "rt") as f:
+                ids = [json.loads(line)["id"] for line in f]
+
+        self.assertEqual(count, 120)
+        self.assertEqual(sorted(ids), [order["id"] for order in client.orders])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            list(backfill_orders(_FakeClient([]), START, START))
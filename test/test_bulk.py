@@ -0,0 +1,113 @@
+from unittest import TestCase
+import os
+import tempfile
+
+from taas_api import Client, OrderJournal, PlaceOrderRequest
+from taas_api.bulk import decode_order, encode_order
+from test.helpers import ClientTestCase
+
+
+class EncodeOrderTest(TestCase):
+    def test_round_trip(self):
+        order = PlaceOrderRequest(
+            accounts=["mock"],
+            pair="ETH-USDT",
+            side="buy",
+            strategy="TWAP",
+            duration=300,
+            base_asset_qty=5,
+        )
+
+        encoded = encode_order(order)
+
+        self.assertEqual(len(encoded), 7)
+        self.assertEqual(decode_order(encoded), order)
+
+    def test_encode_dict(self):
+        encoded = encode_order(
+            {"accounts": ["mock"], "pair": "ETH-USDT", "side": "sell", "strategy": "IS"}
+        )
+
+        self.assertEqual(encoded, (["mock"], "ETH-USDT", "sell", "IS"))
+
+    def test_encode_unknown_field(self):
+        with self.assertRaises(ValueError):
+            encode_order({"pair": "ETH-USDT", "price": 1})
+
+
+class PlaceOrdersBulkTest(ClientTestCase):
+    def test_results_in_input_order(self):
+        client = Client(self.url, auth_token="token")
+        orders = [
+            {
+                "accounts": ["mock"],
+                "pair": "ETH-USDT",
+                "side": "buy",
+                "strategy": "TWAP",
+                "duration": 300,
+                "base_asset_qty": i,
+            }
+            for i in range(1, 8)
+        ]
+        orders[3]["side"] = "wrong"
+
+        results = client.place_orders_bulk(orders, processes=2, chunk_size=2)
+
+        self.assertEqual(len(results), 7)
+        self.assertEqual([r.success for r in results].count(False), 1)
+        self.assertFalse(results[3].success)
+        self.assertIn("side", results[3].error)
+        self.assertEqual(results[0].response["path"], "/api/orders/")
+        self.assertEqual(len(self.server.calls), 6)
+
+    def test_batch_is_journaled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = OrderJournal(os.path.join(tmp, "orders.journal"))
+            client = Client(self.url, auth_token="token", journal=journal)
+            orders = [
+                {
+                    "accounts": ["mock"],
+                    "pair": "ETH-USDT",
+                    "side": side,
+                    "strategy": "TWAP",
+                    "duration": 300,
+                    "base_asset_qty": 1,
+                }
+                for side in ("buy", "wrong")
+            ]
+
+            client.place_orders_bulk(orders, processes=1)
+
+            entries = list(journal.entries())
+            journal.close()
+
+        requests = [e for e in entries if e.operation == "place_order"]
+        self.assertEqual(
+            [e.payload["body"]["side"] for e in requests], ["buy", "wrong"]
+        )
+        self.assertEqual(len(entries), 4)
+        self.assertIn("side", entries[-1].payload["error"])
+
+    def test_http_errors_fail_the_order(self):
+        self.server.responder = lambda path: (400, {"detail": "insufficient balance"})
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = OrderJournal(os.path.join(tmp, "orders.journal"))
+            client = Client(self.url, auth_token="token", journal=journal)
+            order = {
+                "accounts": ["mock"],
+                "pair": "ETH-USDT",
+                "side": "buy",
+                "strategy": "TWAP",
+                "duration": 300,
+                "base_asset_qty": 1,
+            }
+
+            (result,) = client.place_orders_bulk([order], processes=1)
+
+            entries = list(journal.entries())
+            journal.close()
+
+        self.assertFalse(result.success)
+        self.assertIn("HTTP 400", result.error)
+        self.assertEqual(result.response, {"detail": "insufficient balance"})
+        self.assertIn("HTTP 400", entries[-1].payload["error"])
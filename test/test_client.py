@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from urllib.parse import parse_qs, urlparse
+import time
+
+import requests
+
+from taas_api import Client, HedgePolicy
+from taas_api.data import GetOrderRequest
+from taas_api.deadline import Deadline, DeadlineExceeded
+from taas_api.transport import InMemoryTransport
+from test.helpers import ClientTestCase
+
+
+class HedgingTest(ClientTestCase):
+    def test_no_hedge_without_policy(self):
+        self.server.delays = [0.2]
+        client = Client(self.url, auth_token="token")
+
+        res = client.get_order("abc")
+
+        self.assertEqual(res["path"], "/api/order/abc")
+        self.assertEqual(len(self.server.calls), 1)
+
+    def test_hedge_answers_slow_first_attempt(self):
+        self.server.delays = [1.0, 0]
+        client = Client(
+            self.url, auth_token="token", hedge_policy=HedgePolicy(delay=0.05)
+        )
+
+        start = time.perf_counter()
+        res = client.get_order_summary("abc")
+
+        self.assertLess(time.perf_counter() - start, 0.9)
+        self.assertEqual(res["delay"], 0)
+        self.assertEqual(len(self.server.calls), 2)
+
+    def test_hedge_budget_caps_extra_requests(self):
+        self.server.delays = [0.2] * 10
+        client = Client(
+            self.url,
+            auth_token="token",
+            hedge_policy=HedgePolicy(delay=0.01, budget_ratio=0, max_budget=1),
+        )
+
+        client.get_balances()
+        client.get_balances()
+
+        # Only the single token in the bucket can be spent on a hedge.
+        time.sleep(0.3)
+        self.assertEqual(len(self.server.calls), 3)
+
+    def test_expired_deadline_spends_no_budget(self):
+        self.server.delays = [0.3]
+        client = Client(
+            self.url,
+            auth_token="token",
+            hedge_policy=HedgePolicy(delay=0.5, budget_ratio=0, max_budget=1),
+        )
+
+        with self.assertRaises(DeadlineExceeded):
+            client.get_order("abc", deadline=0.1)
+
+        self.assertEqual(client._hedge_budget.tokens, 1)
+        self.assertEqual(len(self.server.calls), 1)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            Client(self.url, hedge_policy=HedgePolicy(budget_ratio=2))
+        with self.assertRaises(ValueError):
+            Client(self.url, hedge_policy=HedgePolicy(max_request_workers=0))
+
+
+class HedgingConcurrencyTest(TestCase):
+    def test_first_attempts_are_not_capped_by_the_hedge_pool(self):
+        def handler(request):
+            time.sleep(0.1)
+            return {}
+
+        client = Client(
+            "http://taas",
+            transport=InMemoryTransport(handler),
+            hedge_policy=HedgePolicy(delay=5.0, max_workers=2),
+        )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(client.get_order, map(str, range(16))))
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+class DeadlineTest(ClientTestCase):
+    def test_deadline_exceeded(self):
+        self.server.delays = [0.5]
+        client = Client(self.url, auth_token="token")
+
+        with self.assertRaises(DeadlineExceeded):
+            client.cancel_order("abc", deadline=0.1)
+
+    def test_expired_deadline_skips_request(self):
+        client = Client(self.url, auth_token="token")
+        deadline = Deadline(0)
+
+        with self.assertRaises(DeadlineExceeded):
+            client.get_order("abc", deadline=deadline)
+        self.assertEqual(self.server.calls, [])
+
+    def test_endpoint_timeout_is_not_deadline(self):
+        self.server.delays = [0.5]
+        client = Client(
+            self.url, auth_token="token", endpoint_timeouts={"get_order": 0.1}
+        )
+
+        with self.assertRaises(requests.exceptions.Timeout) as ctx:
+            client.get_order("abc")
+        self.assertNotIsInstance(ctx.exception, DeadlineExceeded)
+
+    def test_hedged_call_respects_deadline(self):
+        self.server.delays = [0.5, 0.5]
+        client = Client(
+            self.url, auth_token="token", hedge_policy=HedgePolicy(delay=0.05)
+        )
+
+        start = time.perf_counter()
+        with self.assertRaises(DeadlineExceeded):
+            client.get_balances(deadline=0.2)
+        self.assertLess(time.perf_counter() - start, 0.45)
+
+
+class IterAllOrdersTest(ClientTestCase):
+    def setUp(self):
+        super().setUp()
+
+        def responder(path):
+            query = parse_qs(urlparse(path).query)
+            page = int(query["page"][0])
+            page_size = int(query["page_size"][0])
+            ids = list(range(5))[(page - 1) * page_size : page * page_size]
+            return [{"id": str(i)} for i in ids]
+
+        self.server.responder = responder
+
+    def test_iter_all_pages(self):
+        client = Client(self.url, auth_token="token")
+
+        orders = list(client.iter_all_orders(GetOrderRequest(page_size=2)))
+
+        self.assertEqual([o["id"] for o in orders], ["0", "1", "2", "3", "4"])
+        self.assertEqual(len(self.server.calls), 3)
+
+    def test_deadline_covers_all_pages(self):
+        self.server.delays = [0.1, 0.1, 0.1]
+        client = Client(self.url, auth_token="token")
+
+        with self.assertRaises(DeadlineExceeded):
+            list(client.iter_all_orders(GetOrderRequest(page_size=2), deadline=0.15))
+
+
+class RequestPreparationTest(ClientTestCase):
+    def test_url_keeps_origin_only(self):
+        client = Client(self.url + "/taas/", auth_token="token")
+
+        res = client.get_order("abc")
+
+        self.assertEqual(res["path"], "/api/order/abc")
+
+    def test_headers_follow_auth_token(self):
+        client = Client(self.url, auth_token="old", extra_headers={"X-Desk": "a"})
+        self.assertIs(client._common_headers(), client._common_headers())
+
+        client.auth_token = "new"
+
+        self.assertEqual(
+            client._common_headers(), {"Authorization": "Token new", "X-Desk": "a"}
+        )
@@ -0,0 +1,122 @@
+from unittest import TestCase
+
+from taas_api import ClientFactory
+from taas_api.limiter import AdaptiveLimiter
+from taas_api.metrics import MetricsRegistry
+from taas_api.scheduler import RequestScheduler
+from taas_api.transport import InMemoryTransport
+
+
+class _ClosableTransport(InMemoryTransport):
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ClientFactoryTest(TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            return {}
+
+        self.transport = _ClosableTransport(handler)
+        self.metrics = MetricsRegistry()
+        self.factory = ClientFactory(
+            "http://taas",
+            transport=self.transport,
+            metrics=self.metrics,
+            limiter=lambda: AdaptiveLimiter(initial_limit=4),
+            scheduler=RequestScheduler,
+            timeout=5,
+        )
+
+    def test_clients_share_the_transport(self):
+        first = self.factory.client("token-a", name="a")
+        second = self.factory.client("token-b", {"X-Desk": "b"}, name="b")
+
+        first.get_order("1")
+        second.get_order("2")
+        first.close()
+        second.get_order("3")
+
+        self.assertEqual(
+            [r.headers["Authorization"] for r in self.requests],
+            ["Token token-a", "Token token-b", "Token token-b"],
+        )
+        self.assertEqual(self.requests[1].headers["X-Desk"], "b")
+        self.assertFalse(self.transport.closed)
+        self.assertEqual(first.timeout, 5)
+
+        self.factory.close()
+        self.assertTrue(self.transport.closed)
+
+    def test_per_client_limits_and_labels(self):
+        first = self.factory.client("token-a", name="a")
+        second = self.factory.client("token-b", name="b")
+
+        self.assertIsNot(first.limiter, second.limiter)
+        self.assertIsNot(first.scheduler, second.scheduler)
+
+        first.get_order("1")
+        first.get_order("2")
+        second.get_order("3")
+        self.metrics.snapshot()
+
+        for name, count in (("a", 2), ("b", 1)):
+            self.assertEqual(
+                self.metrics.get(
+                    "taas_requests_total", endpoint="get_order", status=200, client=name
+                ),
+                count,
+            )
+            self.assertEqual(
+                self.metrics.get(
+                    "taas_concurrency_limit", endpoint="get_order", client=name
+                ),
+                4,
+            )
+
+    def test_closing_a_client_drops_its_limiter(self):
+        first = self.factory.client("token-a", name="a")
+        second = self.factory.client("token-b", name="b")
+        first.get_order("1")
+        second.get_order("2")
+
+        first.close()
+        snapshot = self.metrics.snapshot()
+
+        limits = snapshot["taas_concurrency_limit"]
+        self.assertEqual([dict(labels)["client"] for labels in limits], ["b"])
+        self.assertNotIn(first.limiter.collect, self.metrics._collectors)
+        self.assertEqual(
+            self.metrics.get(
+                "taas_requests_total", endpoint="get_order", status=200, client="a"
+            ),
+            1,
+        )
+
+    def test_endpoint_health_is_shared(self):
+        factory = ClientFactory(["http://a", "http://b"], transport=self.transport)
+
+        first = factory.client("token-a")
+        second = factory.client("token-b")
+
+        self.assertIs(first.endpoints, factory.endpoints)
+        self.assertIs(second.endpoints, factory.endpoints)
+        factory.close()
+
+    def test_closing_a_client_keeps_probing_endpoints(self):
+        factory = ClientFactory(["http://a", "http://b"], transport=self.transport)
+        client = factory.client("token-a")
+        factory.endpoints.record_failure(factory.endpoints.endpoints[0])
+        probing = factory.endpoints._probe_stop
+
+        client.close()
+
+        self.assertIs(factory.endpoints._probe_stop, probing)
+        self.assertFalse(probing.is_set())
+        factory.close()
+        self.assertTrue(probing.is_set())
@@ -0,0 +1,130 @@
+from unittest import TestCase
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from taas_api import Client
+from taas_api.failover import EndpointPool, FailoverPolicy, request_not_sent
+from taas_api.transport import Transport, TransportResponse
+
+
+def _refused(url):
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(MaxRetryError(None, url, reason))
+
+
+class _HostTransport(Transport):
+    def __init__(self):
+        self.down = set()
+        self.aborted = set()
+        self.calls = []
+
+    def request(self, method, url, headers, params=None, json=None, timeout=None):
+        host = urlsplit(url).hostname
+        self.calls.append((method, host))
+        if host in self.down:
+            raise _refused(url)
+        if host in self.aborted:
+            raise requests.exceptions.ConnectionError("Connection aborted.")
+        return TransportResponse(200, {}, b'{"host": "%s"}' % host.encode())
+
+
+class EndpointPoolTest(TestCase):
+    def test_ranking(self):
+        pool = EndpointPool(["http://a", "http://b", "http://c"])
+        a, b, c = pool.endpoints
+
+        pool.record_latency(a, 0.2)
+        pool.record_latency(b, 0.1)
+        pool.record_latency(c, 0.3)
+        pool.record_latency(b, 0.6)
+        with self.assertLogs("taas_api.failover", "WARNING"):
+            pool.record_failure(c)
+
+        self.assertAlmostEqual(b.latency, 0.2)
+        self.assertEqual(
+            [e.url for e in pool.ranked()], ["http://a", "http://b", "http://c"]
+        )
+
+    def test_probe_marks_endpoint_up(self):
+        answering = set()
+
+        def probe(endpoint):
+            if endpoint.url not in answering:
+                raise requests.exceptions.ConnectionError("down")
+
+        pool = EndpointPool(["http://a", "http://b"], probe=probe)
+        with self.assertLogs("taas_api.failover", "WARNING"):
+            pool.record_failure(pool.endpoints[0])
+        pool.probe()
+        self.assertFalse(pool.endpoints[0].healthy)
+
+        answering.add("http://a")
+        pool.probe()
+        pool.close()
+
+        self.assertTrue(pool.endpoints[0].healthy)
+        self.assertIsNone(pool.endpoints[0].latency)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            EndpointPool(["http://a"], FailoverPolicy(alpha=0))
+        with self.assertRaises(ValueError):
+            EndpointPool([])
+
+    def test_request_not_sent(self):
+        self.assertTrue(request_not_sent(_refused("http://a")))
+        self.assertTrue(request_not_sent(requests.exceptions.ConnectTimeout()))
+        self.assertFalse(
+            request_not_sent(requests.exceptions.ConnectionError("Connection aborted."))
+        )
+
+
+class ClientFailoverTest(TestCase):
+    def setUp(self):
+        self.transport = _HostTransport()
+        self.client = Client(
+            ["http://a", "http://b"],
+            transport=self.transport,
+            failover_policy=FailoverPolicy(probe_interval=60),
+        )
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_reads_fail_over(self):
+        self.transport.down.add("a")
+
+        with self.assertLogs("taas_api", "WARNING"):
+            self.assertEqual(self.client.get_order("1"), {"host": "b"})
+        self.assertEqual(self.client.get_order("1"), {"host": "b"})
+
+        self.assertEqual(
+            self.transport.calls, [("GET", "a"), ("GET", "b"), ("GET", "b")]
+        )
+
+    def test_placements_only_fail_over_when_not_sent(self):
+        self.transport.down.add("a")
+        with self.assertLogs("taas_api", "WARNING"):
+            self.assertEqual(self.client.cancel_order("1"), {"host": "b"})
+
+        self.transport.aborted.add("b")
+        with self.assertLogs("taas_api", "WARNING"):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.client.cancel_order("1")
+        self.assertEqual(self.transport.calls[-1], ("DELETE", "b"))
+
+    def test_all_down_raises(self):
+        self.transport.down.update({"a", "b"})
+
+        with self.assertLogs("taas_api", "WARNING"):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.client.get_order("1")
+
+    def test_routes_to_fastest(self):
+        a, b = self.client.endpoints.endpoints
+        self.client.endpoints.record_latency(a, 0.5)
+        self.client.endpoints.record_latency(b, 0.1)
+
+        self.assertEqual(self.client.get_order("1"), {"host": "b"})
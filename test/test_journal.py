@@ -0,0 +1,80 @@
+from unittest import TestCase
+import os
+import tempfile
+
+from taas_api import Client, PlaceOrderRequest
+from taas_api.journal import ERROR, REQUEST, RESPONSE, OrderJournal, read_journal
+from test.helpers import ClientTestCase
+
+
+class OrderJournalTest(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "orders.journal")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_records_and_pending(self):
+        with OrderJournal(self.path) as journal:
+            seq = journal.record_request("place_order", "/api/orders/", {"pair": "a"})
+            journal.record_response(seq, {"id": "1"})
+            journal.record_request("cancel_order", "/api/order/2")
+
+        entries = list(read_journal(self.path))
+
+        self.assertEqual([e.kind for e in entries], [REQUEST, RESPONSE, REQUEST])
+        self.assertEqual(entries[1].payload["response"], {"id": "1"})
+
+        with OrderJournal(self.path) as journal:
+            pending = journal.pending()
+            seq = journal.record_request("cancel_order", "/api/order/3")
+            journal.record_error(seq, ValueError("boom"))
+
+        self.assertEqual([e.payload["path"] for e in pending], ["/api/order/2"])
+        self.assertEqual(list(read_journal(self.path))[-1].kind, ERROR)
+        self.assertEqual(list(read_journal(self.path))[-1].seq, 3)
+
+    def test_torn_tail_is_dropped(self):
+        with OrderJournal(self.path) as journal:
+            journal.record_request("place_order", "/api/orders/", {"pair": "a"})
+            journal.record_request("place_order", "/api/orders/", {"pair": "b"})
+
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+
+        with OrderJournal(self.path) as journal:
+            journal.record_request("place_order", "/api/orders/", {"pair": "c"})
+
+        bodies = [e.payload["body"]["pair"] for e in read_journal(self.path)]
+        self.assertEqual(bodies, ["a", "c"])
+
+
+class ClientJournalTest(ClientTestCase):
+    def test_journals_order_calls_only(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "orders.journal")
+            with OrderJournal(path) as journal:
+                client = Client(self.url, auth_token="token", journal=journal)
+                client.place_order(
+                    PlaceOrderRequest(
+                        accounts=["mock"],
+                        pair="ETH-USDT",
+                        side="buy",
+                        strategy="TWAP",
+                        duration=300,
+                        base_asset_qty=5,
+                    )
+                )
+                client.get_order("abc")
+                client.cancel_order("abc")
+
+                entries = list(journal.entries())
+
+        self.assertEqual(
+            [(e.kind, e.seq) for e in entries],
+            [(REQUEST, 1), (RESPONSE, 1), (REQUEST, 2), (RESPONSE, 2)],
+        )
+        self.assertEqual(entries[0].operation, "place_order")
+        self.assertEqual(entries[0].payload["body"]["pair"], "ETH-USDT")
+        self.assertEqual(entries[2].payload["path"], "/api/order/abc")
@@ -0,0 +1,140 @@
+from unittest import TestCase, mock
+
+import requests
+
+from taas_api import Client, PlaceOrderRequest, SetLeverageRequest
+from taas_api.leverage_cache import LeverageCache
+from taas_api.transport import InMemoryTransport
+
+
+class LeverageCacheTest(TestCase):
+    def test_ttl(self):
+        cache = LeverageCache(ttl=10)
+        with mock.patch("time.monotonic", return_value=100):
+            cache.confirm(["a"], "ETH:PERP-USDT", "10")
+            self.assertEqual(cache.missing(["a", "b"], "ETH:PERP-USDT", 10.0), ["b"])
+
+        with mock.patch("time.monotonic", return_value=110):
+            self.assertIsNone(cache.get("a", "ETH:PERP-USDT"))
+
+    def test_invalidate(self):
+        cache = LeverageCache()
+        cache.confirm(["a", "b"], "ETH:PERP-USDT", 5)
+        cache.confirm(["a"], "BTC:PERP-USDT", 5)
+
+        cache.invalidate(pair="ETH:PERP-USDT")
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+class ClientLeverageCacheTest(TestCase):
+    def setUp(self):
+        self.requests = []
+        self.status = 200
+
+        def handler(request):
+            self.requests.append(request)
+            return self.status, {"ok": self.status < 400}
+
+        self.cache = LeverageCache()
+        self.client = Client(
+            "http://taas",
+            transport=InMemoryTransport(handler),
+            leverage_cache=self.cache,
+        )
+
+    def test_repeated_set_leverage_is_local(self):
+        request = SetLeverageRequest(["a", "b"], "ETH:PERP-USDT", "10")
+
+        self.client.set_leverage(request)
+        res = self.client.set_leverage(request)
+
+        self.assertTrue(res["cached"])
+        self.assertEqual(len(self.requests), 1)
+
+    def test_only_unknown_accounts_are_sent(self):
+        self.client.set_leverage(SetLeverageRequest(["a"], "ETH:PERP-USDT", "10"))
+        self.client.set_leverage(SetLeverageRequest(["a", "b"], "ETH:PERP-USDT", "10"))
+        self.client.set_leverage(SetLeverageRequest(["a"], "ETH:PERP-USDT", "20"))
+
+        self.assertEqual(
+            [r.json["account_ids"] for r in self.requests], [["a"], ["b"], ["a"]]
+        )
+        self.assertEqual(self.cache.get("a", "ETH:PERP-USDT"), repr(20.0))
+
+    def test_failures_are_not_cached(self):
+        request = SetLeverageRequest(["a"], "ETH:PERP-USDT", "10")
+        self.status = 400
+        with self.assertLogs("taas_api.client", "WARNING"):
+            self.client.set_leverage(request)
+        self.status = 200
+
+        self.client.set_leverage(request)
+
+        self.assertEqual(len(self.requests), 2)
+
+    def test_transport_error_invalidates(self):
+        self.cache.confirm(["a"], "ETH:PERP-USDT", "5")
+
+        def handler(request):
+            raise requests.exceptions.ConnectionError("down")
+
+        self.client.transport = InMemoryTransport(handler)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.set_leverage(SetLeverageRequest(["a"], "ETH:PERP-USDT", "10"))
+
+        self.assertIsNone(self.cache.get("a", "ETH:PERP-USDT"))
+
+    def test_place_order_drops_known_leverage(self):
+        order = PlaceOrderRequest(
+            accounts=["mock"],
+            pair="ETH:PERP-USDT",
+            side="buy",
+            strategy="TWAP",
+            duration=300,
+            base_asset_qty=1,
+            updated_leverage=10,
+        )
+
+        self.client.place_order(order)
+        self.client.place_order(order)
+
+        self.assertEqual(self.requests[0].json["updated_leverage"], 10)
+        self.assertNotIn("updated_leverage", self.requests[1].json)
+
+    def test_set_leverage_invalidates_place_order_entries(self):
+        order = PlaceOrderRequest(
+            accounts=["main"],
+            pair="ETH:PERP-USDT",
+            side="buy",
+            strategy="TWAP",
+            duration=300,
+            base_asset_qty=1,
+            updated_leverage=10,
+        )
+
+        self.client.place_order(order)
+        self.client.set_leverage(SetLeverageRequest(["id-main"], "ETH:PERP-USDT", "20"))
+        self.client.place_order(order)
+
+        self.assertEqual(self.requests[2].json["updated_leverage"], 10)
+
+    def test_place_order_invalidates_set_leverage_entries(self):
+        request = SetLeverageRequest(["id-main"], "ETH:PERP-USDT", "20")
+        self.client.set_leverage(request)
+        self.client.place_order(
+            PlaceOrderRequest(
+                accounts=["main"],
+                pair="ETH:PERP-USDT",
+                side="buy",
+                strategy="TWAP",
+                duration=300,
+                base_asset_qty=1,
+                updated_leverage=10,
+            )
+        )
+
+        self.client.set_leverage(request)
+
+        self.assertEqual(len(self.requests), 3)
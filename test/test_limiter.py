@@ -0,0 +1,121 @@
+from unittest import TestCase, mock
+import time
+
+import requests
+
+from taas_api import Client, DeadlineExceeded
+from taas_api.limiter import AdaptiveLimiter
+from taas_api.metrics import MetricsRegistry
+from taas_api.transport import InMemoryTransport
+
+
+class AdaptiveLimiterTest(TestCase):
+    def _complete(self, limiter, latency, failed=False, count=1):
+        for _ in range(count):
+            limiter.acquire("get_order")
+        for _ in range(count):
+            limiter.release("get_order", latency, failed)
+
+    def test_grows_while_latency_holds(self):
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=6)
+
+        for _ in range(20):
+            self._complete(limiter, 0.01, count=limiter.limit("get_order"))
+
+        self.assertEqual(limiter.limit("get_order"), 6)
+        self.assertEqual(limiter.in_flight("get_order"), 0)
+
+    def test_idle_endpoint_does_not_grow(self):
+        limiter = AdaptiveLimiter(initial_limit=4)
+
+        for _ in range(50):
+            self._complete(limiter, 0.01)
+
+        self.assertEqual(limiter.limit("get_order"), 4)
+
+    def test_backs_off_once_per_round_trip(self):
+        limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5)
+        self._complete(limiter, 0.01)
+
+        with mock.patch("time.monotonic", return_value=100.0):
+            self._complete(limiter, 0.05, count=3)
+        self.assertEqual(limiter.limit("get_order"), 5)
+
+        with mock.patch("time.monotonic", return_value=101.0):
+            self._complete(limiter, 0.01, failed=True)
+        self.assertEqual(limiter.limit("get_order"), 2)
+
+    def test_acquire_timeout(self):
+        limiter = AdaptiveLimiter(initial_limit=1)
+        self.assertTrue(limiter.acquire("get_order"))
+
+        self.assertFalse(limiter.acquire("get_order", timeout=0.01))
+        self.assertTrue(limiter.acquire("place_order", timeout=0))
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(initial_limit=100, max_limit=10)
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(backoff=1)
+
+
+class ClientLimiterTest(TestCase):
+    def test_limits_and_requests_are_exposed(self):
+        def handler(request):
+            if request.path == "/api/order/missing":
+                return 503, {"error": "unavailable"}
+            return {}
+
+        metrics = MetricsRegistry()
+        client = Client(
+            "http://taas",
+            transport=InMemoryTransport(handler),
+            limiter=AdaptiveLimiter(initial_limit=4),
+            metrics=metrics,
+        )
+
+        client.get_order("1")
+        with self.assertLogs("taas_api.client", "WARNING"):
+            client.get_order("missing")
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(
+            snapshot["taas_concurrency_limit"], {(("endpoint", "get_order"),): 3.0}
+        )
+        self.assertEqual(
+            metrics.get("taas_requests_total", endpoint="get_order", status=503), 1
+        )
+        self.assertEqual(metrics.get("taas_in_flight", endpoint="get_order"), 0)
+
+    def test_deadline_spent_waiting_for_a_slot(self):
+        class SlowLimiter(AdaptiveLimiter):
+            # A slot freed right as the deadline runs out.
+            def acquire(self, endpoint, timeout=None):
+                time.sleep(timeout)
+                return super().acquire(endpoint, timeout)
+
+        calls = []
+        client = Client(
+            "http://taas",
+            transport=InMemoryTransport(calls.append),
+            limiter=SlowLimiter(),
+        )
+
+        with self.assertRaises(DeadlineExceeded):
+            client.get_order("1", deadline=0.01)
+        self.assertEqual(calls, [])
+
+    def test_transport_errors_count_as_failures(self):
+        def handler(request):
+            raise requests.exceptions.ConnectionError("down")
+
+        limiter = AdaptiveLimiter(initial_limit=4)
+        client = Client(
+            "http://taas", transport=InMemoryTransport(handler), limiter=limiter
+        )
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get_order("1")
+
+        self.assertEqual(limiter.limit("get_order"), 3)
+        self.assertEqual(limiter.in_flight("get_order"), 0)
@@ -0,0 +1,134 @@
+from unittest import TestCase
+from urllib.parse import urlparse
+import threading
+
+from taas_api import Client
+from taas_api.transport import InMemoryTransport
+from test.helpers import ClientTestCase
+
+ORDERS = [
+    {"id": "1", "pair": "ETH-USDT", "parent_order": None},
+    {"id": "2", "pair": "BTC-USDT", "parent_order": None},
+    {"id": "3", "pair": "ETH-USDT", "parent_order": "m1"},
+    {"id": "4", "pair": "ETH:PERP-USDT", "parent_order": "m1"},
+    {"id": "5", "pair": "ETH-USDT", "parent_order": None},
+]
+
+
+class CancelAllTest(ClientTestCase):
+    def setUp(self):
+        super().setUp()
+
+        def responder(path):
+            if urlparse(path).path == "/api/orders/":
+                return ORDERS
+            return {"path": path}
+
+        self.server.responder = responder
+
+    def _cancels(self):
+        return sorted(
+            path
+            for method, path in zip(self.server.methods, self.server.calls)
+            if method == "DELETE"
+        )
+
+    def test_cancel_all(self):
+        client = Client(self.url, auth_token="token")
+        progress = []
+
+        result = client.cancel_all(
+            account_names=["mock"], progress=lambda r: progress.append(r.done)
+        )
+
+        self.assertEqual(sorted(result.canceled_orders), ["1", "2", "5"])
+        self.assertEqual(result.canceled_multi_orders, ["m1"])
+        self.assertEqual(result.failures, {})
+        self.assertEqual(result.submitted, 4)
+        self.assertEqual(sorted(progress), [1, 2, 3, 4])
+        self.assertEqual(
+            self._cancels(),
+            ["/api/multi_order/m1", "/api/order/1", "/api/order/2", "/api/order/5"],
+        )
+        self.assertIn("statuses=ACTIVE", self.server.calls[0])
+
+    def test_cancel_all_by_pair(self):
+        client = Client(self.url, auth_token="token")
+
+        result = client.cancel_all(pairs=["BTC-USDT", "ETH:PERP-USDT"])
+
+        self.assertEqual(result.canceled_orders, ["2"])
+        self.assertEqual(result.canceled_multi_orders, ["m1"])
+        self.assertEqual(self._cancels(), ["/api/multi_order/m1", "/api/order/2"])
+
+
+class ShrinkingPaginationTest(TestCase):
+    def test_cancel_all_while_pages_shift(self):
+        lock = threading.Lock()
+        statuses = {str(i): "ACTIVE" for i in range(450)}
+
+        def handler(request):
+            with lock:
+                if request.method == "DELETE":
+                    statuses[request.path.rsplit("/", 1)[1]] = "CANCELED"
+                    return {}
+                # Offset pagination over the orders matching right now.
+                active = [
+                    {"id": i, "pair": "ETH-USDT", "parent_order": None}
+                    for i, status in statuses.items()
+                    if status == request.params["statuses"]
+                ]
+                page, size = int(request.params["page"]), int(
+                    request.params["page_size"]
+                )
+                return active[(page - 1) * size : page * size]
+
+        client = Client("http://taas", transport=InMemoryTransport(handler))
+
+        result = client.cancel_all(max_workers=8)
+
+        self.assertEqual(len(result.canceled_orders), 450)
+        self.assertEqual(result.failures, {})
+        self.assertNotIn("ACTIVE", statuses.values())
+
+
+class FailedCancelTest(TestCase):
+    def setUp(self):
+        self.active = {"1", "2"}
+        self.deletes = []
+
+    def _client(self, fail):
+        def handler(request):
+            if request.method == "DELETE":
+                order_id = request.path.rsplit("/", 1)[1]
+                self.deletes.append(order_id)
+                if fail(order_id):
+                    return 500, {"detail": "unavailable"}
+                self.active.discard(order_id)
+                return {}
+            return [
+                {"id": order_id, "pair": "ETH-USDT", "parent_order": None}
+                for order_id in sorted(self.active)
+            ]
+
+        return Client("http://taas", transport=InMemoryTransport(handler))
+
+    def test_http_errors_are_failures(self):
+        client = self._client(lambda order_id: True)
+
+        result = client.cancel_all(max_attempts=2)
+
+        self.assertEqual(result.canceled_orders, [])
+        self.assertEqual(sorted(result.failures), ["1", "2"])
+        self.assertIn("HTTP 500", result.failures["1"])
+        self.assertEqual(sorted(self.deletes), ["1", "1", "2", "2"])
+        self.assertEqual(result.submitted, 2)
+
+    def test_failed_cancels_are_retried(self):
+        client = self._client(lambda order_id: self.deletes.count(order_id) == 1)
+
+        result = client.cancel_all()
+
+        self.assertEqual(sorted(result.canceled_orders), ["1", "2"])
+        self.assertEqual(result.failures, {})
+        self.assertEqual(self.active, set())
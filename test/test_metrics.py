@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from taas_api.metrics import MetricsRegistry
+
+
+class MetricsRegistryTest(TestCase):
+    def test_counters_and_gauges(self):
+        registry = MetricsRegistry()
+        registry.inc("requests", endpoint="get_order", status=200)
+        registry.inc("requests", 2, status=200, endpoint="get_order")
+        registry.set("limit", 4, endpoint="get_order")
+
+        self.assertEqual(registry.get("requests", endpoint="get_order", status=200), 3)
+        self.assertEqual(registry.get("limit", endpoint="get_order"), 4)
+        self.assertIsNone(registry.get("limit", endpoint="place_order"))
+
+    def test_collectors_run_on_snapshot(self):
+        registry = MetricsRegistry()
+        calls = []
+
+        def collect(r):
+            calls.append(r)
+            r.set("collected", len(calls))
+
+        registry.add_collector(collect)
+
+        self.assertIsNone(registry.get("collected"))
+        self.assertEqual(registry.snapshot()["collected"], {(): 1.0})
+        self.assertEqual(registry.snapshot()["collected"], {(): 2.0})
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        registry.set("up", 1)
+        registry.inc("requests", endpoint='say "hi"', status=200)
+
+        self.assertEqual(
+            registry.render(),
+            'requests{endpoint="say \\"hi\\"",status="200"} 1\nup 1\n',
+        )
@@ -0,0 +1,139 @@
+from unittest import TestCase
+
+from taas_api.order_store import OrderStore
+
+
+def _order(order_id, status="ACTIVE", account="acc1", pair="ETH-USDT", **kwargs):
+    order = {
+        "id": order_id,
+        "status": status,
+        "account_names": [account],
+        "pair": pair,
+        "custom_order_id": "",
+        "created_at": f"2024-10-10T00:00:0{order_id}.000000Z",
+    }
+    order.update(kwargs)
+    return order
+
+
+class _FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+        self.summaries = {}
+
+    def iter_all_orders(self, request, deadline=None):
+        self.requests.append(request)
+        return iter(self.pages.pop(0) if self.pages else [])
+
+    def get_order_summary(self, order_id, deadline=None):
+        return self.summaries[order_id]
+
+
+class OrderStoreTest(TestCase):
+    def setUp(self):
+        self.client = _FakeClient(
+            [
+                [
+                    _order("1"),
+                    _order("2", account="acc2"),
+                    _order("3", status="COMPLETE", pair="BTC-USDT"),
+                    _order("4", pair="BTC-USDT", custom_order_id="mine"),
+                ]
+            ]
+        )
+        self.store = OrderStore(self.client)
+        self.store.backfill()
+
+    def _ids(self, orders):
+        return sorted(order["id"] for order in orders)
+
+    def test_query_by_indexes(self):
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self._ids(self.store.query(status="ACTIVE")), ["1", "2", "4"])
+        self.assertEqual(
+            self._ids(self.store.query(status="ACTIVE", account_name="acc1")),
+            ["1", "4"],
+        )
+        self.assertEqual(
+            self._ids(
+                self.store.query(status="ACTIVE", account_name="acc1", pair="ETH-USDT")
+            ),
+            ["1"],
+        )
+        self.assertEqual(self._ids(self.store.query(custom_order_id="mine")), ["4"])
+        self.assertEqual(self.store.query(pair="SOL-USDT"), [])
+
+    def test_upsert_moves_indexes(self):
+        self.store.upsert(_order("1", status="CANCELED"))
+
+        self.assertEqual(self._ids(self.store.query(status="ACTIVE")), ["2", "4"])
+        self.assertEqual(self._ids(self.store.query(status="CANCELED")), ["1"])
+
+    def test_sync_is_incremental(self):
+        self.client.pages = [
+            [_order("5")],
+            [_order("1"), _order("2", account="acc2"), _order("5")],
+        ]
+        self.client.summaries["4"] = {"status": "COMPLETE"}
+
+        self.store.sync()
+
+        new_orders, open_orders = self.client.requests[1:]
+        self.assertEqual(new_orders.after, "2024-10-09T23:59:59.000000Z")
+        self.assertEqual(open_orders.statuses, "SCHEDULED,ACTIVE,FINISHER,PAUSED")
+        self.assertIn("5", self.store)
+        self.assertEqual(self.store.get("4")["status"], "COMPLETE")
+        self.assertEqual(self.store.get("4")["pair"], "BTC-USDT")
+        self.assertEqual(self._ids(self.store.query(status="ACTIVE")), ["1", "2", "5"])
+
+    def test_sync_pages_closed_orders(self):
+        self.store.max_lookups = 1
+        self.client.pages = [
+            [],
+            [_order("1")],
+            [
+                _order("2", status="CANCELED", account="acc2"),
+                _order("3", status="COMPLETE", pair="BTC-USDT"),
+                _order("4", status="CANCELED", pair="BTC-USDT"),
+            ],
+        ]
+
+        self.store.sync()
+
+        closed_orders = self.client.requests[-1]
+        self.assertEqual(closed_orders.statuses, "COMPLETE,CANCELED")
+        # Bounded by the oldest order that closed, not by order 1, still open.
+        self.assertEqual(closed_orders.after, "2024-10-09T23:59:57.000000Z")
+        self.assertEqual(self._ids(self.store.query(status="CANCELED")), ["2", "4"])
+        self.assertEqual(self._ids(self.store.query(status="ACTIVE")), ["1"])
+
+    def test_closed_scan_costs_no_more_than_lookups(self):
+        self.store.max_lookups = 0
+        self.store.page_size = 1
+        self.client.pages = [
+            [],
+            [_order("1"), _order("2")],
+            [
+                _order("3", status="COMPLETE", pair="BTC-USDT"),
+                _order("4", status="CANCELED", pair="BTC-USDT"),
+            ],
+        ]
+        self.client.summaries["4"] = {"status": "CANCELED", "filled": 0}
+
+        self.store.sync()
+
+        # One page was scanned without finding it, so it was looked up.
+        self.assertEqual(self.store.get("4")["filled"], 0)
+        self.assertEqual(self.store.get("4")["status"], "CANCELED")
+
+    def test_sync_falls_back_to_summaries_without_created_at(self):
+        self.store.max_lookups = 0
+        self.store.upsert(_order("6", created_at=None))
+        self.client.pages = [[], [_order("1"), _order("2"), _order("4")]]
+        self.client.summaries["6"] = {"status": "CANCELED"}
+
+        self.store.sync()
+
+        self.assertEqual(self.store.get("6")["status"], "CANCELED")
+        self.assertEqual(len(self.client.requests), 3)
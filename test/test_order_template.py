@@ -0,0 +1,95 @@
+from dataclasses import fields
+from unittest import TestCase
+import pickle
+
+from taas_api import Client, OrderTemplate, PlaceOrderRequest
+from taas_api.transport import InMemoryTransport
+
+SHARED = dict(accounts=["mock"], strategy="TWAP", duration=300, alpha_tilt=0.5)
+
+
+class OrderTemplateTest(TestCase):
+    def setUp(self):
+        self.template = OrderTemplate(**SHARED)
+
+    def _plain(self, **overrides):
+        return PlaceOrderRequest(**{**SHARED, **overrides})
+
+    def test_matches_plain_request(self):
+        for overrides in (
+            dict(pair="ETH-USDT", side="buy", base_asset_qty=1),
+            dict(pair="ETH-USDT", side="sell", quote_asset_qty=10, alpha_tilt=None),
+            dict(pair="ETH-USDT", side="buy", base_asset_qty=1, duration=None),
+            dict(pair="ETH", side="hold", base_asset_qty=1, alpha_tilt=2),
+            dict(pair="ETH-USDT", side="buy", alpha_tilt=2),
+            dict(pair="ETH-USDT", side="buy", base_asset_qty=1, pov_target=0.1),
+        ):
+            order = self.template.order(**overrides)
+            plain = self._plain(**overrides)
+
+            self.assertIsInstance(order, PlaceOrderRequest)
+            self.assertEqual(order.validate(), plain.validate(), overrides)
+            self.assertEqual(order.to_post_body(), plain.to_post_body())
+            for f in fields(PlaceOrderRequest):
+                self.assertEqual(getattr(order, f.name), getattr(plain, f.name))
+
+    def test_template_errors_are_kept(self):
+        template = OrderTemplate(**{**SHARED, "engine_passiveness": 2})
+
+        order = template.order(pair="ETH", side="buy", base_asset_qty=1)
+
+        self.assertEqual(
+            order.validate(),
+            self._plain(
+                pair="ETH", side="buy", base_asset_qty=1, engine_passiveness=2
+            ).validate(),
+        )
+        fixed = template.order(
+            pair="ETH-USDT", side="buy", base_asset_qty=1, engine_passiveness=0.5
+        )
+        self.assertEqual(fixed.validate(), (True, None))
+
+    def test_assignment_overrides_one_order(self):
+        first = self.template.order(pair="ETH-USDT", side="buy", base_asset_qty=1)
+        second = self.template.order(pair="ETH-USDT", side="buy", base_asset_qty=1)
+
+        first.alpha_tilt = 5
+
+        self.assertFalse(first.validate()[0])
+        self.assertEqual(first.to_post_body()["alpha_tilt"], 5)
+        self.assertEqual(second.alpha_tilt, 0.5)
+        self.assertEqual(second.validate(), (True, None))
+
+    def test_fields(self):
+        with self.assertRaises(TypeError):
+            OrderTemplate(unknown=1)
+        with self.assertRaises(TypeError):
+            self.template.order(side="buy", base_asset_qty=1)
+        with self.assertRaises(AttributeError):
+            self.template.order(pair="ETH-USDT", side="buy").unknown = 1
+
+    def test_pickle(self):
+        order = self.template.order(pair="ETH-USDT", side="buy", base_asset_qty=1)
+
+        restored = pickle.loads(pickle.dumps(order))
+
+        self.assertEqual(restored.to_post_body(), order.to_post_body())
+
+    def test_place_order(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.json)
+            return {"id": "1"}
+
+        client = Client("http://taas", transport=InMemoryTransport(handler))
+        client.place_order(
+            self.template.order(pair="ETH-USDT", side="buy", base_asset_qty=1)
+        )
+        with self.assertRaises(ValueError):
+            client.place_order(self.template.order(pair="ETH-USDT", side="buy"))
+
+        self.assertEqual(
+            bodies,
+            [self._plain(pair="ETH-USDT", side="buy", base_asset_qty=1).to_post_body()],
+        )
@@ -0,0 +1,106 @@
+from unittest import TestCase, skipIf
+
+from taas_api.analytics import np
+from taas_api.rebalance import plan_rebalance
+
+BALANCES = {
+    "okx_main": {
+        "exchange": "OKX",
+        "assets": [
+            {"symbol": "BTC", "size": 2.0, "notional": 60000.0},
+            {"symbol": "ETH", "size": 10.0, "notional": 20000.0},
+            {"symbol": "SOL", "size": 100.0, "notional": 2000.0},
+            {"symbol": "USDT", "size": 18000.0, "notional": 18000.0},
+            {"symbol": "ETH:PERP-USDT", "size": -5.0, "notional": -10000.0},
+        ],
+    },
+}
+
+
+@skipIf(np is None, "numpy is not installed")
+class PlanRebalanceTest(TestCase):
+    def _orders(self, plan):
+        return [
+            (child.pair, child.side, round(child.base_asset_qty, 6))
+            for child in plan.child_orders
+        ]
+
+    def test_quantity_targets(self):
+        plan = plan_rebalance(
+            BALANCES,
+            "okx_main",
+            {"BTC": 3.0, "ETH": 4.0, "ETH:PERP-USDT": 0.0, "DOGE": 1000.0},
+            prices={"DOGE": 0.1},
+        )
+
+        self.assertEqual(
+            self._orders(plan),
+            [
+                ("BTC-USDT", "buy", 1.0),
+                ("ETH-USDT", "sell", 6.0),
+                ("ETH:PERP-USDT", "buy", 5.0),
+                ("DOGE-USDT", "buy", 1000.0),
+            ],
+        )
+        self.assertEqual(plan.child_orders[0].account, "okx_main")
+        self.assertEqual(plan.skipped, {})
+
+    def test_weight_targets(self):
+        # Half of 90000 of net notional is 1.5 BTC at 30000.
+        plan = plan_rebalance(
+            BALANCES, "okx_main", {"BTC": 0.5, "ETH": 0.0}, mode="weight"
+        )
+
+        self.assertEqual(
+            self._orders(plan), [("ETH-USDT", "sell", 10.0), ("BTC-USDT", "sell", 0.5)]
+        )
+
+    def test_filters(self):
+        plan = plan_rebalance(
+            BALANCES,
+            "okx_main",
+            {"BTC": 2.0001, "SOL": 100.4, "ETH": 10.5, "DOGE": 10.0},
+            lot_sizes={"SOL": 1.0, "ETH": 0.1},
+            min_notional=10.0,
+        )
+
+        self.assertEqual(self._orders(plan), [("ETH-USDT", "buy", 0.5)])
+        self.assertEqual(
+            plan.skipped,
+            {
+                "BTC": "below min notional",
+                "SOL": "below lot size",
+                "DOGE": "no price",
+            },
+        )
+
+    def test_close_unlisted(self):
+        plan = plan_rebalance(BALANCES, "okx_main", {}, close_unlisted=True)
+
+        self.assertEqual(
+            sorted(self._orders(plan)),
+            [
+                ("BTC-USDT", "sell", 2.0),
+                ("ETH-USDT", "sell", 10.0),
+                ("ETH:PERP-USDT", "buy", 5.0),
+                ("SOL-USDT", "sell", 100.0),
+            ],
+        )
+
+    def test_multi_orders(self):
+        plan = plan_rebalance(
+            BALANCES,
+            "okx_main",
+            {"BTC": 3.0, "ETH": 4.0, "SOL": 0.0},
+        )
+
+        requests = plan.multi_orders(300, "TWAP", max_child_orders=2)
+
+        self.assertEqual([len(r.child_orders) for r in requests], [2, 1])
+        self.assertEqual(requests[0].accounts, ["okx_main"])
+        with self.assertRaises(ValueError):
+            plan.multi_orders(300, "NOT_A_STRATEGY")
+
+    def test_unknown_account(self):
+        with self.assertRaises(ValueError):
+            plan_rebalance(BALANCES, "missing", {"BTC": 1.0})
@@ -0,0 +1,97 @@
+from unittest import TestCase
+import logging
+import queue
+import threading
+
+from taas_api import Client
+from taas_api.request_log import (
+    NonBlockingQueueHandler,
+    RequestLogPipeline,
+    RequestSampler,
+)
+from taas_api.transport import InMemoryTransport
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+class RequestSamplerTest(TestCase):
+    def test_rate_lookup_order(self):
+        sampler = RequestSampler(
+            {("get_order", 200): 0.5, "get_balances": 0.25, 200: 0.1}, default_rate=1
+        )
+
+        self.assertEqual(sampler.rate("get_order", 200), 0.5)
+        self.assertEqual(sampler.rate("get_balances", 200), 0.25)
+        self.assertEqual(sampler.rate("get_order_summary", 200), 0.1)
+        self.assertEqual(sampler.rate("get_order", 500), 1)
+        self.assertEqual(sampler.rate("get_order", None), 1)
+
+
+class RequestLogPipelineTest(TestCase):
+    def setUp(self):
+        logger = logging.getLogger("taas_api.client")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.INFO)
+
+        def handler(request):
+            if request.path.endswith("/missing"):
+                return 404, {}
+            return {}
+
+        self.client = Client("http://taas", transport=InMemoryTransport(handler))
+
+    def test_logs_on_background_thread(self):
+        handler = _ListHandler()
+
+        with RequestLogPipeline([handler]):
+            self.client.get_order("abc")
+
+        self.assertEqual(len(handler.messages), 1)
+        self.assertRegex(
+            handler.messages[0], r"GET /api/order/abc latency=\d+\.\dms status=200"
+        )
+        self.assertNotIn(threading.current_thread().name, handler.threads)
+
+    def test_sampling(self):
+        handler = _ListHandler()
+        sampler = RequestSampler({200: 0})
+
+        with RequestLogPipeline([handler], sampler):
+            for _ in range(10):
+                self.client.get_order("abc")
+            self.client.get_order("missing")
+
+        # The warning logged for the error response and its request line.
+        self.assertEqual(len(handler.messages), 2)
+        self.assertIn("status=404", handler.messages[1])
+
+    def test_restores_logger(self):
+        logger = logging.getLogger("taas_api.client")
+        handlers = list(logger.handlers)
+
+        with RequestLogPipeline([_ListHandler()]):
+            self.assertFalse(logger.propagate)
+
+        self.assertTrue(logger.propagate)
+        self.assertEqual(logger.handlers, handlers)
+
+
+class NonBlockingQueueHandlerTest(TestCase):
+    def test_drops_when_full(self):
+        handler = NonBlockingQueueHandler(queue.Queue(2))
+        record = logging.LogRecord("x", logging.INFO, "", 0, "%s", ("a",), None)
+
+        for _ in range(5):
+            handler.handle(record)
+
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(handler.queue.get_nowait().args, ("a",))
@@ -0,0 +1,141 @@
+from unittest import TestCase
+import threading
+import time
+
+from taas_api import Client, DeadlineExceeded
+from taas_api.scheduler import CANCEL, PLACE, READ, RequestScheduler
+from taas_api.transport import InMemoryTransport
+
+
+def _wait_for(condition, timeout=2.0):
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            raise AssertionError("condition not met")
+        time.sleep(0.001)
+
+
+class RequestSchedulerTest(TestCase):
+    def test_highest_priority_gets_next_slot(self):
+        scheduler = RequestScheduler(max_concurrency=1, shares={PLACE: 1, READ: 1})
+        scheduler.acquire(PLACE)
+        granted = []
+
+        def worker(cls, name):
+            with scheduler.slot(cls):
+                granted.append(name)
+
+        threads = []
+        waiters = (
+            (PLACE, "place1"),
+            (READ, "read"),
+            (PLACE, "place2"),
+            (CANCEL, "cancel"),
+        )
+        for count, (cls, name) in enumerate(waiters, 1):
+            threads.append(threading.Thread(target=worker, args=(cls, name)))
+            threads[-1].start()
+            _wait_for(
+                lambda: sum(scheduler.waiting(c) for c in (CANCEL, PLACE, READ))
+                == count
+            )
+
+        scheduler.release(PLACE)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(granted, ["cancel", "place1", "place2", "read"])
+
+    def test_shares_keep_slots_for_cancels(self):
+        scheduler = RequestScheduler(max_concurrency=4, shares={PLACE: 0.5})
+        self.assertTrue(scheduler.acquire(PLACE))
+        self.assertTrue(scheduler.acquire(PLACE))
+
+        self.assertFalse(scheduler.acquire(PLACE, timeout=0.01))
+        self.assertEqual(scheduler.waiting(PLACE), 0)
+        self.assertTrue(scheduler.acquire(CANCEL, timeout=0))
+        self.assertEqual(scheduler.in_flight(PLACE), 2)
+
+    def test_reserve_holds_with_placements_and_reads(self):
+        scheduler = RequestScheduler(max_concurrency=16)
+        placed = 0
+        while scheduler.acquire(PLACE, timeout=0):
+            placed += 1
+        read = 0
+        while scheduler.acquire(READ, timeout=0):
+            read += 1
+
+        self.assertEqual(placed + read, 12)
+        for _ in range(4):
+            self.assertTrue(scheduler.acquire(CANCEL, timeout=0.05))
+        self.assertFalse(scheduler.acquire(CANCEL, timeout=0.01))
+
+    def test_classify(self):
+        self.assertEqual(
+            RequestScheduler.classify("cancel_multi_order", "DELETE"), CANCEL
+        )
+        self.assertEqual(RequestScheduler.classify("get_order", "GET"), READ)
+        self.assertEqual(RequestScheduler.classify("/api/custom/", "POST"), PLACE)
+
+    def test_invalid_shares(self):
+        with self.assertRaises(ValueError):
+            RequestScheduler(shares={"urgent": 1})
+        with self.assertRaises(ValueError):
+            RequestScheduler(shares={PLACE: 0})
+        with self.assertRaises(ValueError):
+            RequestScheduler(max_concurrency=4, reserve=4)
+
+
+class ClientSchedulerTest(TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+
+        def handler(request):
+            self.calls.append((request.method, request.path))
+            if request.path == "/api/order/blocking":
+                self.release.wait(2)
+            return {}
+
+        self.scheduler = RequestScheduler(max_concurrency=1)
+        self.client = Client(
+            "http://taas",
+            transport=InMemoryTransport(handler),
+            scheduler=self.scheduler,
+        )
+
+    def test_cancel_overtakes_queued_reads(self):
+        threads = [threading.Thread(target=self.client.get_order, args=("blocking",))]
+        threads[0].start()
+        _wait_for(lambda: self.scheduler.in_flight(READ) == 1)
+        threads.append(threading.Thread(target=self.client.get_order, args=("a",)))
+        threads[-1].start()
+        _wait_for(lambda: self.scheduler.waiting(READ) == 1)
+        threads.append(threading.Thread(target=self.client.cancel_order, args=("b",)))
+        threads[-1].start()
+        _wait_for(lambda: self.scheduler.waiting(CANCEL) == 1)
+
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            self.calls,
+            [
+                ("GET", "/api/order/blocking"),
+                ("DELETE", "/api/order/b"),
+                ("GET", "/api/order/a"),
+            ],
+        )
+
+    def test_deadline_covers_waiting_for_a_slot(self):
+        thread = threading.Thread(target=self.client.get_order, args=("blocking",))
+        thread.start()
+        _wait_for(lambda: self.scheduler.in_flight(READ) == 1)
+
+        with self.assertRaises(DeadlineExceeded):
+            self.client.get_order("a", deadline=0.05)
+
+        self.release.set()
+        thread.join()
+        self.assertEqual(self.scheduler.waiting(READ), 0)
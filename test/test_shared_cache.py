@@ -0,0 +1,147 @@
+from unittest import TestCase, skipIf
+import multiprocessing
+import os
+import tempfile
+import time
+
+from taas_api.shared_cache import _SEQ, _SEQ_OFFSET, SharedOrderCache, fcntl
+from test.test_order_store import _FakeClient, _order
+
+
+def _read_in_child(path, order_id, queue):
+    cache = SharedOrderCache(path)
+    queue.put(cache.get(order_id))
+    cache.close()
+
+
+def _wait_for(condition, timeout=2.0):
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            raise AssertionError("condition not met")
+        time.sleep(0.001)
+
+
+@skipIf(fcntl is None, "fcntl is not available")
+class SharedOrderCacheTest(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "orders")
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        self.dir.cleanup()
+
+    def _cache(self, client=None, **kwargs):
+        cache = SharedOrderCache(self.path, client, capacity=64 * 1024, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def test_one_poller_publishes_for_all(self):
+        first = _FakeClient([[_order("1"), _order("2", pair="BTC-USDT")]])
+        second = _FakeClient([])
+        poller = self._cache(first)
+        worker = self._cache(second)
+        reader = self._cache()
+
+        self.assertEqual(poller.refresh(), 2)
+        self.assertEqual(worker.refresh(), 0)
+
+        self.assertTrue(poller.is_leader)
+        self.assertFalse(worker.is_leader)
+        self.assertEqual(second.requests, [])
+        self.assertEqual(reader.get("1")["pair"], "ETH-USDT")
+        self.assertEqual([o["id"] for o in reader.query(pair="BTC-USDT")], ["2"])
+        self.assertEqual(len(worker), 2)
+        self.assertLess(reader.age, 5)
+
+    def test_takeover_resumes_from_snapshot(self):
+        poller = self._cache(_FakeClient([[_order("1")]]))
+        poller.refresh()
+        poller.close()
+        self.caches.remove(poller)
+
+        client = _FakeClient([[_order("2")], [_order("1"), _order("2")]])
+        successor = self._cache(client)
+        successor.refresh()
+
+        self.assertTrue(successor.is_leader)
+        # An incremental sync, not a backfill of the whole history.
+        self.assertIsNotNone(client.requests[0].after)
+        self.assertEqual(len(self._cache()), 2)
+
+    def test_publishes_open_and_recently_closed_orders(self):
+        client = _FakeClient(
+            [[_order("1"), _order("2"), _order("3", status="COMPLETE")]]
+        )
+        poller = self._cache(client, closed_ttl=0.05)
+        reader = self._cache()
+
+        poller.refresh()
+        # History loaded by the backfill is left out.
+        self.assertEqual(sorted(o["id"] for o in reader.query()), ["1", "2"])
+
+        client.pages = [[_order("4", status="CANCELED")], [_order("1")]]
+        client.summaries["2"] = {"status": "CANCELED"}
+        poller.refresh()
+        self.assertEqual(
+            sorted(o["id"] for o in reader.query(status="CANCELED")), ["2", "4"]
+        )
+
+        time.sleep(0.06)
+        client.pages = [[], [_order("1")]]
+        poller.refresh()
+        self.assertEqual([o["id"] for o in reader.query()], ["1"])
+        self.assertEqual(len(poller._store), 4)
+
+    def test_snapshot_is_indexed_once(self):
+        self._cache(
+            _FakeClient([[_order("1"), _order("2", pair="BTC-USDT")]])
+        ).refresh()
+        reader = self._cache()
+
+        snapshot = reader._read()
+        self.assertEqual([o["id"] for o in reader.query(pair="BTC-USDT")], ["2"])
+        self.assertIs(reader._read(), snapshot)
+        self.assertEqual(snapshot.indexes["pair"]["ETH-USDT"], {"1"})
+
+    def test_torn_write_falls_back_to_last_snapshot(self):
+        poller = self._cache(_FakeClient([[_order("1")]]))
+        reader = self._cache(read_timeout=0.01)
+        poller.refresh()
+        self.assertEqual(len(reader), 1)
+
+        seq = _SEQ.unpack_from(poller._mm, _SEQ_OFFSET)[0]
+        _SEQ.pack_into(poller._mm, _SEQ_OFFSET, seq + 1)
+
+        self.assertEqual(len(reader), 1)
+        self.assertEqual(len(self._cache(read_timeout=0.01)), 0)
+
+    def test_background_refresh(self):
+        poller = self._cache(_FakeClient([[_order("1")]]), refresh_interval=0.01)
+        reader = self._cache()
+
+        poller.start()
+        _wait_for(lambda: reader.get("1") is not None)
+
+        self.assertTrue(poller.is_leader)
+
+    def test_capacity(self):
+        poller = self._cache(_FakeClient([[_order("1", notes="x" * 70000)]]))
+
+        with self.assertRaises(ValueError):
+            poller.refresh()
+
+    def test_read_from_another_process(self):
+        self._cache(_FakeClient([[_order("1")]])).refresh()
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+
+        process = ctx.Process(target=_read_in_child, args=(self.path, "1", queue))
+        process.start()
+        order = queue.get(timeout=30)
+        process.join()
+
+        self.assertEqual(order["id"], "1")
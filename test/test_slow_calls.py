@@ -0,0 +1,88 @@
+from unittest import TestCase
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+from taas_api import Client
+from taas_api.slow_calls import SlowCallLog
+from taas_api.transport import InMemoryTransport
+
+
+class SlowCallLogTest(TestCase):
+    def setUp(self):
+        def handler(request):
+            if request.path.endswith("/down"):
+                raise requests.exceptions.ConnectionError("down")
+            if request.path.endswith("/slow"):
+                time.sleep(0.05)
+            return {"path": request.path}
+
+        self.log = SlowCallLog(thresholds={"get_order": 0.03}, default_threshold=10)
+        self.client = Client(
+            "http://taas",
+            transport=InMemoryTransport(handler),
+            slow_calls=self.log,
+        )
+
+    def test_captures_calls_over_threshold(self):
+        self.client.get_order("fast")
+        self.client.get_order("slow")
+
+        calls = self.log.calls()
+        self.assertEqual(len(calls), 1)
+        call = calls[0]
+        self.assertEqual(call.endpoint, "get_order")
+        self.assertEqual(call.path, "/api/order/slow")
+        self.assertEqual(call.status, 200)
+        self.assertEqual(call.response_headers["Content-Type"], "application/json")
+        self.assertEqual(call.response_size, len(b'{"path": "/api/order/slow"}'))
+        self.assertGreaterEqual(call.latency_ms, 50)
+        self.assertEqual(list(call.phases_ms), ["prepare", "send", "decode", "journal"])
+        self.assertGreaterEqual(call.phases_ms["send"], 50)
+
+    def test_thresholds_per_endpoint(self):
+        self.client.get_order_summary("slow")
+
+        self.assertEqual(len(self.log), 0)
+
+    def test_failed_calls(self):
+        self.log.default_threshold = 0
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.post("/api/down", {"pair": "BTC-USDT"}, endpoint="place_order")
+
+        call = self.log.calls("place_order")[0]
+        self.assertEqual(call.request, {"pair": "BTC-USDT"})
+        self.assertIsNone(call.status)
+        self.assertEqual(call.error, "ConnectionError: down")
+        self.assertEqual(list(call.phases_ms), ["prepare", "send"])
+
+    def test_ring_buffer_is_bounded(self):
+        log = SlowCallLog(default_threshold=0, capacity=3)
+        client = Client(
+            "http://taas", transport=InMemoryTransport(lambda r: {}), slow_calls=log
+        )
+        for i in range(5):
+            client.get_order(str(i))
+
+        self.assertEqual(
+            [call.path for call in log.calls()],
+            ["/api/order/2", "/api/order/3", "/api/order/4"],
+        )
+
+    def test_dump_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = SlowCallLog(default_threshold=0, dump_dir=tmp)
+            client = Client(
+                "http://taas", transport=InMemoryTransport(lambda r: {}), slow_calls=log
+            )
+            client.get("/api/orders/", params={"page": 1})
+
+            (name,) = os.listdir(tmp)
+            with open(os.path.join(tmp, name)) as f:
+                dumped = json.load(f)
+
+        self.assertTrue(name.endswith("-_api_orders_.json"))
+        self.assertEqual(dumped["request"], {"page": 1})
@@ -0,0 +1,174 @@
+from unittest import TestCase
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+from taas_api import Client
+from taas_api.traffic import (
+    StandIn,
+    TraceEntry,
+    TrafficRecorder,
+    max_concurrency,
+    read_trace,
+    replay,
+)
+from taas_api.transport import InMemoryTransport
+
+
+class RecorderTest(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "trace.jsonl.gz")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_records_calls(self):
+        def handler(request):
+            if request.method == "DELETE":
+                raise requests.exceptions.ConnectionError("down")
+            return {}
+
+        recorder = TrafficRecorder(self.path)
+        client = Client(
+            "http://taas", transport=InMemoryTransport(handler), recorder=recorder
+        )
+        client.get_order("abc")
+        client.post("/api/order/", {"pair": "BTC-USDT"}, endpoint="place_order")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.cancel_order("abc")
+        recorder.close()
+
+        entries = list(read_trace(self.path))
+
+        self.assertEqual(
+            [(e.endpoint, e.method, e.path) for e in entries],
+            [
+                ("get_order", "GET", "/api/order/abc"),
+                ("place_order", "POST", "/api/order/"),
+                ("cancel_order", "DELETE", "/api/order/abc"),
+            ],
+        )
+        self.assertEqual(entries[0].start, 0)
+        self.assertEqual(entries[0].status, 200)
+        self.assertEqual(entries[1].body, {"pair": "BTC-USDT"})
+        self.assertEqual(entries[2].error, "ConnectionError")
+        self.assertIsNone(entries[2].status)
+
+    def test_without_bodies(self):
+        recorder = TrafficRecorder(self.path, record_bodies=False)
+        client = Client(
+            "http://taas", transport=InMemoryTransport(lambda r: {}), recorder=recorder
+        )
+        client.post("/api/order/", {"pair": "BTC-USDT"})
+        recorder.close()
+
+        self.assertIsNone(next(read_trace(self.path)).body)
+
+    def test_writes_off_the_calling_thread(self):
+        recorder = TrafficRecorder(self.path)
+        write = recorder._file.write
+
+        def slow_write(line):
+            time.sleep(0.01)
+            return write(line)
+
+        recorder._file.write = slow_write
+        client = Client(
+            "http://taas", transport=InMemoryTransport(lambda r: {}), recorder=recorder
+        )
+
+        start = time.perf_counter()
+        for i in range(20):
+            client.get_order(str(i))
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+        recorder.close()
+        self.assertEqual(len(list(read_trace(self.path))), 20)
+        self.assertEqual(recorder.dropped, 0)
+
+    def test_full_queue_drops_records(self):
+        recorder = TrafficRecorder(self.path, queue_size=1)
+        written = threading.Event()
+        release = threading.Event()
+        write = recorder._file.write
+
+        def blocked_write(line):
+            written.set()
+            release.wait()
+            return write(line)
+
+        recorder._file.write = blocked_write
+        recorder.record("get_order", "GET", "/a", None, None, 0.0, 0.01, 200)
+        written.wait()
+        for _ in range(3):
+            recorder.record("get_order", "GET", "/b", None, None, 0.0, 0.01, 200)
+        release.set()
+        recorder.close()
+
+        self.assertEqual(recorder.dropped, 2)
+        self.assertEqual(len(list(read_trace(self.path))), 2)
+
+
+class ReplayTest(TestCase):
+    def _entries(self):
+        # Two overlapping calls, then one on its own.
+        return [
+            TraceEntry(0.0, "get_order", "GET", "/api/order/a", latency_ms=50),
+            TraceEntry(0.01, "get_order", "GET", "/api/order/b", latency_ms=50),
+            TraceEntry(0.1, "cancel_order", "DELETE", "/api/order/a", latency_ms=20),
+        ]
+
+    def test_max_concurrency(self):
+        self.assertEqual(max_concurrency(self._entries()), 2)
+        self.assertEqual(max_concurrency([]), 0)
+
+    def test_replay_against_stand_in(self):
+        entries = self._entries()
+        in_flight = []
+        lock = threading.Lock()
+        stand_in = StandIn(entries)
+
+        def handler(request):
+            with lock:
+                in_flight.append(request.path)
+            return stand_in(request)
+
+        client = Client("http://taas", transport=InMemoryTransport(handler))
+        start = time.perf_counter()
+        report = replay(entries, client)
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual(report.concurrency, 2)
+        self.assertEqual(report.replayed["get_order"].count, 2)
+        self.assertEqual(report.replayed["cancel_order"].count, 1)
+        self.assertGreaterEqual(report.replayed["get_order"].p50_ms, 50)
+        self.assertEqual(report.recorded["cancel_order"].p50_ms, 20)
+        self.assertIn("get_order", report.format())
+
+    def test_scaled_speed(self):
+        entries = [
+            TraceEntry(0.0, "get_order", "GET", "/api/order/a"),
+            TraceEntry(1.0, "get_order", "GET", "/api/order/b"),
+        ]
+        client = Client("http://taas", transport=InMemoryTransport(lambda r: {}))
+
+        start = time.perf_counter()
+        report = replay(entries, client, speed=10)
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(report.replayed["get_order"].count, 2)
+
+    def test_errors_are_counted(self):
+        def handler(request):
+            raise requests.exceptions.ConnectionError("down")
+
+        client = Client("http://taas", transport=InMemoryTransport(handler))
+
+        report = replay(self._entries()[:1], client)
+
+        self.assertEqual(report.replayed["get_order"].errors, 1)
+        self.assertEqual(report.replayed["get_order"].count, 0)
@@ -0,0 +1,260 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock, skipIf
+import pickle
+import socket
+import time
+
+import requests
+
+from taas_api import Client
+from taas_api.data import GetOrderRequest
+from taas_api.transport import (
+    HTTP2Transport,
+    InMemoryTransport,
+    RequestsTransport,
+    build_transport,
+)
+from test.helpers import ClientTestCase
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class BuildTransportTest(TestCase):
+    def test_default_is_requests(self):
+        self.assertIsInstance(build_transport(None), RequestsTransport)
+        self.assertIsInstance(build_transport("http1"), RequestsTransport)
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            build_transport("http3")
+
+    def test_requests_transport_pickles_without_pool(self):
+        transport = RequestsTransport()
+        transport.session
+
+        copy = pickle.loads(pickle.dumps(transport))
+
+        self.assertIsNot(copy.session, transport.session)
+
+
+class PrepareTest(TestCase):
+    def _compare(self, method, url, params=None, json=None):
+        transport = RequestsTransport()
+        session = transport.session
+        headers = {"Authorization": "Token abc"}
+
+        fast, _ = transport._prepare(session, method, url, headers, params, json)
+        slow = session.prepare_request(
+            requests.Request(method, url, headers=headers, params=params, json=json)
+        )
+
+        self.assertEqual(fast.url, slow.url)
+        self.assertEqual(dict(fast.headers), dict(slow.headers))
+        self.assertEqual(fast.body, slow.body)
+
+    def test_matches_session_prepare(self):
+        self._compare("GET", "http://taas/api/order/abc")
+        self._compare(
+            "GET",
+            "http://taas/api/orders/",
+            params={"statuses": "ACTIVE,PAUSED", "page": 2, "pair": None},
+        )
+        self._compare("GET", "http://taas/api/orders/?page=1", params={"a": "b c"})
+        self._compare("POST", "http://taas/api/order/", json={"qty": 1.5, "x": "é"})
+        self._compare("DELETE", "http://taas/api/order/abc")
+
+    def test_session_cookies_use_session_request(self):
+        transport = RequestsTransport()
+        transport.session.cookies.set("sid", "1")
+
+        with mock.patch.object(
+            transport, "_prepare", side_effect=AssertionError
+        ), mock.patch.object(transport.session, "request") as request:
+            transport.request("GET", "http://taas/api/order/abc", headers={})
+
+        request.assert_called_once()
+
+
+class InMemoryTransportTest(TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.path == "/api/missing":
+                return 404, {"detail": "not found"}
+            return {"path": request.path, "params": request.params}
+
+        self.client = Client(
+            "http://taas", auth_token="token", transport=InMemoryTransport(handler)
+        )
+
+    def test_routes_calls_to_handler(self):
+        res = self.client.get_order("abc")
+
+        self.assertEqual(res["path"], "/api/order/abc")
+        request = self.requests[0]
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(request.headers["Authorization"], "Token token")
+
+    def test_params_and_body(self):
+        res = self.client.get_all_orders(GetOrderRequest(statuses="ACTIVE"))
+        self.client.cancel_order("abc")
+        self.client.post("/api/order/", {"pair": "BTC-USDT"})
+
+        self.assertEqual(res["params"]["statuses"], "ACTIVE")
+        self.assertEqual(self.requests[1].method, "DELETE")
+        self.assertEqual(self.requests[2].json, {"pair": "BTC-USDT"})
+
+    def test_status_code(self):
+        with self.assertLogs("taas_api.client", "WARNING") as logs:
+            res = self.client.get("/api/missing")
+
+        self.assertEqual(res, {"detail": "not found"})
+        self.assertIn("not found", logs.output[0])
+
+    def test_handler_raises_transport_errors(self):
+        def handler(request):
+            raise requests.exceptions.ConnectionError("down")
+
+        client = Client("http://taas", transport=InMemoryTransport(handler))
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get_order("abc")
+
+
+class WarmupTest(ClientTestCase):
+    def test_warmup_opens_connections(self):
+        client = Client(self.url, auth_token="token", warm_connections=3)
+
+        for _ in range(5):
+            client.get_order("abc")
+        self.assertEqual(self.server.connections, 3)
+        client.close()
+
+    def test_keepalive_pings_every_idle_connection(self):
+        client = Client(self.url, auth_token="token")
+        client.warmup(3, keepalive_interval=None)
+
+        client.transport.keepalive(self.url)
+
+        self.assertEqual(self.server.methods, ["HEAD"] * 3)
+        self.assertEqual(self.server.connections, 3)
+
+    def test_keepalive_leaves_warm_connections_in_the_pool(self):
+        client = Client(self.url, auth_token="token")
+        client.warmup(3, keepalive_interval=None)
+        pool = client.transport._pool(self.url)
+        idle = []
+
+        def ping(conn, *args, **kwargs):
+            idle.append(sum(c is not None for c in pool.pool.queue))
+            return request(conn, *args, **kwargs)
+
+        request = type(pool.pool.queue[-1]).request
+        with mock.patch.object(type(pool.pool.queue[-1]), "request", ping):
+            client.transport.keepalive(self.url)
+
+        self.assertEqual(idle, [2, 2, 2])
+        self.assertEqual(self.server.connections, 3)
+
+    def test_keepalive_thread(self):
+        client = Client(self.url, auth_token="token")
+        client.warmup(2, keepalive_interval=0.05)
+
+        time.sleep(0.2)
+        client.close()
+
+        self.assertGreaterEqual(self.server.methods.count("HEAD"), 2)
+
+    def test_resolved_address_is_cached(self):
+        url = self.url.replace("127.0.0.1", "localhost")
+        client = Client(url, auth_token="token")
+        client.warmup(1, keepalive_interval=None)
+        getaddrinfo = socket.getaddrinfo
+
+        def no_dns(host, *args, **kwargs):
+            if host == "localhost":
+                raise socket.gaierror("dns is down")
+            return getaddrinfo(host, *args, **kwargs)
+
+        with mock.patch("socket.getaddrinfo", no_dns):
+            conn = client.transport._pool(url)._new_conn()
+            conn.connect()
+            conn.close()
+
+    def test_proxied_connections_are_not_pinned(self):
+        # The test server stands in for the proxy, the host never resolves.
+        url = "http://taas.invalid"
+        client = Client(url, auth_token="token")
+        client.transport.session.proxies = {"http": self.url}
+
+        self.assertEqual(client.warmup(2, keepalive_interval=None), 2)
+        client.get_order("abc")
+
+        self.assertEqual(self.server.calls, [url + "/api/order/abc"])
+        self.assertEqual(self.server.connections, 2)
+
+
+@skipIf(httpx is None, "httpx is not installed")
+class HTTP2TransportTest(ClientTestCase):
+    def test_falls_back_to_http1(self):
+        transport = HTTP2Transport(connections=2)
+        client = Client(self.url, auth_token="token", transport=transport)
+
+        for _ in range(3):
+            self.assertEqual(client.get_order("abc")["path"], "/api/order/abc")
+
+        response = transport.request("GET", self.url + "/api/order/abc", headers={})
+        self.assertEqual(response.http_version, "HTTP/1.1")
+        client.close()
+
+    def test_http1_fallback_is_not_capped_per_client(self):
+        self.server.delays = [0.3] * 8
+        transport = HTTP2Transport(connections=2)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda _: transport.request(
+                        "GET", self.url + "/api/order/abc", headers={}
+                    ),
+                    range(8),
+                )
+            )
+
+        self.assertLess(time.perf_counter() - start, 0.9)
+        transport.close()
+
+    def test_errors_are_requests_exceptions(self):
+        self.server.delays = [0.5]
+        client = Client(
+            self.url, auth_token="token", transport="http2", timeout=(1, 0.1)
+        )
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            client.get_order("abc")
+
+    def test_warmup_errors_are_requests_exceptions(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        transport = HTTP2Transport(connections=1)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            transport.warmup(url, 1)
+        transport.close()
+
+    def test_pickles_for_worker_processes(self):
+        transport = HTTP2Transport(connections=3)
+        transport.request("GET", self.url + "/api/order/abc", headers={})
+
+        copy = pickle.loads(pickle.dumps(transport))
+
+        self.assertEqual(copy.connections, 3)
+        response = copy.request("GET", self.url + "/api/order/abc", headers={})
+        self.assertEqual(response.status_code, 200)